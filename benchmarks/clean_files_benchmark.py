@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""Throughput benchmark of the clean files executor against sed and tr
+
+Usage:
+    python benchmarks/clean_files_benchmark.py --size_mb 256 --files 8
+"""
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from multiprocessing import cpu_count
+
+from dataduct.steps.executors.clean_files import clean_directory
+from dataduct.steps.executors.clean_files import DEFAULT_NULL_MARKER
+
+COLUMN_COUNT = 8
+SED_TR_COMMAND = ("cat {input_dir}/* | sed 's/\\\\\\\\n/NULL/g' | "
+                  "tr -d '\\000' > {output_dir}/part-0000")
+
+
+def random_row(random_state):
+    """Synthetic TSV row with nulls and the occasional control character
+    """
+    fields = list()
+    for _ in range(COLUMN_COUNT):
+        value = random_state.random()
+        if value < 0.1:
+            fields.append(DEFAULT_NULL_MARKER)
+        elif value < 0.12:
+            fields.append('bad\x00value')
+        else:
+            fields.append('%x' % random_state.getrandbits(64))
+    return '\t'.join(fields) + '\n'
+
+
+def generate_files(input_dir, size_mb, file_count):
+    """Write file_count TSV files with a total size of size_mb
+    """
+    random_state = random.Random(0)
+    rows = [random_row(random_state) for _ in range(10000)]
+    block = ''.join(rows)
+    file_size = size_mb * 1024 * 1024 / file_count
+    for index in range(file_count):
+        with open(os.path.join(input_dir, 'input-%04d' % index), 'wb') as f:
+            written = 0
+            while written < file_size:
+                f.write(block)
+                written += len(block)
+    return sum(os.path.getsize(os.path.join(input_dir, f))
+               for f in os.listdir(input_dir))
+
+
+def timed(function):
+    """Seconds taken by the function
+    """
+    start = time.time()
+    function()
+    return time.time() - start
+
+
+def main():
+    """Print the throughput of every cleanup strategy
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size_mb', dest='size_mb', type=int, default=256)
+    parser.add_argument('--files', dest='files', type=int, default=8)
+    parser.add_argument('--max_workers', dest='max_workers', type=int,
+                        default=cpu_count())
+    parser.add_argument('--compression', dest='compression', default=None)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_dir = os.path.join(work_dir, 'input')
+        os.makedirs(input_dir)
+        total_bytes = generate_files(input_dir, args.size_mb, args.files)
+        input_paths = [os.path.join(input_dir, f)
+                       for f in sorted(os.listdir(input_dir))]
+        total_mb = total_bytes / 1024.0 / 1024.0
+        print 'Input: %d files, %.1f MB' % (len(input_paths), total_mb)
+
+        def run(name, function):
+            """Time a strategy into a fresh output directory
+            """
+            output_dir = os.path.join(work_dir, 'output')
+            os.makedirs(output_dir)
+            try:
+                seconds = timed(lambda: function(output_dir))
+            finally:
+                shutil.rmtree(output_dir)
+            print '%-24s %8.2fs %10.1f MB/s' % (
+                name, seconds, total_mb / seconds)
+
+        run('sed | tr', lambda output_dir: subprocess.check_call(
+            SED_TR_COMMAND.format(input_dir=input_dir, output_dir=output_dir),
+            shell=True))
+
+        workers = 1
+        while workers <= args.max_workers:
+            run('clean_files workers=%d' % workers,
+                lambda output_dir, w=workers: clean_directory(
+                    input_paths, output_dir, w, w, args.compression,
+                    column_count=COLUMN_COUNT))
+            workers *= 2
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Benchmark of the aligned ColumnCheck against the per key lookup loop
+
+Usage:
+    python benchmarks/column_check_benchmark.py --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy
+import pandas
+
+from dataduct.qa import ColumnCheck
+
+
+def loop_errors(source_data, destination_data):
+    """Errors of the previous implementation, one key lookup at a time
+    """
+    errors = list()
+    observed = 0
+    for key in source_data.index:
+        if key not in destination_data.index:
+            continue
+
+        source_value = source_data.loc[key].values[0]
+        dest_value = destination_data.loc[key].values[0]
+        if isinstance(source_value, unicode):
+            source_value = source_value.encode('utf-8')
+        if isinstance(dest_value, unicode):
+            dest_value = dest_value.encode('utf-8')
+
+        if source_value != dest_value:
+            errors.append((key, source_value, dest_value))
+        observed += 1
+    return errors, observed
+
+
+def samples(size, error_rate=0.01):
+    """Source and destination samples with unicode values and some errors
+    """
+    random_state = numpy.random.RandomState(0)
+    keys = numpy.arange(size)
+    values = [u'value-%d-\xe9' % v for v in random_state.randint(0, 1000,
+                                                                 size)]
+    source = pandas.DataFrame({'value': values},
+                              index=pandas.Index(keys, name='id'))
+
+    destination_values = [v.encode('utf-8') for v in values]
+    for position in random_state.randint(0, size, int(size * error_rate)):
+        destination_values[position] = 'changed'
+
+    # The destination misses a few keys and comes back in another order
+    destination = pandas.DataFrame(
+        {'value': destination_values},
+        index=pandas.Index(keys, name='id')).iloc[size / 100:]
+    destination = destination.sample(frac=1, random_state=0)
+    return source, destination
+
+
+def main():
+    """Print the time taken by both implementations for every sample size
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', dest='sizes', type=int, nargs='+',
+                        default=[10000, 100000, 1000000])
+    parser.add_argument('--loop_max_size', dest='loop_max_size', type=int,
+                        default=10000,
+                        help='Largest sample timed with the lookup loop')
+    args = parser.parse_args()
+
+    print '%10s %12s %12s %10s' % ('rows', 'aligned (s)', 'loop (s)',
+                                   'errors')
+    for size in args.sizes:
+        source, destination = samples(size)
+
+        start = time.time()
+        check = ColumnCheck(source, destination, name='benchmark',
+                            sns_topic_arn='')
+        aligned_seconds = time.time() - start
+
+        loop_seconds = float('nan')
+        if size <= args.loop_max_size:
+            start = time.time()
+            errors, observed = loop_errors(source, destination)
+            loop_seconds = time.time() - start
+            assert (len(errors), observed) == (len(check.errors),
+                                               check.observed)
+
+        print '%10d %12.3f %12.3f %10d' % (size, aligned_seconds,
+                                           loop_seconds, len(check.errors))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""SQL generation benchmark of the subquery, join and merge upserts
+
+Prints the time to generate every upsert script and the shape of the
+plan: statements, temporary tables, copies of the data and IN subqueries.
+
+Usage:
+    python benchmarks/upsert_sql_benchmark.py --columns 200 --iterations 20
+"""
+import argparse
+import time
+
+from dataduct.database import SqlStatement
+from dataduct.database import Table
+
+
+def table_definition(name, column_count, primary_key_count):
+    """Definition of a wide table with a compound primary key
+    """
+    columns = ['col_%d VARCHAR(64)' % i for i in range(column_count)]
+    sql = 'CREATE TABLE %s ( %s' % (name, ', '.join(columns))
+    if primary_key_count:
+        sql += ', PRIMARY KEY(%s)' % ', '.join(
+            'col_%d' % i for i in range(primary_key_count))
+    return sql + ') DISTKEY(col_0) SORTKEY(col_0)'
+
+
+def plan_shape(script):
+    """Counts of the expensive operations in a script
+    """
+    statements = [s.sql() for s in script.statements]
+    return {
+        'statements': len(statements),
+        'temp_tables': sum(s.startswith('CREATE TEMPORARY TABLE')
+                           for s in statements),
+        'copies': sum(s.startswith('INSERT INTO') for s in statements),
+        'in_subqueries': sum(' IN (' in s for s in statements),
+    }
+
+
+def main():
+    """Print the generation time and plan shape of every upsert method
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--columns', dest='columns', type=int, default=200)
+    parser.add_argument('--primary_keys', dest='primary_keys', type=int,
+                        default=2)
+    parser.add_argument('--iterations', dest='iterations', type=int,
+                        default=20)
+    args = parser.parse_args()
+
+    destination = Table(SqlStatement(table_definition(
+        'dev.destination', args.columns, args.primary_keys)))
+    source = Table(SqlStatement(table_definition(
+        'dev.source', args.columns, 0)))
+
+    methods = [
+        ('subquery', lambda: destination.upsert_script(source)),
+        ('join', lambda: destination.merge_script(source)),
+        ('merge', lambda: destination.merge_script(source, use_merge=True)),
+    ]
+
+    print '%-10s %10s %11s %12s %7s %14s' % (
+        'method', 'ms/script', 'statements', 'temp_tables', 'copies',
+        'in_subqueries')
+    for name, generate in methods:
+        start = time.time()
+        for _ in range(args.iterations):
+            script = generate()
+        milliseconds = (time.time() - start) * 1000 / args.iterations
+        shape = plan_shape(script)
+        print '%-10s %10.1f %11d %12d %7d %14d' % (
+            name, milliseconds, shape['statements'], shape['temp_tables'],
+            shape['copies'], shape['in_subqueries'])
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,8 @@ import MySQLdb
 import MySQLdb.cursors
 import psycopg2
 
+from boto.rds import connect_to_region
+
 from ..config import Config
 from ..utils.exceptions import ETLConfigError
 from ..utils.helpers import exactly_one
@@ -13,6 +15,7 @@ from ..utils.hook import hook
 
 config = Config()
 CONNECTION_RETRIES = config.etl.get('CONNECTION_RETRIES', 2)
+DEFAULT_POSTGRES_PORT = 5432
 
 
 def get_redshift_config():
@@ -96,6 +99,26 @@ def get_postgres_config():
 
 
 
+def get_postgres_endpoint(postgres_creds):
+    """Host and port of the postgres database
+
+    Note:
+        The HOST and PORT of the config are used if set, otherwise the
+        endpoint of the RDS_INSTANCE_ID is looked up in the REGION.
+    """
+    if 'HOST' in postgres_creds:
+        return (postgres_creds['HOST'],
+                postgres_creds.get('PORT', DEFAULT_POSTGRES_PORT))
+
+    instance_id = postgres_creds['RDS_INSTANCE_ID']
+    instances = connect_to_region(
+        postgres_creds['REGION']).get_all_dbinstances(instance_id)
+    if not instances or instances[0].endpoint is None:
+        raise ETLConfigError(
+            'Endpoint for RDS instance: %s not found' % instance_id)
+    return instances[0].endpoint
+
+
 @retry(CONNECTION_RETRIES, 60)
 @hook('connect_to_postgres')
 def postgres_connection(postgres_creds=None, autocommit=True,
@@ -105,11 +128,12 @@ def postgres_connection(postgres_creds=None, autocommit=True,
     if postgres_creds is None:
         postgres_creds = get_postgres_config()
 
+    host, port = get_postgres_endpoint(postgres_creds)
     connection = psycopg2.connect(
-        rds_instance=postgres_creds['RDS_INSTANCE_ID'],
+        host=host,
+        port=port,
         user=postgres_creds['USERNAME'],
         password=postgres_creds['PASSWORD'],
-        region=postgres_creds['REGION'],
         database=postgres_creds['DATABASE_NAME'],
         connect_timeout=connect_timeout,
         **kwargs)
@@ -1,6 +1,8 @@
 """Tests for the connection file
 """
 from unittest import TestCase
+from mock import MagicMock
+from mock import patch
 from nose.tools import eq_
 from nose.tools import raises
 
@@ -60,3 +62,40 @@ class TestConnection(TestCase):
         result = connection.get_sql_config('test')
         eq_(result['DATABASE'], 'test')
         eq_(result['cred'], 'data')
+
+    @staticmethod
+    def test_postgres_endpoint_from_config():
+        """Tests that the host and port of the postgres config are used
+        """
+        eq_(connection.get_postgres_endpoint({'HOST': 'db.local'}),
+            ('db.local', connection.DEFAULT_POSTGRES_PORT))
+        eq_(connection.get_postgres_endpoint(
+            {'HOST': 'db.local', 'PORT': 5433}), ('db.local', 5433))
+
+    @staticmethod
+    @patch('dataduct.data_access.connection.connect_to_region')
+    def test_postgres_endpoint_from_rds_instance(connect_to_region):
+        """Tests that the endpoint of the RDS instance is looked up
+        """
+        connect_to_region.return_value.get_all_dbinstances.return_value = [
+            MagicMock(endpoint=('db.rds.amazonaws.com', 5432))]
+        eq_(connection.get_postgres_endpoint(
+            {'RDS_INSTANCE_ID': 'db', 'REGION': 'us-east-1'}),
+            ('db.rds.amazonaws.com', 5432))
+        connect_to_region.assert_called_once_with('us-east-1')
+        connect_to_region.return_value.get_all_dbinstances.\
+            assert_called_once_with('db')
+
+    @staticmethod
+    @patch('dataduct.data_access.connection.psycopg2')
+    def test_postgres_connection_dsn(psycopg2):
+        """Tests that postgres_connection only passes valid DSN options
+        """
+        connection.postgres_connection(postgres_creds={
+            'HOST': 'db.local', 'USERNAME': 'user', 'PASSWORD': 'pass',
+            'DATABASE_NAME': 'test', 'RDS_INSTANCE_ID': 'db',
+            'REGION': 'us-east-1'})
+        eq_(psycopg2.connect.call_args[1],
+            {'host': 'db.local', 'port': connection.DEFAULT_POSTGRES_PORT,
+             'user': 'user', 'password': 'pass', 'database': 'test',
+             'connect_timeout': 30})
@@ -1,3 +1,4 @@
+from .catalog import Catalog
 from .database import Database
 from .select_statement import SelectStatement
 from .sql import SqlScript
@@ -6,3 +7,6 @@ from .table import Table
 from .view import View
 from .history_table import HistoryTable
 from .column import Column
+from .level_executor import LevelExecutor
+from .maintenance import TableMaintenance
+from .schema_diff import SchemaDiff
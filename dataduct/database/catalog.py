@@ -0,0 +1,261 @@
+"""Script containing the catalog class for live relation metadata
+"""
+from collections import namedtuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEMA = 'public'
+DEFAULT_BATCH_SIZE = 200
+
+CatalogColumn = namedtuple('CatalogColumn', [
+    'name', 'position', 'column_type', 'encoding', 'is_distkey',
+    'sortkey_position', 'is_not_null'])
+
+# pg_table_def only shows relations on the search_path and is slow on big
+# clusters, so we read the same metadata from the system tables directly
+CATALOG_QUERY = """
+    SELECT n.nspname AS schema_name
+        ,c.relname AS relation_name
+        ,a.attname AS column_name
+        ,a.attnum AS position
+        ,FORMAT_TYPE(a.atttypid, a.atttypmod) AS column_type
+        ,FORMAT_ENCODING(a.attencodingtype::INTEGER) AS encoding
+        ,a.attisdistkey AS is_distkey
+        ,a.attsortkeyord AS sortkey_position
+        ,a.attnotnull AS is_not_null
+    FROM pg_catalog.pg_attribute a
+    JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    WHERE a.attnum > 0
+    AND NOT a.attisdropped
+    AND c.relkind IN ('r', 'v')
+    AND ({conditions})
+    ORDER BY 1, 2, 4
+"""
+
+RELATION_CONDITION = "(n.nspname = '{schema_name}' AND c.relname = '{name}')"
+
+# Views bound to a relation through their rewrite rules, late binding views
+# are not tracked by pg_depend as they are not dropped with the relation
+DEPENDENT_VIEWS_QUERY = """
+    SELECT DISTINCT vn.nspname AS schema_name
+        ,v.relname AS view_name
+        ,PG_GET_VIEWDEF(v.oid) AS definition
+    FROM pg_catalog.pg_depend d
+    JOIN pg_catalog.pg_rewrite r ON r.oid = d.objid
+    JOIN pg_catalog.pg_class v ON v.oid = r.ev_class
+    JOIN pg_catalog.pg_namespace vn ON vn.oid = v.relnamespace
+    JOIN pg_catalog.pg_class c ON c.oid = d.refobjid
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    WHERE v.relkind = 'v'
+    AND v.oid <> c.oid
+    AND {condition}
+"""
+
+# Foreign keys of other tables referencing a relation, which are dropped with
+# the relation when it is dropped with CASCADE
+FOREIGN_KEY_REFERENCES_QUERY = """
+    SELECT sn.nspname AS schema_name
+        ,s.relname AS table_name
+        ,PG_GET_CONSTRAINTDEF(con.oid) AS definition
+    FROM pg_catalog.pg_constraint con
+    JOIN pg_catalog.pg_class s ON s.oid = con.conrelid
+    JOIN pg_catalog.pg_namespace sn ON sn.oid = s.relnamespace
+    JOIN pg_catalog.pg_class c ON c.oid = con.confrelid
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    WHERE con.contype = 'f'
+    AND s.oid <> c.oid
+    AND {condition}
+    ORDER BY 1, 2
+"""
+
+
+def split_relation_name(relation_name):
+    """Split a relation name into the schema and the relation names
+    """
+    split_name = relation_name.lower().split('.')
+    if len(split_name) == 2:
+        return split_name[0], split_name[1]
+    return DEFAULT_SCHEMA, split_name[0]
+
+
+def normalize_relation_name(relation_name):
+    """Fully qualified lower case name of the relation
+    """
+    return '%s.%s' % split_relation_name(relation_name)
+
+
+class Catalog(object):
+    """Catalog of the live relation metadata in redshift
+
+    Metadata for many relations is fetched in a single query and cached for
+    the lifetime of the object.
+    """
+    def __init__(self, connection, batch_size=DEFAULT_BATCH_SIZE):
+        """Constructor for the Catalog class
+
+        Args:
+            connection(Connection): Connection to the redshift database
+            batch_size(int): Maximum number of relations in a single query
+        """
+        self.connection = connection
+        self.batch_size = batch_size
+        self._relations = dict()
+
+    def _query(self, relation_names):
+        """Fetch the metadata of a batch of relations with a single query
+        """
+        conditions = ' OR '.join(
+            RELATION_CONDITION.format(schema_name=schema_name, name=name)
+            for schema_name, name in
+            (split_relation_name(r) for r in relation_names))
+
+        cursor = self.connection.cursor()
+        cursor.execute(CATALOG_QUERY.format(conditions=conditions))
+        field_names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+
+        result = dict()
+        for row in rows:
+            # Rows can be tuples or dicts based on the cursor factory
+            if not isinstance(row, dict):
+                row = dict(zip(field_names, row))
+
+            name = '%s.%s' % (row['schema_name'], row['relation_name'])
+            result.setdefault(name, list()).append(CatalogColumn(
+                row['column_name'].strip(), row['position'],
+                row['column_type'], row['encoding'], row['is_distkey'],
+                row['sortkey_position'], row['is_not_null']))
+        return result
+
+    def fetch(self, relation_names):
+        """Fetch the columns of the relations, querying only uncached ones
+
+        Args:
+            relation_names(list of str): Names of the relations to fetch
+
+        Returns:
+            result(dict): Map from relation name to the list of CatalogColumn,
+                relations that do not exist are not included
+        """
+        missing = list()
+        for relation_name in relation_names:
+            name = normalize_relation_name(relation_name)
+            if name not in self._relations and name not in missing:
+                missing.append(name)
+
+        for index in range(0, len(missing), self.batch_size):
+            batch = missing[index:index + self.batch_size]
+            logger.debug('Fetching catalog for %d relations', len(batch))
+            self._relations.update(self._query(batch))
+
+        result = dict()
+        for relation_name in relation_names:
+            columns = self._relations.get(
+                normalize_relation_name(relation_name))
+            if columns is not None:
+                result[relation_name] = columns
+        return result
+
+    def columns(self, relation_name):
+        """Columns of a single relation, None if the relation does not exist
+        """
+        return self.fetch([relation_name]).get(relation_name, None)
+
+    def exists(self, relation_name):
+        """Check if the relation exists in the database
+        """
+        return self.columns(relation_name) is not None
+
+    def dependent_views(self, relation_name):
+        """Live definitions of the views that depend on a relation
+
+        Note:
+            Views of views are included as dropping the relation with
+            CASCADE drops them as well. The dependencies are read from
+            pg_depend rather than parsed from the view definitions, which
+            use unqualified names. The definitions are never cached.
+
+        Returns:
+            result(list of tuple): Name and create statement of every view,
+                every view after the views it selects from
+        """
+        definitions = dict()
+        parents = dict()
+        discovered = list()
+        queue = [normalize_relation_name(relation_name)]
+        cursor = self.connection.cursor()
+        while queue:
+            parent_name = queue.pop(0)
+            schema_name, name = split_relation_name(parent_name)
+            cursor.execute(DEPENDENT_VIEWS_QUERY.format(
+                condition=RELATION_CONDITION.format(
+                    schema_name=schema_name, name=name)))
+            field_names = [d[0] for d in cursor.description]
+            for row in cursor.fetchall():
+                if not isinstance(row, dict):
+                    row = dict(zip(field_names, row))
+
+                view_name = normalize_relation_name(
+                    '%s.%s' % (row['schema_name'], row['view_name']))
+                parents.setdefault(view_name, set()).add(parent_name)
+                if view_name in definitions:
+                    continue
+                definitions[view_name] = 'CREATE VIEW %s AS %s' % (
+                    view_name, row['definition'].strip().rstrip(';'))
+                discovered.append(view_name)
+                queue.append(view_name)
+        cursor.close()
+
+        # A view is created once all the views it selects from exist
+        result = list()
+        created = set()
+        while len(result) < len(discovered):
+            for view_name in discovered:
+                if view_name not in created and all(
+                        parent not in definitions or parent in created
+                        for parent in parents[view_name]):
+                    created.add(view_name)
+                    result.append((view_name, definitions[view_name]))
+        return result
+
+    def foreign_key_references(self, relation_name):
+        """Live definitions of the foreign keys referencing a relation
+
+        Note:
+            Foreign keys of the relation to itself are not included. The
+            definitions are never cached.
+
+        Returns:
+            result(list of tuple): Name of the referencing table and the
+                statement adding its foreign key
+        """
+        schema_name, name = split_relation_name(relation_name)
+        cursor = self.connection.cursor()
+        cursor.execute(FOREIGN_KEY_REFERENCES_QUERY.format(
+            condition=RELATION_CONDITION.format(
+                schema_name=schema_name, name=name)))
+        field_names = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+
+        result = list()
+        for row in rows:
+            if not isinstance(row, dict):
+                row = dict(zip(field_names, row))
+
+            table_name = normalize_relation_name(
+                '%s.%s' % (row['schema_name'], row['table_name']))
+            result.append((table_name, 'ALTER TABLE %s ADD %s' % (
+                table_name, row['definition'].strip().rstrip(';'))))
+        return result
+
+    def invalidate(self, relation_name=None):
+        """Drop a relation, or every relation, from the cache
+        """
+        if relation_name is None:
+            self._relations = dict()
+        else:
+            self._relations.pop(normalize_relation_name(relation_name), None)
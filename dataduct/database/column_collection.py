@@ -0,0 +1,142 @@
+"""Script containing the column collection class object
+"""
+
+
+class ColumnCollection(object):
+    """Ordered collection of the columns in a table
+
+    Columns are indexed by name and position. The sorted order and the key
+    column views are computed once and cached until the collection is
+    mutated, so columns should be changed through the collection.
+    """
+    __slots__ = ('_by_name', '_sorted', '_by_position', '_primary_keys',
+                 '_foreign_keys', '_sort_keys', '_dist_keys')
+
+    def __init__(self, columns=None):
+        """Constructor for the ColumnCollection class
+
+        Args:
+            columns(list of Column): Columns to be added to the collection
+        """
+        self._by_name = dict()
+        self.invalidate()
+
+        for column in columns or list():
+            self.add(column)
+
+    def __len__(self):
+        """Number of columns in the collection
+        """
+        return len(self._by_name)
+
+    def __iter__(self):
+        """Iterate over the columns sorted by position
+        """
+        return iter(self._sorted_columns())
+
+    def __contains__(self, column_name):
+        """Check if a column with the given name is in the collection
+        """
+        return column_name in self._by_name
+
+    def invalidate(self):
+        """Clear the cached views of the collection
+        """
+        self._sorted = None
+        self._by_position = None
+        self._primary_keys = None
+        self._foreign_keys = None
+        self._sort_keys = None
+        self._dist_keys = None
+
+    def add(self, column):
+        """Add a column to the collection, replacing one of the same name
+        """
+        self._by_name[column.name] = column
+        self.invalidate()
+
+    def remove(self, column_name):
+        """Remove the column with the given name from the collection
+        """
+        column = self._by_name.pop(column_name)
+        self.invalidate()
+        return column
+
+    def set_primary(self, column_name, value=True):
+        """Set the primary key flag of the column with the given name
+        """
+        self._by_name[column_name].primary = value
+        self.invalidate()
+
+    def get(self, column_name, default=None):
+        """Get the column with the given name
+        """
+        return self._by_name.get(column_name, default)
+
+    def at_position(self, position):
+        """Get the column at the given position
+        """
+        if self._by_position is None:
+            self._by_position = dict(
+                (c.position, c) for c in self._sorted_columns())
+        return self._by_position.get(position, None)
+
+    def _sorted_columns(self):
+        """Cached list of the columns sorted by position
+        """
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._by_name.values(), key=lambda x: x.position)
+        return self._sorted
+
+    def values(self):
+        """List of columns sorted by position
+        """
+        return list(self._sorted_columns())
+
+    def names(self):
+        """List of column names sorted by position
+        """
+        return [c.name for c in self._sorted_columns()]
+
+    @property
+    def primary_keys(self):
+        """Primary key columns sorted by position
+        """
+        if self._primary_keys is None:
+            self._primary_keys = [c for c in self._sorted_columns()
+                                  if c.primary]
+        return list(self._primary_keys)
+
+    @property
+    def primary_key_names(self):
+        """Primary key column names sorted by position
+        """
+        return [c.name for c in self.primary_keys]
+
+    @property
+    def foreign_keys(self):
+        """Columns referencing another table sorted by position
+        """
+        if self._foreign_keys is None:
+            self._foreign_keys = [c for c in self._sorted_columns()
+                                  if c.fk_table is not None]
+        return list(self._foreign_keys)
+
+    @property
+    def sort_keys(self):
+        """Columns declared as sort keys sorted by position
+        """
+        if self._sort_keys is None:
+            self._sort_keys = [c for c in self._sorted_columns()
+                               if c.is_sortkey]
+        return list(self._sort_keys)
+
+    @property
+    def dist_keys(self):
+        """Columns declared as dist keys sorted by position
+        """
+        if self._dist_keys is None:
+            self._dist_keys = [c for c in self._sorted_columns()
+                               if c.is_distkey]
+        return list(self._dist_keys)
@@ -23,6 +23,10 @@ class Database(object):
         """
         self._relations = {}
 
+        # Reverse dependency index: referenced relation -> referencing FKs
+        # and views, stored as (relation_name, columns, reference_columns)
+        self._dependents = {}
+
         if not atmost_one(relations, files):
             raise ValueError('Only one of relations and files should be given')
 
@@ -63,6 +67,44 @@ class Database(object):
                 'Relation %s already added to database' % relation.full_name)
 
         self._relations[relation.full_name] = relation
+        self._index_dependencies(relation)
+
+    def _index_dependencies(self, relation):
+        """Add the dependencies of a relation to the reverse dependency index
+        """
+        if isinstance(relation, Table):
+            for column_names, ref_name, ref_columns in \
+                    relation.foreign_key_references():
+                self._dependents.setdefault(ref_name, list()).append(
+                    (relation.full_name, column_names, ref_columns))
+
+        if isinstance(relation, View):
+            for dependency in set(relation.dependencies):
+                self._dependents.setdefault(dependency, list()).append(
+                    (relation.full_name, None, None))
+
+    def dependents(self, relation_name):
+        """Names of the relations that directly reference the given relation
+        """
+        result = list()
+        for dependent_name, _, _ in self._dependents.get(relation_name, []):
+            if dependent_name != relation_name and dependent_name not in result:
+                result.append(dependent_name)
+        return result
+
+    def transitive_dependents(self, relation_name):
+        """Names of all the relations that must be rebuilt if the given
+        relation changes, in breadth first order
+        """
+        result = list()
+        queue = [relation_name]
+        while queue:
+            for dependent_name in self.dependents(queue.pop(0)):
+                if dependent_name != relation_name and \
+                        dependent_name not in result:
+                    result.append(dependent_name)
+                    queue.append(dependent_name)
+        return result
 
     def relations(self):
         """Unsorted list of relations of the database
@@ -74,6 +116,18 @@ class Database(object):
         """
         return self._relations.get(relation_name, None)
 
+    def live_columns(self, catalog):
+        """Fetch the live columns of all relations with bulk catalog queries
+
+        Args:
+            catalog(Catalog): Catalog of the database the relations live in
+
+        Returns:
+            result(dict): Map from relation name to the list of CatalogColumn
+                for the relations that exist in the database
+        """
+        return catalog.fetch(self._relations.keys())
+
     @property
     def num_views(self):
         """The number of views in the database
@@ -135,6 +189,33 @@ class Database(object):
                 raise RuntimeError("A cyclic dependency occurred")
         return sorted_relations
 
+    def sorted_relation_levels(self):
+        """Topological sort of the relations grouped by dependency level
+
+        Note:
+            Relations in the same level do not depend on each other, so they
+            can be created concurrently once every earlier level exists.
+        """
+        if self.has_cycles():
+            logger.warning('Database has cycles')
+
+        levels = []
+        graph = dict((x.full_name, x.dependencies) for x in self.relations())
+
+        # Peel off every relation whose dependencies are already resolved
+        while graph:
+            level = [relation_name
+                     for relation_name, dependencies in graph.items()
+                     if not any(d in graph for d in dependencies)]
+
+            if not level:
+                raise RuntimeError("A cyclic dependency occurred")
+
+            for relation_name in level:
+                graph.pop(relation_name)
+            levels.append([self.relation(x) for x in sorted(level)])
+        return levels
+
     def relations_script(self, function_name, **kwargs):
         """SQL Script for all the relations of the database
         """
@@ -168,29 +249,42 @@ class Database(object):
 
     def recreate_table_dependencies(self, table_name, grant_permissions=True):
         """Recreate the dependencies for a particular table from the database
+
+        Note:
+            Views of the dependent views are recreated as well, as dropping
+            a view with CASCADE drops them. Views are recreated in
+            dependency order.
         """
         result = SqlScript()
-        for relation in self.relations():
-            if relation.full_name == table_name:
+        for relation_name, column_names, ref_columns in \
+                self._dependents.get(table_name, list()):
+            if relation_name == table_name:
                 # Continue as cannnot be dependecy of self
                 continue
 
+            relation = self.relation(relation_name)
             if isinstance(relation, Table):
                 # Recreate foreign key relations
-                for column_names, ref_name, ref_columns in \
-                        relation.foreign_key_references():
-                    if ref_name == table_name:
-                        result.append(
-                            relation.foreign_key_reference_script(
-                                source_columns=column_names,
-                                reference_name=ref_name,
-                                reference_columns=ref_columns))
-
-            if isinstance(relation, View):
-                # Recreate view if pointing to table
-                if table_name in relation.dependencies:
-                    result.append(relation.recreate_script(
-                        grant_permissions=grant_permissions))
+                result.append(relation.foreign_key_reference_script(
+                    source_columns=column_names,
+                    reference_name=table_name,
+                    reference_columns=ref_columns))
+
+        # Recreate views pointing to the table, directly or through views
+        view_names = set()
+        queue = [table_name]
+        while queue:
+            for relation_name in self.dependents(queue.pop(0)):
+                relation = self.relation(relation_name)
+                if isinstance(relation, View) and \
+                        relation_name not in view_names:
+                    view_names.add(relation_name)
+                    queue.append(relation_name)
+
+        for relation in self.sorted_relations():
+            if relation.full_name in view_names:
+                result.append(relation.recreate_script(
+                    grant_permissions=grant_permissions))
         return result
 
     @staticmethod
@@ -0,0 +1,206 @@
+"""Script containing the level scheduled executor for database scripts
+"""
+import os
+import threading
+import time
+
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+from Queue import Queue
+
+import logging
+logger = logging.getLogger(__name__)
+
+SUCCESS = 'success'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+BLOCKED = 'blocked'
+
+RelationResult = namedtuple(
+    'RelationResult', ['name', 'status', 'duration', 'error'])
+
+
+class ConnectionPool(object):
+    """Fixed size pool of connections shared by the executor threads
+    """
+    def __init__(self, connection_factory, size):
+        """Constructor for the ConnectionPool class
+
+        Args:
+            connection_factory(function): Returns a new database connection
+            size(int): Maximum number of connections to open
+        """
+        self._connection_factory = connection_factory
+        self._size = size
+        self._created = list()
+        self._available = Queue()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Get a free connection, opening a new one if the pool is not full
+        """
+        with self._lock:
+            if self._available.empty() and len(self._created) < self._size:
+                connection = self._connection_factory()
+                self._created.append(connection)
+                return connection
+        return self._available.get()
+
+    def release(self, connection):
+        """Return a connection to the pool
+        """
+        self._available.put(connection)
+
+    def close(self):
+        """Close all the connections opened by the pool
+        """
+        for connection in self._created:
+            connection.close()
+        self._created = list()
+
+
+class LevelExecutor(object):
+    """Executes relation scripts of a database one dependency level at a time
+
+    Relations within a level run concurrently over a pool of connections and
+    each relation runs in its own transaction. A failed relation only blocks
+    the relations that depend on it.
+    """
+    def __init__(self, database, connection_factory, max_workers=4,
+                 checkpoint=None):
+        """Constructor for the LevelExecutor class
+
+        Args:
+            database(Database): Database whose relations should be executed
+            connection_factory(function): Returns a new database connection
+            max_workers(int): Number of relations executed concurrently
+            checkpoint(str): Path of a file recording completed relations,
+                relations listed in it are skipped on the next run
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be atleast 1')
+
+        self.database = database
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self._connection_factory = connection_factory
+        self._checkpoint_lock = threading.Lock()
+
+    def _completed_relations(self):
+        """Relation names recorded in the checkpoint file
+        """
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return set()
+
+        with open(self.checkpoint) as f:
+            return set(line.strip() for line in f if line.strip())
+
+    def _record_checkpoint(self, relation_name):
+        """Append a completed relation to the checkpoint file
+        """
+        if self.checkpoint is None:
+            return
+
+        with self._checkpoint_lock:
+            with open(self.checkpoint, 'a') as f:
+                f.write(relation_name + '\n')
+
+    @staticmethod
+    def _relation_exists(cursor, relation):
+        """Check if the relation is already present in the database
+        """
+        cursor.execute(relation.check_not_exists_script().sql())
+        return not cursor.fetchone()[0]
+
+    def _execute_relation(self, pool, relation, function_name, skip_existing,
+                          **kwargs):
+        """Execute the script of a single relation in its own transaction
+        """
+        start_time = time.time()
+        connection = pool.acquire()
+        cursor = connection.cursor()
+        try:
+            if skip_existing and self._relation_exists(cursor, relation):
+                logger.info('Skipping existing relation %s',
+                            relation.full_name)
+                self._record_checkpoint(relation.full_name)
+                return RelationResult(
+                    relation.full_name, SKIPPED, time.time() - start_time,
+                    None)
+
+            script = getattr(relation, function_name)(**kwargs)
+            cursor.execute(script.wrap_transaction().sql())
+            self._record_checkpoint(relation.full_name)
+
+            duration = time.time() - start_time
+            logger.info('Executed %s for %s in %0.2f seconds',
+                        function_name, relation.full_name, duration)
+            return RelationResult(relation.full_name, SUCCESS, duration, None)
+
+        except Exception as error:
+            logger.error('Failed %s for %s: %s',
+                         function_name, relation.full_name, error)
+            try:
+                cursor.execute('ROLLBACK')
+            except Exception:
+                pass
+            return RelationResult(
+                relation.full_name, FAILED, time.time() - start_time,
+                str(error))
+
+        finally:
+            cursor.close()
+            pool.release(connection)
+
+    def execute(self, function_name, skip_existing=False, **kwargs):
+        """Execute a relation script function for all relations of the database
+
+        Args:
+            function_name(str): Relation script function, e.g. create_script
+            skip_existing(bool): Skip relations that already exist
+            **kwargs(optional): Keyword arguments for the script function
+
+        Returns:
+            results(list of RelationResult): Outcome for every relation in
+                dependency order
+        """
+        completed = self._completed_relations()
+        failed = set()
+        results = list()
+
+        pool = ConnectionPool(self._connection_factory, self.max_workers)
+        workers = ThreadPool(self.max_workers)
+        try:
+            for level_number, level in enumerate(
+                    self.database.sorted_relation_levels()):
+                runnable = list()
+                for relation in level:
+                    if relation.full_name in completed:
+                        results.append(RelationResult(
+                            relation.full_name, SKIPPED, 0, None))
+                    elif any(d in failed for d in relation.dependencies):
+                        failed.add(relation.full_name)
+                        results.append(RelationResult(
+                            relation.full_name, BLOCKED, 0,
+                            'Dependency failed'))
+                    else:
+                        runnable.append(relation)
+
+                logger.info('Executing level %d with %d relations',
+                            level_number, len(runnable))
+
+                level_results = workers.map(
+                    lambda r: self._execute_relation(
+                        pool, r, function_name, skip_existing, **kwargs),
+                    runnable)
+
+                for result in level_results:
+                    if result.status == FAILED:
+                        failed.add(result.name)
+                    results.append(result)
+        finally:
+            workers.close()
+            workers.join()
+            pool.close()
+
+        return results
@@ -0,0 +1,278 @@
+"""Script containing the VACUUM and ANALYZE scheduling for loaded tables
+"""
+import re
+
+from collections import defaultdict
+from collections import namedtuple
+from datetime import datetime
+
+from ..config import Config
+from .catalog import normalize_relation_name
+from .catalog import split_relation_name
+from .sql import SqlScript
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYZE_THRESHOLD = 10.0
+DEFAULT_VACUUM_SORT_THRESHOLD = 10.0
+DEFAULT_VACUUM_DELETE_THRESHOLD = 10.0
+DEFAULT_QUEUE_TABLE = 'public.dataduct_maintenance_queue'
+
+TableStats = namedtuple('TableStats', [
+    'total_rows', 'visible_rows', 'unsorted', 'stats_off'])
+
+# tbl_rows includes the deleted rows that are not vacuumed yet
+TABLE_STATS_QUERY = """
+    SELECT tbl_rows AS total_rows
+        ,estimated_visible_rows AS visible_rows
+        ,unsorted
+        ,stats_off
+    FROM svv_table_info
+    WHERE "schema" = '{schema_name}'
+    AND "table" = '{name}'
+"""
+
+QUEUE_DEFINITION = """
+    CREATE TABLE IF NOT EXISTS {queue_table} (
+        table_name VARCHAR(256) NOT NULL,
+        command VARCHAR(256) NOT NULL,
+        queued_at TIMESTAMP DEFAULT GETDATE()
+    )
+"""
+
+CHANGE_PATTERN = re.compile(
+    r'^\s*(INSERT\s+INTO|DELETE\s+FROM|UPDATE|MERGE\s+INTO)\s+([\w."]+)',
+    re.IGNORECASE)
+
+WINDOW_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})$')
+
+
+def in_window(window, now=None):
+    """Check if the time is inside a HH:MM-HH:MM window
+
+    Args:
+        window(str): Window in UTC, which may wrap around midnight. None
+            means that maintenance can run at any time
+        now(datetime): Time to check, defaults to the current UTC time
+    """
+    if window is None:
+        return True
+
+    match = WINDOW_PATTERN.match(window.strip())
+    if match is None:
+        raise ValueError('Maintenance window should be HH:MM-HH:MM')
+
+    start_hour, start_minute, end_hour, end_minute = \
+        [int(g) for g in match.groups()]
+    start = start_hour * 60 + start_minute
+    end = end_hour * 60 + end_minute
+
+    if now is None:
+        now = datetime.utcnow()
+    minute = now.hour * 60 + now.minute
+
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+class TableMaintenance(object):
+    """Decides which tables need a VACUUM or an ANALYZE after a load
+
+    The rows changed by the executed statements and the table statistics
+    from svv_table_info are compared against thresholds, so tables that
+    barely changed are skipped. Commands outside of the maintenance window
+    are queued in a table and run later by the maintenance executor.
+    """
+    def __init__(self, analyze_threshold=DEFAULT_ANALYZE_THRESHOLD,
+                 vacuum_sort_threshold=DEFAULT_VACUUM_SORT_THRESHOLD,
+                 vacuum_delete_threshold=DEFAULT_VACUUM_DELETE_THRESHOLD,
+                 window=None, queue_table=DEFAULT_QUEUE_TABLE):
+        """Constructor for the TableMaintenance class
+
+        Args:
+            analyze_threshold(float): Percent of changed or stale rows for
+                an ANALYZE
+            vacuum_sort_threshold(float): Percent of unsorted rows for a
+                VACUUM SORT ONLY
+            vacuum_delete_threshold(float): Percent of deleted rows for a
+                VACUUM DELETE ONLY
+            window(str): HH:MM-HH:MM window in UTC for the maintenance
+            queue_table(str): Table holding the queued commands
+        """
+        self.analyze_threshold = analyze_threshold
+        self.vacuum_sort_threshold = vacuum_sort_threshold
+        self.vacuum_delete_threshold = vacuum_delete_threshold
+        self.window = window
+        self.queue_table = queue_table
+
+        # Rows inserted and deleted per table
+        self._changes = defaultdict(lambda: [0, 0])
+
+    @classmethod
+    def from_config(cls):
+        """Create the maintenance using the thresholds from the config
+        """
+        config = Config()
+        redshift_config = getattr(config, 'redshift', dict())
+        return cls(
+            analyze_threshold=redshift_config.get(
+                'ANALYZE_THRESHOLD', DEFAULT_ANALYZE_THRESHOLD),
+            vacuum_sort_threshold=redshift_config.get(
+                'VACUUM_SORT_THRESHOLD', DEFAULT_VACUUM_SORT_THRESHOLD),
+            vacuum_delete_threshold=redshift_config.get(
+                'VACUUM_DELETE_THRESHOLD', DEFAULT_VACUUM_DELETE_THRESHOLD),
+            window=redshift_config.get('MAINTENANCE_WINDOW', None),
+            queue_table=redshift_config.get(
+                'MAINTENANCE_QUEUE_TABLE', DEFAULT_QUEUE_TABLE))
+
+    def record(self, sql, rowcount):
+        """Record the rows changed by an executed statement
+
+        Args:
+            sql(str): Statement that was executed
+            rowcount(int): Row count of the cursor after the statement
+        """
+        match = CHANGE_PATTERN.match(sql)
+        if match is None or rowcount is None or rowcount < 0:
+            return
+
+        operation = match.group(1).split()[0].upper()
+        changes = self._changes[
+            normalize_relation_name(match.group(2).replace('"', ''))]
+        if operation in ['INSERT', 'UPDATE', 'MERGE']:
+            changes[0] += rowcount
+        if operation in ['DELETE', 'UPDATE']:
+            changes[1] += rowcount
+
+    def changed_rows(self, table_name):
+        """Rows inserted and deleted in a table by the recorded statements
+        """
+        return tuple(self._changes.get(
+            normalize_relation_name(table_name), [0, 0]))
+
+    @staticmethod
+    def table_stats(cursor, table_name):
+        """Statistics of the table from svv_table_info
+
+        Returns:
+            result(TableStats): None for empty tables, which are not listed
+        """
+        schema_name, name = split_relation_name(table_name)
+        cursor.execute(TABLE_STATS_QUERY.format(schema_name=schema_name,
+                                                name=name))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return TableStats(*[0 if value is None else value for value in row])
+
+    def commands(self, table_name, stats):
+        """Maintenance commands the table needs after the recorded changes
+
+        Args:
+            table_name(str): Name of the table
+            stats(TableStats): Statistics of the table after the load
+        """
+        inserted, deleted = self.changed_rows(table_name)
+        if stats is None:
+            return list()
+
+        total_rows = max(stats.total_rows, 1)
+        result = list()
+
+        # stats_off also covers tables swapped in without any statistics
+        changed = 100.0 * (inserted + deleted) / total_rows
+        if max(changed, stats.stats_off) >= self.analyze_threshold:
+            result.append('ANALYZE %s PREDICATE COLUMNS' % table_name)
+
+        deleted = max(deleted, stats.total_rows - stats.visible_rows)
+        needs_delete = (100.0 * deleted / total_rows >=
+                        self.vacuum_delete_threshold)
+        needs_sort = stats.unsorted >= self.vacuum_sort_threshold
+        if needs_delete and needs_sort:
+            result.append('VACUUM FULL %s' % table_name)
+        elif needs_delete:
+            result.append('VACUUM DELETE ONLY %s' % table_name)
+        elif needs_sort:
+            result.append('VACUUM SORT ONLY %s' % table_name)
+
+        return result
+
+    def enqueue_script(self, table_name, commands):
+        """Sql script to queue the commands for the maintenance window
+        """
+        script = SqlScript(QUEUE_DEFINITION.format(
+            queue_table=self.queue_table))
+        for command in commands:
+            script.append(
+                "INSERT INTO %s (table_name, command) VALUES ('%s', '%s')" % (
+                    self.queue_table, table_name, command))
+        return script
+
+    def run(self, cursor, table_name, now=None):
+        """Run or queue the maintenance of a table
+
+        Note:
+            VACUUM can not run inside a transaction, so the connection of
+            the cursor should be in autocommit mode.
+
+        Returns:
+            result(list of str): Commands that were run or queued
+        """
+        commands = self.commands(table_name,
+                                 self.table_stats(cursor, table_name))
+        if not commands:
+            logger.info('No maintenance needed for %s', table_name)
+            return commands
+
+        if in_window(self.window, now):
+            for command in commands:
+                logger.info('Running %s', command)
+                cursor.execute(command)
+        else:
+            logger.info('Queueing %s', ', '.join(commands))
+            for statement in self.enqueue_script(table_name,
+                                                 commands).statements:
+                cursor.execute(statement.sql())
+        return commands
+
+    def queued_commands(self, cursor):
+        """Distinct queued commands in the order they were first queued
+
+        Returns:
+            result(list of tuple): Table name and command
+        """
+        cursor.execute(QUEUE_DEFINITION.format(queue_table=self.queue_table))
+        cursor.execute(
+            'SELECT table_name, command FROM %s '
+            'GROUP BY table_name, command ORDER BY MIN(queued_at)' %
+            self.queue_table)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def run_queue(self, cursor, table_names=None):
+        """Run the queued commands, removing them from the queue
+
+        Args:
+            table_names(list of str): Only run the commands of these tables
+
+        Returns:
+            result(list of str): Commands that were run
+        """
+        if table_names is not None:
+            table_names = set(normalize_relation_name(t)
+                              for t in table_names)
+
+        result = list()
+        for table_name, command in self.queued_commands(cursor):
+            if table_names is not None and \
+                    normalize_relation_name(table_name) not in table_names:
+                continue
+
+            logger.info('Running %s', command)
+            cursor.execute(command)
+            cursor.execute(
+                "DELETE FROM %s WHERE table_name = '%s' AND command = '%s'" %
+                (self.queue_table, table_name, command))
+            result.append(command)
+        return result
@@ -10,4 +10,5 @@ from .select_query import parse_column_name
 
 from .create_table import parse_create_table
 from .create_table import create_exists_clone
+from .create_table import create_renamed_clone
 from .create_view import parse_create_view
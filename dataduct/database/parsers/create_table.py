@@ -174,3 +174,16 @@ def create_exists_clone(string):
     return template.format(temp='TEMP' if result['temporary'] else '',
                            table_name=result['full_name'],
                            definition=result['definition'])
+
+
+def create_renamed_clone(string, table_name):
+    """Create a clone of the table statement with a different table name
+    """
+    parser = get_definition_start() + restOfLine.setResultsName('definition')
+    result = to_dict(parser.parseString(string))
+    template = 'CREATE {temp} TABLE {exists} {table_name} {definition}'
+    return template.format(temp='TEMP' if result['temporary'] else '',
+                           exists='IF NOT EXISTS' if result['exists_checks']
+                           else '',
+                           table_name=table_name,
+                           definition=result['definition'])
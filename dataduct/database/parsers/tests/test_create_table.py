@@ -8,6 +8,7 @@ from pyparsing import ParseException
 
 from ..create_table import parse_create_table
 from ..create_table import create_exists_clone
+from ..create_table import create_renamed_clone
 
 
 class TestCreateTableStatement(TestCase):
@@ -43,6 +44,20 @@ class TestCreateTableStatement(TestCase):
         eq_(output['temporary'], False)
         eq_(output['exists_checks'], True)
 
+    @staticmethod
+    def test_renamed_clone():
+        """Basic test for create table clone with a different name
+        """
+        query = ('CREATE TABLE prod.orders ('
+                 'customer_id INTEGER DISTKEY PRIMARY KEY,'
+                 'customer_name VARCHAR(200)) SORTKEY(customer_id)')
+
+        renamed_clone = create_renamed_clone(query, 'prod.orders_shadow')
+        output = parse_create_table(renamed_clone)
+        eq_(output['full_name'], 'prod.orders_shadow')
+        eq_(output['sortkey'], ['customer_id'])
+        eq_(len(output['columns']), 2)
+
     @staticmethod
     @raises(ParseException)
     def test_bad_input():
@@ -0,0 +1,279 @@
+"""Script containing the schema diff between definitions and a live database
+"""
+import re
+
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+
+from .catalog import Catalog
+from .catalog import DEFAULT_BATCH_SIZE
+from .level_executor import ConnectionPool
+from .sql import SqlScript
+from .table import Table
+
+import logging
+logger = logging.getLogger(__name__)
+
+MISSING_COLUMN = 'missing_column'
+EXTRA_COLUMN = 'extra_column'
+COLUMN_TYPE = 'column_type'
+ENCODING = 'encoding'
+SORTKEY = 'sortkey'
+DISTKEY = 'distkey'
+
+ColumnDifference = namedtuple(
+    'ColumnDifference', ['kind', 'column_name', 'expected', 'actual'])
+
+RelationDiff = namedtuple('RelationDiff', ['name', 'exists', 'differences'])
+
+# Names returned by FORMAT_TYPE for the column types accepted by the parser
+TYPE_ALIASES = {
+    'SMALLINT': 'smallint',
+    'INT2': 'smallint',
+    'INTEGER': 'integer',
+    'INT': 'integer',
+    'INT4': 'integer',
+    'BIGINT': 'bigint',
+    'INT8': 'bigint',
+    'REAL': 'real',
+    'FLOAT4': 'real',
+    'DOUBLE PRECISION': 'double precision',
+    'DOUBLE': 'double precision',
+    'FLOAT': 'double precision',
+    'FLOAT8': 'double precision',
+    'BOOLEAN': 'boolean',
+    'CHAR': 'character(1)',
+    'CHARACTER': 'character(1)',
+    'NCHAR': 'character(1)',
+    'BPCHAR': 'character(1)',
+    'TEXT': 'character varying(256)',
+    'DATE': 'date',
+    'TIMESTAMP': 'timestamp without time zone',
+}
+
+VARCHAR_PATTERN = re.compile(r'^(N?VARCHAR|TEXT)\s*\(\s*(\w+)\s*\)$')
+DECIMAL_PATTERN = re.compile(r'^(DECIMAL|NUMERIC)\s*\(([\d\s,]+)\)$')
+MAX_VARCHAR_LENGTH = '65535'
+
+
+def normalize_type(column_type):
+    """Convert a column type from a definition to the catalog format
+    """
+    column_type = ' '.join(column_type.upper().split())
+    if column_type in TYPE_ALIASES:
+        return TYPE_ALIASES[column_type]
+
+    match = VARCHAR_PATTERN.match(column_type)
+    if match:
+        length = match.group(2)
+        if length == 'MAX':
+            length = MAX_VARCHAR_LENGTH
+        return 'character varying(%s)' % length
+
+    match = DECIMAL_PATTERN.match(column_type)
+    if match:
+        return 'numeric(%s)' % match.group(2).replace(' ', '')
+
+    return column_type.lower()
+
+
+def normalize_encoding(encoding):
+    """Convert a column encoding to the catalog format
+    """
+    encoding = encoding.lower()
+    return 'none' if encoding == 'raw' else encoding
+
+
+def diff_table(table, live_columns):
+    """Differences between the definition of a table and its live columns
+
+    Args:
+        table(Table): Table definition
+        live_columns(list of CatalogColumn): Columns of the live table
+
+    Returns:
+        differences(list of ColumnDifference): Differences sorted by the
+            position of the columns in the definition
+    """
+    differences = list()
+    live_by_name = dict((c.name.lower(), c) for c in live_columns)
+    sort_keys = set(k.lower() for k in table.sort_keys)
+    dist_keys = set(k.lower() for k in table.dist_keys)
+
+    for column in table.columns():
+        name = column.name.lower()
+        live_column = live_by_name.pop(name, None)
+        if live_column is None:
+            differences.append(ColumnDifference(
+                MISSING_COLUMN, column.name, column.column_type, None))
+            continue
+
+        expected_type = normalize_type(column.column_type)
+        if expected_type != live_column.column_type:
+            differences.append(ColumnDifference(
+                COLUMN_TYPE, name, expected_type, live_column.column_type))
+
+        if column.encoding is not None:
+            expected_encoding = normalize_encoding(column.encoding)
+            if expected_encoding != live_column.encoding:
+                differences.append(ColumnDifference(
+                    ENCODING, name, expected_encoding, live_column.encoding))
+
+        is_sortkey = live_column.sortkey_position != 0
+        if (name in sort_keys) != is_sortkey:
+            differences.append(ColumnDifference(
+                SORTKEY, name, name in sort_keys, is_sortkey))
+
+        if (name in dist_keys) != bool(live_column.is_distkey):
+            differences.append(ColumnDifference(
+                DISTKEY, name, name in dist_keys, live_column.is_distkey))
+
+    for live_column in sorted(live_by_name.values(),
+                              key=lambda x: x.position):
+        differences.append(ColumnDifference(
+            EXTRA_COLUMN, live_column.name, None, live_column.column_type))
+
+    return differences
+
+
+class SchemaDiff(object):
+    """Schema drift between the relation definitions and a live database
+
+    The live catalog is fetched in batches of relations, with the batches
+    fetched and compared concurrently over a pool of connections.
+    """
+    def __init__(self, database, connection_factory, max_workers=4,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        """Constructor for the SchemaDiff class
+
+        Args:
+            database(Database): Database with the relation definitions
+            connection_factory(function): Returns a new database connection
+            max_workers(int): Number of batches fetched concurrently
+            batch_size(int): Number of relations fetched in a single query
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be atleast 1')
+
+        self.database = database
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._connection_factory = connection_factory
+
+    def _diff_batch(self, pool, relations):
+        """Fetch the live columns of a batch of relations and compare them
+        """
+        connection = pool.acquire()
+        try:
+            catalog = Catalog(connection, batch_size=self.batch_size)
+            live_columns = catalog.fetch([r.full_name for r in relations])
+        finally:
+            pool.release(connection)
+
+        result = list()
+        for relation in relations:
+            columns = live_columns.get(relation.full_name, None)
+            if columns is None:
+                result.append(RelationDiff(relation.full_name, False, list()))
+            elif isinstance(relation, Table):
+                result.append(RelationDiff(
+                    relation.full_name, True, diff_table(relation, columns)))
+            else:
+                # View columns are derived from the query, only check existence
+                result.append(RelationDiff(relation.full_name, True, list()))
+        return result
+
+    def compute(self):
+        """Compare all the relations of the database with the live catalog
+
+        Returns:
+            result(list of RelationDiff): Diff for every relation sorted by name
+        """
+        relations = sorted(self.database.relations(),
+                           key=lambda x: x.full_name)
+        batches = [relations[i:i + self.batch_size]
+                   for i in range(0, len(relations), self.batch_size)]
+
+        pool = ConnectionPool(self._connection_factory, self.max_workers)
+        workers = ThreadPool(self.max_workers)
+        try:
+            batch_results = workers.map(
+                lambda batch: self._diff_batch(pool, batch), batches)
+        finally:
+            workers.close()
+            workers.join()
+            pool.close()
+
+        return [diff for batch in batch_results for diff in batch]
+
+    @staticmethod
+    def _add_columns_script(table, differences):
+        """Sql script to add the missing columns to a table
+        """
+        script = SqlScript()
+        for difference in differences:
+            column = table.column(difference.column_name)
+            sql = 'ALTER TABLE %s ADD COLUMN %s %s' % (
+                table.full_name, column.column_name, column.column_type)
+            if column.encoding is not None:
+                sql += ' ENCODE %s' % column.encoding
+            script.append(sql)
+        return script
+
+    def _rebuild_table_script(self, table, differences):
+        """Sql script to rebuild a table keeping the data of common columns
+        """
+        old_name = table.table_name + '_old'
+        if table.schema_name is not None:
+            old_full_name = '%s.%s' % (table.schema_name, old_name)
+        else:
+            old_full_name = old_name
+
+        # Missing columns are not in the live table and get their default
+        missing_names = set(d.column_name for d in differences
+                            if d.kind == MISSING_COLUMN)
+        columns = ', '.join(c.name for c in table.columns()
+                            if c.name not in missing_names)
+        script = table.rename_script(old_name)
+        script.append(table.create_script())
+        script.append('INSERT INTO %s (%s) SELECT %s FROM %s' % (
+            table.full_name, columns, columns, old_full_name))
+        script.append('DROP TABLE %s CASCADE' % old_full_name)
+        script.append(
+            self.database.recreate_table_dependencies(table.full_name))
+        return script
+
+    def plan_script(self, diffs=None):
+        """Sql script to bring the live database in line with the definitions
+
+        Note:
+            Missing relations are created and missing columns are added,
+            any other difference rebuilds the table with its data.
+
+        Args:
+            diffs(list of RelationDiff): Result of compute, computed if None
+        """
+        if diffs is None:
+            diffs = self.compute()
+        diffs = dict((d.name, d) for d in diffs)
+
+        script = SqlScript()
+        for relation in self.database.sorted_relations():
+            diff = diffs.get(relation.full_name, None)
+            if diff is None:
+                continue
+
+            if not diff.exists:
+                script.append(relation.create_script())
+                continue
+
+            if not diff.differences:
+                continue
+
+            if all(d.kind == MISSING_COLUMN for d in diff.differences):
+                script.append(
+                    self._add_columns_script(relation, diff.differences))
+            else:
+                script.append(self._rebuild_table_script(
+                    relation, diff.differences))
+        return script
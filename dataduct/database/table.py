@@ -1,8 +1,11 @@
 """Script containing the table class object
 """
 from ..utils.helpers import stringify_credentials
+from ..utils.helpers import unload_options
 from .column import Column
+from .column_collection import ColumnCollection
 from .parsers import create_exists_clone
+from .parsers import create_renamed_clone
 from .parsers import parse_create_table
 from .relation import Relation
 from .select_statement import SelectStatement
@@ -53,10 +56,9 @@ class Table(Relation):
 
         self._constraints = parameters.get('constraints', list())
 
-        self._columns = dict()
-        for column_params in parameters.get('columns', list()):
-            column_name = column_params['column_name']
-            self._columns[column_name] = Column(**column_params)
+        self._columns = ColumnCollection(
+            Column(**column_params)
+            for column_params in parameters.get('columns', list()))
 
         self.schema_name, self.table_name = self.initialize_name()
         self.update_attributes_from_columns()
@@ -67,7 +69,7 @@ class Table(Relation):
         """
         distkeys = self.dist_keys
         sortkeys = self.sort_keys
-        for column in self._columns.values():
+        for column in self._columns:
             # Update the table attributes based on columns
             if column.is_distkey:
                 distkeys.append(column.name)
@@ -82,12 +84,12 @@ class Table(Relation):
         """
         for constraint in self._constraints:
             for col_name in constraint.get('pk_columns', list()):
-                self._columns[col_name].primary = True
+                self._columns.set_primary(col_name)
 
     def columns(self):
-        """Unsorted list of columns in the table
+        """List of columns in the table sorted by position
         """
-        return sorted(self._columns.values(), key=lambda x: x.position)
+        return self._columns.values()
 
     def column(self, column_name):
         """Get the column with the given name
@@ -98,22 +100,21 @@ class Table(Relation):
     def primary_keys(self):
         """Primary keys of the table
         """
-        return [c for c in self.columns() if c.primary]
+        return self._columns.primary_keys
 
     @property
     def primary_key_names(self):
         """Primary keys of the table
         """
-        return [c.name for c in self.columns() if c.primary]
+        return self._columns.primary_key_names
 
     def foreign_key_references(self):
         """Get a list of all foreign key references from the table
         """
         result = list()
-        for column in self.columns():
-            if column.fk_table is not None:
-                result.append((
-                    [column.name], column.fk_table, [column.fk_reference]))
+        for column in self._columns.foreign_keys:
+            result.append((
+                [column.name], column.fk_table, [column.fk_reference]))
 
         for constraint in self._constraints:
             if 'fk_table' in constraint:
@@ -141,7 +142,7 @@ class Table(Relation):
 
         # Create a list of column definitions
         columns = comma_seperated(
-            ['%s %s' % (c.column_name, c.column_type) for c in self.columns()])
+            ['%s %s' % (c.column_name, c.column_type) for c in self._columns])
 
         if self.primary_keys:
             sql = """CREATE TEMPORARY TABLE {table_name} (
@@ -215,6 +216,48 @@ class Table(Relation):
 
         return SqlScript(sql)
 
+    def duplicate_count_script(self):
+        """Sql Script to count the duplicate primary keys in the table
+        """
+        sql = """
+            SELECT COUNT(1) duplicate_keys
+            FROM (
+                SELECT {pk_columns}
+                FROM {table_name}
+                GROUP BY {pk_columns}
+                HAVING COUNT(1) > 1
+            ) duplicates
+        """.format(table_name=self.full_name,
+                   pk_columns=comma_seperated(self.primary_key_names))
+
+        return SqlScript(sql)
+
+    def duplicate_sample_script(self, sample_size):
+        """Sql Script to select the most duplicated primary keys
+        """
+        sql = self.select_duplicates_script().statements[0].sql()
+        return SqlScript('%s ORDER BY duplicate_count DESC LIMIT %d' % (
+            sql, sample_size))
+
+    def approximate_duplicate_count_script(self):
+        """Sql Script to count the rows and estimate the distinct primary
+        keys of the table with HyperLogLog
+        """
+        pk_names = self.primary_key_names
+        if len(pk_names) == 1:
+            key = pk_names[0]
+        else:
+            key = " || '|' || ".join(
+                'CAST(%s AS VARCHAR)' % name for name in pk_names)
+
+        sql = """
+            SELECT COUNT(1) row_count
+                ,APPROXIMATE COUNT(DISTINCT {key}) key_count
+            FROM {table_name}
+        """.format(table_name=self.full_name, key=key)
+
+        return SqlScript(sql)
+
     def _source_sql(self, source_relation, filter_clause=None):
         """Get the source sql based on the type of the source specified
         """
@@ -222,7 +265,7 @@ class Table(Relation):
                 isinstance(source_relation, SelectStatement)):
             raise ValueError('Source Relation must be a relation or select')
 
-        if len(self.columns()) < len(source_relation.columns()):
+        if len(self._columns) < len(source_relation.columns()):
             raise ValueError('Source has more columns than destination')
 
         if isinstance(source_relation, SelectStatement):
@@ -245,18 +288,13 @@ class Table(Relation):
     def delete_matching_rows_script(self, source_relation):
         """Sql Script to delete matching rows between table and source
         """
-        if len(self.primary_keys) == 0:
+        pk_names = self.primary_key_names
+        if len(pk_names) == 0:
             raise RuntimeError(
                 'Cannot delete matching rows from table with no primary keys')
 
-        source_col_names, pk_names = [], []
-        for column in self.columns():
-            if column.primary:
-                pk_names.append(column.name)
-                source_col_names.append(column.name)
-
         where_condition = 'WHERE (%s) IN (SELECT DISTINCT %s FROM %s)' % (
-            comma_seperated(pk_names), comma_seperated(source_col_names),
+            comma_seperated(pk_names), comma_seperated(pk_names),
             self._source_sql(source_relation))
 
         return self.delete_script(where_condition)
@@ -270,7 +308,7 @@ class Table(Relation):
             return SqlScript()
 
         script = self.temporary_clone_script()
-        column_names = [c.name for c in self.columns()]
+        column_names = self._columns.names()
 
         # Create a temporary clone from the script
         temp_table = self.__class__(script)
@@ -324,6 +362,260 @@ class Table(Relation):
         script.append(temp_table.drop_script())
         return script
 
+    def staging_clone_script(self):
+        """Sql script to create a temporary staging table for a merge
+
+        Note:
+            Unlike the temporary clone the staging table keeps the dist and
+            sort keys, so joining it back to the table needs no
+            redistribution of the table
+        """
+        table_name = self.table_name + '_staging'
+        columns = ['%s %s' % (c.column_name, c.column_type)
+                   for c in self._columns]
+        if self.primary_keys:
+            columns.append(
+                'PRIMARY KEY( %s )' % comma_seperated(self.primary_key_names))
+
+        sql = 'CREATE TEMPORARY TABLE %s ( %s )' % (
+            table_name, comma_seperated(columns))
+
+        if self.dist_keys:
+            sql += ' DISTKEY(%s)' % self.dist_keys[0]
+
+        # Keep the order of a compound sort key
+        sort_keys = list()
+        for name in self.parameters.get('sortkey') or self.sort_keys:
+            if name not in sort_keys:
+                sort_keys.append(name)
+        if sort_keys:
+            sql += ' SORTKEY(%s)' % comma_seperated(sort_keys)
+
+        return SqlScript(sql)
+
+    def _deduplicated_insert_script(self, source_relation,
+                                    filter_clause=None):
+        """Sql script to insert a single row for every primary key
+
+        The rows are numbered in a single pass over the source, so unlike
+        de_duplication_script the data is not copied again.
+
+        Note:
+            Only table sources are numbered in a single pass, the columns
+            parsed from a select are not the names of its output columns
+            when they are expressions without an alias.
+        """
+        pk_names = self.primary_key_names
+        source_names = list()
+        if isinstance(source_relation, Table):
+            source_names = [c.name for c in source_relation.columns()]
+        if not source_names or not set(pk_names) <= set(source_names):
+            script = self.insert_script(source_relation, filter_clause)
+            script.append(self.de_duplication_script())
+            return script
+
+        sql = """
+            INSERT INTO {table_name} (
+                SELECT {column_names}
+                FROM (
+                    SELECT *,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY {pk_names}
+                        ORDER BY {pk_names}) dataduct_row_number
+                    FROM {source})
+                WHERE dataduct_row_number = 1)
+        """.format(table_name=self.full_name,
+                   column_names=comma_seperated(source_names),
+                   pk_names=comma_seperated(pk_names),
+                   source=self._source_sql(source_relation, filter_clause))
+        return SqlScript(sql)
+
+    def delete_joined_rows_script(self, source_relation):
+        """Sql Script to delete matching rows with a join on the primary key
+        """
+        pk_names = self.primary_key_names
+        if len(pk_names) == 0:
+            raise RuntimeError(
+                'Cannot delete matching rows from table with no primary keys')
+
+        source_name = source_relation.full_name
+        where_condition = 'USING %s WHERE %s' % (source_name, ' AND '.join(
+            '%s.%s = %s.%s' % (self.full_name, name, source_name, name)
+            for name in pk_names))
+
+        return self.delete_script(where_condition)
+
+    def merge_statement_script(self, source_relation):
+        """Sql Script to update and insert the rows of a source with MERGE
+
+        Note:
+            MERGE fails if a row of the table matches multiple source rows,
+            so the source should be de-duplicated.
+        """
+        pk_names = self.primary_key_names
+        if len(pk_names) == 0:
+            raise RuntimeError('Cannot merge into table with no primary keys')
+
+        source_name = source_relation.full_name
+        column_names = self._columns.names()
+
+        # Every row needs a matched action even if all columns are keys
+        update_names = [n for n in column_names if n not in pk_names]
+        sql = """
+            MERGE INTO {table_name} USING {source}
+            ON {condition}
+            WHEN MATCHED THEN UPDATE SET {updates}
+            WHEN NOT MATCHED THEN INSERT ({column_names})
+                VALUES ({values})
+        """.format(table_name=self.full_name,
+                   source=source_name,
+                   condition=' AND '.join(
+                       '%s.%s = %s.%s' % (self.full_name, name,
+                                          source_name, name)
+                       for name in pk_names),
+                   updates=comma_seperated(
+                       '%s = %s.%s' % (name, source_name, name)
+                       for name in update_names or pk_names),
+                   column_names=comma_seperated(column_names),
+                   values=comma_seperated(
+                       '%s.%s' % (source_name, name)
+                       for name in column_names))
+        return SqlScript(sql)
+
+    def merge_script(self, source_relation, enforce_primary_key=True,
+                     filter_clause=None, use_merge=False):
+        """Sql script to upsert into a table by joining on the primary key
+
+        The source is copied once into a staging table distributed like the
+        table, de-duplicating it on the way. Matching rows are then replaced
+        using a join instead of the IN subquery of upsert_script, or with a
+        MERGE statement if use_merge is set.
+        """
+        script = self.staging_clone_script()
+        staging_table = self.__class__(script)
+
+        # MERGE rejects sources with duplicate keys
+        if enforce_primary_key or use_merge:
+            script.append(staging_table._deduplicated_insert_script(
+                source_relation, filter_clause))
+        else:
+            script.append(
+                staging_table.insert_script(source_relation, filter_clause))
+
+        if use_merge:
+            script.append(self.merge_statement_script(staging_table))
+        else:
+            script.append(self.delete_joined_rows_script(staging_table))
+            script.append(self.insert_script(staging_table))
+
+        script.append(staging_table.drop_script())
+        return script
+
+    def _qualified_name(self, table_name):
+        """Name of a table in the same schema as this table
+        """
+        if self.schema_name is None:
+            return table_name
+        return '%s.%s' % (self.schema_name, table_name)
+
+    def shadow_clone_script(self):
+        """Sql script to create an empty clone with the full definition
+
+        Note:
+            Unlike the temporary clone the shadow keeps the keys, encodings
+            and constraints, so it can replace the table.
+        """
+        shadow_name = self._qualified_name(self.table_name + '_shadow')
+        script = SqlScript('DROP TABLE IF EXISTS %s' % shadow_name)
+        script.append(create_renamed_clone(self.sql_statement.sql(),
+                                           shadow_name))
+        return script
+
+    def _shadow_load_script(self, source_relation, enforce_primary_key=True,
+                            filter_clause=None):
+        """Sql script to fill a shadow clone with the de-duplicated source
+
+        Returns:
+            result(tuple): The script and the shadow table
+        """
+        script = self.shadow_clone_script()
+        shadow_table = self.__class__(script.statements[-1])
+
+        if not enforce_primary_key:
+            script.append(
+                shadow_table.insert_script(source_relation, filter_clause))
+            return script, shadow_table
+
+        # De-duplicate in a temporary table so the shadow has no deleted rows
+        script.append(self.temporary_clone_script())
+        temp_table = self.__class__(script.statements[-1])
+        script.append(temp_table.insert_script(source_relation, filter_clause))
+        script.append(temp_table.de_duplication_script())
+        script.append(shadow_table.insert_script(temp_table))
+        script.append(temp_table.drop_script())
+        return script, shadow_table
+
+    def _swap_in_script(self, shadow_table):
+        """Sql script replacing the table with a loaded shadow table
+
+        Note:
+            Dropping the old table drops the views on it and the foreign
+            keys referencing it, the sql runner recreates them with
+            --recreate_dependencies.
+        """
+        old_name = self.table_name + '_old'
+        script = SqlScript(
+            'DROP TABLE IF EXISTS %s' % self._qualified_name(old_name))
+        script.append(self.rename_script(old_name))
+        script.append(shadow_table.rename_script(self.table_name))
+        script.append(self.grant_script())
+        script.append(
+            'DROP TABLE %s CASCADE' % self._qualified_name(old_name))
+        return script
+
+    def swap_script(self, source_relation, enforce_primary_key=True,
+                    filter_clause=None):
+        """Sql script to reload the table by swapping in a shadow table
+
+        The source is loaded into a shadow clone of the table which replaces
+        the table with two renames, so readers see either the old or the new
+        data. The old table is dropped with its dependent views, which have
+        to be recreated after the script.
+        """
+        script, shadow_table = self._shadow_load_script(
+            source_relation, enforce_primary_key, filter_clause)
+        script.append(self._swap_in_script(shadow_table))
+        return script
+
+    def append_script(self, source_relation, enforce_primary_key=True,
+                      filter_clause=None):
+        """Sql script to reload the table by appending into a shadow table
+
+        Note:
+            ALTER TABLE APPEND moves the storage blocks of a source table
+            with the same columns into the empty shadow table, instead of
+            copying them, and leaves the source table empty. Other sources
+            are copied as for swap_script. The shadow table then replaces
+            the table in a single transaction, as the table itself is never
+            emptied. APPEND commits implicitly, so the script must run
+            outside of a transaction.
+        """
+        can_append = isinstance(source_relation, Table) and \
+            not enforce_primary_key and filter_clause is None and \
+            [(c.name, c.column_type) for c in source_relation.columns()] == \
+            [(c.name, c.column_type) for c in self.columns()]
+        if not can_append:
+            script, shadow_table = self._shadow_load_script(
+                source_relation, enforce_primary_key, filter_clause)
+        else:
+            script = self.shadow_clone_script()
+            shadow_table = self.__class__(script.statements[-1])
+            script.append('ALTER TABLE %s APPEND FROM %s' % (
+                shadow_table.full_name, source_relation.full_name))
+
+        script.append(self._swap_in_script(shadow_table).wrap_transaction())
+        return script
+
     def check_not_exists_script(self):
         """Sql script to create statement if the table exists or not
         """
@@ -336,8 +628,12 @@ class Table(Relation):
             )
         """ % (self.schema_name, self.table_name))
 
-    def unload_script(self, s3_path, access_key, secret_key, token=None):
+    def unload_script(self, s3_path, access_key, secret_key, token=None,
+                      **options):
         """Sql script to unload table to S3
+
+        Args:
+            **options(optional): UNLOAD options passed to unload_options
         """
         script = (
             "UNLOAD ('{select_script}') TO '{s3_path}' CREDENTIALS '{creds}' "
@@ -347,6 +643,9 @@ class Table(Relation):
             s3_path=s3_path,
             creds=stringify_credentials(access_key, secret_key, token)
         )
+        options = unload_options(**options)
+        if options:
+            script += ' ' + options
         return SqlScript(script)
 
     def load_script(self, s3_path, access_key, secret_key, token=None):
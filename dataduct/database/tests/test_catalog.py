@@ -0,0 +1,150 @@
+"""Tests for the Catalog
+"""
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+
+from ..catalog import Catalog
+from ..catalog import CatalogColumn
+from ..database import Database
+from ..sql import SqlScript
+from ..sql import SqlStatement
+from ..view import View
+from .helpers import create_table
+
+FIELD_NAMES = ['schema_name', 'relation_name', 'column_name', 'position',
+               'column_type', 'encoding', 'is_distkey', 'sortkey_position',
+               'is_not_null']
+
+ROWS = [
+    ('public', 'first_table', 'id', 1, 'integer', 'none', True, 1, True),
+    ('public', 'first_table', 'name', 2, 'varchar(10)', 'lzo', False, 0,
+     False),
+    ('test', 'second_table', 'id', 1, 'integer', 'none', False, 0, False),
+]
+
+
+class TestCatalog(TestCase):
+    """Tests for the Catalog
+    """
+
+    def setUp(self):
+        """Setup a mock connection returning the catalog rows
+        """
+        self.queries = list()
+
+        def execute(sql):
+            """Record the catalog query
+            """
+            self.queries.append(sql)
+
+        cursor = MagicMock()
+        cursor.execute.side_effect = execute
+        cursor.description = [(name,) for name in FIELD_NAMES]
+        cursor.fetchall.return_value = ROWS
+        self.connection = MagicMock()
+        self.connection.cursor.return_value = cursor
+
+    def test_fetch_many_relations_in_one_query(self):
+        """Test that all the relations are fetched with a single query
+        """
+        catalog = Catalog(self.connection)
+        result = catalog.fetch(
+            ['first_table', 'test.second_table', 'test.missing'])
+
+        eq_(len(self.queries), 1)
+        eq_(sorted(result.keys()), ['first_table', 'test.second_table'])
+        eq_(result['first_table'][1], CatalogColumn(
+            'name', 2, 'varchar(10)', 'lzo', False, 0, False))
+        eq_([c.name for c in result['test.second_table']], ['id'])
+
+    def test_fetch_uses_cache(self):
+        """Test that cached relations are not queried again
+        """
+        catalog = Catalog(self.connection)
+        catalog.fetch(['first_table'])
+        eq_(catalog.exists('public.first_table'), True)
+        eq_(len(self.queries), 1)
+
+        catalog.invalidate('first_table')
+        catalog.fetch(['first_table'])
+        eq_(len(self.queries), 2)
+
+    def test_fetch_in_batches(self):
+        """Test that the relations are split into batches of queries
+        """
+        catalog = Catalog(self.connection, batch_size=2)
+        catalog.fetch(['a', 'b', 'c', 'd', 'e'])
+        eq_(len(self.queries), 3)
+
+    def test_database_live_columns(self):
+        """Test fetching the live columns for all relations of a database
+        """
+        database = Database(relations=[
+            create_table('CREATE TABLE first_table (id INTEGER);'),
+            create_table('CREATE TABLE other_table (id INTEGER);'),
+        ])
+        result = database.live_columns(Catalog(self.connection))
+        eq_(len(self.queries), 1)
+        eq_(result.keys(), ['first_table'])
+
+    def test_dependent_views(self):
+        """Test that views of views are fetched breadth first
+        """
+        cursor = self.connection.cursor.return_value
+        cursor.description = [(name,) for name in
+                              ['schema_name', 'view_name', 'definition']]
+        cursor.fetchall.side_effect = [
+            [('public', 'view', 'SELECT id FROM first_table;')],
+            [('public', 'nested_view', 'SELECT id FROM public.view;')],
+            [],
+        ]
+
+        views = Catalog(self.connection).dependent_views('first_table')
+        eq_([name for name, _ in views], ['public.view', 'public.nested_view'])
+        eq_(views[0][1],
+            'CREATE VIEW public.view AS SELECT id FROM first_table')
+        eq_(len(self.queries), 3)
+
+    def test_dependent_views_order(self):
+        """Test that unqualified view definitions of a qualified table are
+        recreated after the views they select from
+        """
+        cursor = self.connection.cursor.return_value
+        cursor.description = [(name,) for name in
+                              ['schema_name', 'view_name', 'definition']]
+        cursor.fetchall.side_effect = [
+            # Both views depend on the table, v2 also selects from v
+            [('public', 'v2', 'SELECT v.id FROM v JOIN orders USING (id);'),
+             ('public', 'v', 'SELECT id FROM orders;')],
+            [],
+            [('public', 'v2', 'SELECT v.id FROM v JOIN orders USING (id);')],
+        ]
+
+        views = Catalog(self.connection).dependent_views('public.orders')
+        eq_([name for name, _ in views], ['public.v', 'public.v2'])
+
+        script = SqlScript()
+        for _, sql in views:
+            script.append(View(SqlStatement(sql)).recreate_script())
+        eq_([statement.sql() for statement in script.statements
+             if statement.sql().startswith('CREATE')],
+            ['CREATE VIEW public.v AS SELECT id FROM orders',
+             'CREATE VIEW public.v2 AS SELECT v.id FROM v JOIN orders '
+             'USING (id)'])
+
+    def test_foreign_key_references(self):
+        """Test that the foreign keys of other tables are recreated
+        """
+        cursor = self.connection.cursor.return_value
+        cursor.description = [(name,) for name in
+                              ['schema_name', 'table_name', 'definition']]
+        cursor.fetchall.return_value = [
+            ('Test', 'Order_Items',
+             'FOREIGN KEY (order_id) REFERENCES orders(id)')]
+
+        eq_(Catalog(self.connection).foreign_key_references('orders'),
+            [('test.order_items', 'ALTER TABLE test.order_items ADD '
+              'FOREIGN KEY (order_id) REFERENCES orders(id)')])
+        eq_("n.nspname = 'public' AND c.relname = 'orders'" in
+            self.queries[0], True)
@@ -0,0 +1,80 @@
+"""Tests for the ColumnCollection class
+"""
+from copy import deepcopy
+from unittest import TestCase
+from nose.tools import eq_
+
+from ..column import Column
+from ..column_collection import ColumnCollection
+from .helpers import create_table
+
+
+class TestColumnCollection(TestCase):
+    """Tests for the ColumnCollection class
+    """
+
+    def setUp(self):
+        """Setup test fixtures for the column collection tests
+        """
+        self.collection = ColumnCollection([
+            Column('c', 'INTEGER', position=2, is_sortkey=True),
+            Column('a', 'INTEGER', position=0, is_primarykey=True,
+                   is_distkey=True),
+            Column('b', 'INTEGER', position=1, fk_table='other',
+                   fk_reference='id'),
+        ])
+
+    def test_sorted_by_position(self):
+        """Columns are returned in the order of their position
+        """
+        eq_(self.collection.names(), ['a', 'b', 'c'])
+        eq_([c.name for c in self.collection], ['a', 'b', 'c'])
+        eq_(len(self.collection), 3)
+
+    def test_indexes(self):
+        """Columns can be looked up by name and position
+        """
+        eq_(self.collection.get('b').position, 1)
+        eq_(self.collection.get('d'), None)
+        eq_(self.collection.at_position(2).name, 'c')
+        assert 'a' in self.collection
+
+    def test_key_views(self):
+        """Key column views are computed from the column flags
+        """
+        eq_(self.collection.primary_key_names, ['a'])
+        eq_([c.name for c in self.collection.foreign_keys], ['b'])
+        eq_([c.name for c in self.collection.sort_keys], ['c'])
+        eq_([c.name for c in self.collection.dist_keys], ['a'])
+
+    def test_mutation_invalidates_cache(self):
+        """Cached views are refreshed after the collection is mutated
+        """
+        eq_(self.collection.primary_key_names, ['a'])
+        self.collection.set_primary('c')
+        eq_(self.collection.primary_key_names, ['a', 'c'])
+
+        self.collection.add(Column('d', 'INTEGER', position=3))
+        eq_(self.collection.names(), ['a', 'b', 'c', 'd'])
+
+        self.collection.remove('a')
+        eq_(self.collection.names(), ['b', 'c', 'd'])
+        eq_(self.collection.primary_key_names, ['c'])
+
+    def test_returned_lists_are_copies(self):
+        """Modifying a returned list does not modify the cache
+        """
+        self.collection.values().pop()
+        self.collection.primary_keys.pop()
+        eq_(len(self.collection.values()), 3)
+        eq_(self.collection.primary_key_names, ['a'])
+
+    @staticmethod
+    def test_table_copy():
+        """Tables with a column collection can be deep copied
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER PRIMARY KEY, value TEXT);')
+        table_copy = deepcopy(table)
+        eq_(table_copy.primary_key_names, ['id'])
+        eq_([c.name for c in table_copy.columns()], ['id', 'value'])
@@ -170,6 +170,30 @@ class TestDatabase(TestCase):
                                        self.second_table_dependent])
         database.sorted_relations()
 
+    def test_database_sorted_relation_levels(self):
+        """Get the dependency levels of the database
+        """
+        view = create_view(
+            """CREATE VIEW view AS (
+                SELECT id1 FROM second_table
+            );""")
+        database = Database(relations=[self.first_table_dependent,
+                                       self.second_table, view])
+        levels = database.sorted_relation_levels()
+
+        # Verify that independent relations share a level
+        eq_(len(levels), 2)
+        eq_([r.full_name for r in levels[0]], ['second_table'])
+        eq_([r.full_name for r in levels[1]], ['first_table', 'view'])
+
+    @raises(RuntimeError)
+    def test_database_sorted_relation_levels_cyclic(self):
+        """Get the dependency levels of the database with cycles
+        """
+        database = Database(relations=[self.first_table_dependent,
+                                       self.second_table_dependent])
+        database.sorted_relation_levels()
+
     def test_database_create_relations_script(self):
         """Creating relations in the database
         """
@@ -218,3 +242,44 @@ class TestDatabase(TestCase):
             result)
         eq_(database.recreate_table_dependencies('first_table', False).sql(),
             ';')
+
+    def test_database_recreate_table_dependencies_nested_views(self):
+        """Recreating views of views after the views they select from
+        """
+        nested_view = create_view(
+            """CREATE VIEW nested_view AS (
+                SELECT id1 FROM view
+            );""")
+        view = create_view(
+            """CREATE VIEW view AS (
+                SELECT id1 FROM second_table
+            );""")
+        database = Database(relations=[self.second_table, nested_view, view])
+
+        result = ['DROP VIEW IF EXISTS view CASCADE',
+                  'CREATE VIEW view AS ( SELECT id1 FROM second_table )',
+                  'DROP VIEW IF EXISTS nested_view CASCADE',
+                  'CREATE VIEW nested_view AS ( SELECT id1 FROM view )']
+        compare_scripts(
+            database.recreate_table_dependencies('second_table', False),
+            result)
+
+    def test_database_dependents(self):
+        """Direct and transitive dependents from the dependency index
+        """
+        view = create_view(
+            """CREATE VIEW view AS (
+                SELECT id1 FROM first_table
+            );""")
+        nested_view = create_view(
+            """CREATE VIEW nested_view AS (
+                SELECT id1 FROM view
+            );""")
+        database = Database(relations=[self.first_table_dependent,
+                                       self.second_table, view, nested_view])
+
+        eq_(database.dependents('second_table'), ['first_table'])
+        eq_(database.dependents('nested_view'), [])
+        eq_(database.transitive_dependents('second_table'),
+            ['first_table', 'view', 'nested_view'])
+        eq_(database.transitive_dependents('view'), ['nested_view'])
@@ -0,0 +1,134 @@
+"""Tests for the LevelExecutor
+"""
+import os
+
+from unittest import TestCase
+from mock import MagicMock
+from testfixtures import TempDirectory
+from nose.tools import eq_
+from nose.tools import raises
+
+from ..database import Database
+from ..level_executor import BLOCKED
+from ..level_executor import FAILED
+from ..level_executor import LevelExecutor
+from ..level_executor import SKIPPED
+from ..level_executor import SUCCESS
+from .helpers import create_table
+from .helpers import create_view
+
+
+class TestLevelExecutor(TestCase):
+    """Tests for the LevelExecutor
+    """
+
+    def setUp(self):
+        """Setup test fixtures for the executor tests
+        """
+        first_table = create_table(
+            """CREATE TABLE first_table (
+                id1 INTEGER,
+                id2 INTEGER REFERENCES second_table(id2)
+            );""")
+        second_table = create_table(
+            """CREATE TABLE second_table (
+                id1 INTEGER,
+                id2 INTEGER
+            );""")
+        third_table = create_table('CREATE TABLE third_table (id INTEGER);')
+        view = create_view(
+            'CREATE VIEW test_view AS (SELECT id1 FROM first_table);')
+        self.database = Database(
+            relations=[first_table, second_table, third_table, view])
+        self.executed = list()
+
+    def connection_factory(self, failing_relation=None, existing=False):
+        """Create a mock connection factory recording the executed sql
+        """
+        def execute(sql):
+            """Record the sql and fail on the requested relation
+            """
+            self.executed.append(sql)
+            if failing_relation and 'CREATE TABLE %s' % failing_relation in sql:
+                raise Exception('Execution failed')
+
+        def factory():
+            """Create a single mock connection
+            """
+            cursor = MagicMock()
+            cursor.execute.side_effect = execute
+            cursor.fetchone.return_value = (not existing, )
+            connection = MagicMock()
+            connection.cursor.return_value = cursor
+            return connection
+        return factory
+
+    def test_execute_all_levels(self):
+        """Every relation is executed after its dependencies
+        """
+        executor = LevelExecutor(self.database, self.connection_factory(),
+                                 max_workers=2)
+        results = executor.execute('create_script', grant_permissions=False)
+
+        eq_([r.name for r in results],
+            ['second_table', 'third_table', 'first_table', 'test_view'])
+        eq_(set(r.status for r in results), set([SUCCESS]))
+
+        # Each relation runs in its own transaction
+        eq_(len(self.executed), 4)
+        assert all(sql.startswith('BEGIN') for sql in self.executed)
+
+    def test_execute_failure_blocks_dependents(self):
+        """A failed relation only blocks the relations depending on it
+        """
+        executor = LevelExecutor(
+            self.database, self.connection_factory('second_table'))
+        results = dict((r.name, r.status) for r in executor.execute(
+            'create_script', grant_permissions=False))
+
+        eq_(results, {
+            'second_table': FAILED,
+            'third_table': SUCCESS,
+            'first_table': BLOCKED,
+            'test_view': BLOCKED,
+        })
+
+    def test_execute_skip_existing(self):
+        """Existing relations are skipped when requested
+        """
+        executor = LevelExecutor(
+            self.database, self.connection_factory(existing=True))
+        results = executor.execute(
+            'create_script', skip_existing=True, grant_permissions=False)
+
+        eq_(set(r.status for r in results), set([SKIPPED]))
+        assert not any(sql.startswith('BEGIN') for sql in self.executed)
+
+    def test_execute_resumes_from_checkpoint(self):
+        """Relations recorded in the checkpoint are not executed again
+        """
+        with TempDirectory() as d:
+            checkpoint = os.path.join(d.path, 'checkpoint')
+            d.write('checkpoint', 'second_table\nthird_table\n')
+
+            executor = LevelExecutor(
+                self.database, self.connection_factory(),
+                checkpoint=checkpoint)
+            results = dict((r.name, r.status) for r in executor.execute(
+                'create_script', grant_permissions=False))
+
+            eq_(results['second_table'], SKIPPED)
+            eq_(results['third_table'], SKIPPED)
+            eq_(results['first_table'], SUCCESS)
+            eq_(len(self.executed), 2)
+
+            # Newly executed relations are appended to the checkpoint
+            with open(checkpoint) as f:
+                eq_(set(f.read().split()), set(results.keys()))
+
+    @staticmethod
+    @raises(ValueError)
+    def test_invalid_max_workers():
+        """The executor needs atleast one worker
+        """
+        LevelExecutor(Database(), None, max_workers=0)
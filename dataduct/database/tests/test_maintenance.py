@@ -0,0 +1,110 @@
+"""Tests for the TableMaintenance
+"""
+from datetime import datetime
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+from nose.tools import raises
+
+from ..maintenance import in_window
+from ..maintenance import TableMaintenance
+from ..maintenance import TableStats
+
+
+class TestTableMaintenance(TestCase):
+    """Tests for the TableMaintenance
+    """
+
+    def setUp(self):
+        """Setup a maintenance with the default thresholds
+        """
+        self.maintenance = TableMaintenance(window='01:00-05:00')
+        self.cursor = MagicMock()
+
+    def test_record_changed_rows(self):
+        """Test that the changed rows are recorded per table
+        """
+        self.maintenance.record('INSERT INTO dev.t (SELECT 1)', 10)
+        self.maintenance.record('delete from DEV.T USING s', 4)
+        self.maintenance.record('UPDATE "dev"."t" SET a = 1', 2)
+        self.maintenance.record('INSERT INTO dev.t_staging (SELECT 1)', 7)
+        self.maintenance.record('TRUNCATE dev.t', -1)
+        eq_(self.maintenance.changed_rows('dev.t'), (12, 6))
+        eq_(self.maintenance.changed_rows('t'), (0, 0))
+
+    def test_small_change_skipped(self):
+        """Test that a table that barely changed needs no maintenance
+        """
+        self.maintenance.record('INSERT INTO dev.t (SELECT 1)', 10)
+        stats = TableStats(total_rows=1000, visible_rows=1000, unsorted=1,
+                           stats_off=0)
+        eq_(self.maintenance.commands('dev.t', stats), [])
+
+    def test_thresholds(self):
+        """Test that every threshold adds its command
+        """
+        self.maintenance.record('DELETE FROM dev.t', 200)
+        self.maintenance.record('INSERT INTO dev.t (SELECT 1)', 200)
+        stats = TableStats(total_rows=1200, visible_rows=1000, unsorted=2,
+                           stats_off=0)
+        eq_(self.maintenance.commands('dev.t', stats),
+            ['ANALYZE dev.t PREDICATE COLUMNS', 'VACUUM DELETE ONLY dev.t'])
+
+        stats = TableStats(total_rows=1200, visible_rows=1000, unsorted=30,
+                           stats_off=0)
+        eq_(self.maintenance.commands('dev.t', stats)[1], 'VACUUM FULL dev.t')
+
+    def test_stale_stats_analyzed(self):
+        """Test that a swapped in table without statistics is analyzed
+        """
+        stats = TableStats(total_rows=1000, visible_rows=1000, unsorted=50,
+                           stats_off=100)
+        eq_(self.maintenance.commands('dev.t', stats),
+            ['ANALYZE dev.t PREDICATE COLUMNS', 'VACUUM SORT ONLY dev.t'])
+
+    def test_run_in_window(self):
+        """Test that the commands run directly inside the window
+        """
+        self.cursor.fetchone.return_value = (100, 100, 50, 0)
+        commands = self.maintenance.run(self.cursor, 'dev.t',
+                                        now=datetime(2020, 1, 1, 2, 0))
+        eq_(commands, ['VACUUM SORT ONLY dev.t'])
+        self.cursor.execute.assert_called_with('VACUUM SORT ONLY dev.t')
+
+    def test_run_queued_outside_window(self):
+        """Test that the commands are queued outside of the window
+        """
+        self.cursor.fetchone.return_value = (100, 100, 50, 0)
+        self.maintenance.run(self.cursor, 'dev.t',
+                             now=datetime(2020, 1, 1, 12, 0))
+        eq_(self.cursor.execute.call_args[0][0],
+            "INSERT INTO public.dataduct_maintenance_queue "
+            "(table_name, command) VALUES ('dev.t', 'VACUUM SORT ONLY dev.t')")
+
+    def test_run_queue(self):
+        """Test that the queued commands of the tables are run and removed
+        """
+        self.cursor.fetchall.return_value = [
+            ('dev.t', 'VACUUM SORT ONLY dev.t'),
+            ('dev.u', 'ANALYZE dev.u PREDICATE COLUMNS')]
+        eq_(self.maintenance.run_queue(self.cursor, ['DEV.T']),
+            ['VACUUM SORT ONLY dev.t'])
+        eq_(self.cursor.execute.call_args[0][0],
+            "DELETE FROM public.dataduct_maintenance_queue "
+            "WHERE table_name = 'dev.t' AND command = 'VACUUM SORT ONLY dev.t'")
+
+    def test_in_window(self):
+        """Test windows with and without a wrap around midnight
+        """
+        eq_(in_window(None), True)
+        eq_(in_window('01:00-05:00', datetime(2020, 1, 1, 5, 0)), False)
+        eq_(in_window('22:00-02:30', datetime(2020, 1, 1, 23, 0)), True)
+        eq_(in_window('22:00-02:30', datetime(2020, 1, 1, 2, 29)), True)
+        eq_(in_window('22:00-02:30', datetime(2020, 1, 1, 12, 0)), False)
+
+    @staticmethod
+    @raises(ValueError)
+    def test_bad_window():
+        """Test that a malformed window raises
+        """
+        in_window('night')
@@ -0,0 +1,174 @@
+"""Tests for the SchemaDiff
+"""
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+
+from ..catalog import CatalogColumn
+from ..database import Database
+from ..schema_diff import COLUMN_TYPE
+from ..schema_diff import DISTKEY
+from ..schema_diff import ENCODING
+from ..schema_diff import EXTRA_COLUMN
+from ..schema_diff import MISSING_COLUMN
+from ..schema_diff import SORTKEY
+from ..schema_diff import SchemaDiff
+from ..schema_diff import diff_table
+from ..schema_diff import normalize_type
+from .helpers import create_table
+from .helpers import create_view
+
+FIELD_NAMES = ['schema_name', 'relation_name', 'column_name', 'position',
+               'column_type', 'encoding', 'is_distkey', 'sortkey_position',
+               'is_not_null']
+
+
+class TestSchemaDiff(TestCase):
+    """Tests for the SchemaDiff
+    """
+
+    def setUp(self):
+        """Setup test fixtures for the schema diff tests
+        """
+        self.table = create_table(
+            """CREATE TABLE test_table (
+                id INTEGER DISTKEY SORTKEY,
+                name VARCHAR(10) ENCODE lzo,
+                amount DECIMAL(10, 2)
+            );""")
+
+    @staticmethod
+    def live_column(name, position, column_type, encoding='lzo',
+                    is_distkey=False, sortkey_position=0):
+        """Create a live catalog column
+        """
+        return CatalogColumn(name, position, column_type, encoding,
+                             is_distkey, sortkey_position, False)
+
+    def live_columns(self):
+        """Live columns matching the test table
+        """
+        return [
+            self.live_column('id', 1, 'integer', 'none', True, 1),
+            self.live_column('name', 2, 'character varying(10)'),
+            self.live_column('amount', 3, 'numeric(10,2)'),
+        ]
+
+    @staticmethod
+    def test_normalize_type():
+        """Test converting definition types to the catalog format
+        """
+        eq_(normalize_type('INT'), 'integer')
+        eq_(normalize_type('varchar(max)'), 'character varying(65535)')
+        eq_(normalize_type('TEXT'), 'character varying(256)')
+        eq_(normalize_type('NUMERIC(18, 4)'), 'numeric(18,4)')
+        eq_(normalize_type('TIMESTAMP'), 'timestamp without time zone')
+
+    def test_diff_table_no_differences(self):
+        """Test that a matching table has no differences
+        """
+        eq_(diff_table(self.table, self.live_columns()), [])
+
+    def test_diff_table_differences(self):
+        """Test detecting every kind of column difference
+        """
+        live_columns = [
+            self.live_column('id', 1, 'bigint', 'none', False, 0),
+            self.live_column('name', 2, 'character varying(10)', 'bytedict'),
+            self.live_column('extra', 3, 'date'),
+        ]
+        differences = diff_table(self.table, live_columns)
+        eq_([(d.kind, d.column_name) for d in differences], [
+            (COLUMN_TYPE, 'id'),
+            (SORTKEY, 'id'),
+            (DISTKEY, 'id'),
+            (ENCODING, 'name'),
+            (MISSING_COLUMN, 'amount'),
+            (EXTRA_COLUMN, 'extra'),
+        ])
+
+    def schema_diff(self, database, rows, max_workers=1, batch_size=10):
+        """Create a schema diff over mock connections returning the rows
+        """
+        self.queries = list()
+
+        def connection_factory():
+            """Create a mock connection recording the catalog queries
+            """
+            cursor = MagicMock()
+            cursor.execute.side_effect = self.queries.append
+            cursor.description = [(name,) for name in FIELD_NAMES]
+            cursor.fetchall.return_value = rows
+            connection = MagicMock()
+            connection.cursor.return_value = cursor
+            return connection
+
+        return SchemaDiff(database, connection_factory,
+                          max_workers=max_workers, batch_size=batch_size)
+
+    def test_compute_batches(self):
+        """Test that the relations are fetched in batches of queries
+        """
+        database = Database(relations=[
+            create_table('CREATE TABLE table_%d (id INTEGER);' % i)
+            for i in range(5)])
+        rows = [('public', 'table_1', 'id', 1, 'integer', 'lzo', False, 0,
+                 False)]
+        diffs = self.schema_diff(database, rows, 2, 2).compute()
+
+        eq_(len(self.queries), 3)
+        eq_([(d.name, d.exists) for d in diffs], [
+            ('table_0', False),
+            ('table_1', True),
+            ('table_2', False),
+            ('table_3', False),
+            ('table_4', False),
+        ])
+
+    def test_plan_script(self):
+        """Test the plan for missing relations, columns and changed tables
+        """
+        other_table = create_table(
+            'CREATE TABLE other_table (id INTEGER, value INTEGER);')
+        view = create_view(
+            'CREATE VIEW test_view AS (SELECT id FROM test_table);')
+        database = Database(relations=[self.table, other_table, view])
+
+        rows = [('public', 'test_table') + (c.name, c.position,
+                                            c.column_type, c.encoding,
+                                            c.is_distkey, c.sortkey_position,
+                                            c.is_not_null)
+                for c in self.live_columns()[:2]]
+        rows.append(('public', 'other_table', 'id', 1, 'bigint', 'lzo',
+                     False, 0, False))
+        rows.append(('public', 'other_table', 'value', 2, 'integer', 'lzo',
+                     False, 0, False))
+        schema_diff = self.schema_diff(database, rows)
+
+        script = schema_diff.plan_script()
+        statements = [s.sql() for s in script]
+
+        eq_(statements[0], 'ALTER TABLE other_table RENAME TO other_table_old')
+        eq_(statements[2], 'INSERT INTO other_table (id, value) '
+                           'SELECT id, value FROM other_table_old')
+        eq_(statements[3], 'DROP TABLE other_table_old CASCADE')
+        assert 'ALTER TABLE test_table ADD COLUMN amount DECIMAL(10, 2)' in \
+            statements
+        assert 'CREATE VIEW test_view' in statements[-1]
+
+    def test_plan_script_rebuild_with_missing_column(self):
+        """Test that a rebuild only copies the columns of the live table
+        """
+        table = create_table(
+            'CREATE TABLE other_table (id INTEGER, value INTEGER, '
+            'added INTEGER);')
+        rows = [('public', 'other_table', 'id', 1, 'bigint', 'lzo',
+                 False, 0, False),
+                ('public', 'other_table', 'value', 2, 'integer', 'lzo',
+                 False, 0, False)]
+        schema_diff = self.schema_diff(Database(relations=[table]), rows)
+
+        statements = [s.sql() for s in schema_diff.plan_script()]
+        eq_(statements[0], 'ALTER TABLE other_table RENAME TO other_table_old')
+        eq_(statements[2], 'INSERT INTO other_table (id, value) '
+                           'SELECT id, value FROM other_table_old')
@@ -1,6 +1,9 @@
 """Tests for Table
 """
 from unittest import TestCase
+from nose.tools import eq_
+
+from ..select_statement import SelectStatement
 
 from .helpers import create_table
 from .helpers import compare_scripts
@@ -41,6 +44,174 @@ class TestTable(TestCase):
             self.basic_table.unload_script('s3://test/', 'a', 'b', 'c'),
             result)
 
+    def test_unload_script_with_options(self):
+        """Tests if the unload script adds the unload options
+        """
+        result = [
+            ("UNLOAD ('SELECT * FROM test_table;') TO 's3://test/part_' "
+             "CREDENTIALS 'aws_access_key_id=a;aws_secret_access_key=b' "
+             "DELIMITER '\t' ESCAPE NULL AS 'NULL' "
+             "PARALLEL ON MANIFEST GZIP MAXFILESIZE 256 MB ALLOWOVERWRITE")
+        ]
+        compare_scripts(
+            self.basic_table.unload_script(
+                's3://test/part_', 'a', 'b', parallel=True, manifest=True,
+                compression='gzip', max_file_size='256 MB',
+                allow_overwrite=True),
+            result)
+
+    def test_swap_script(self):
+        """Tests if the swap script loads and renames the shadow table
+        """
+        source = create_table('CREATE TABLE staging (id INTEGER);')
+        result = ['DROP TABLE IF EXISTS test_table_shadow',
+                  'CREATE TABLE test_table_shadow (id INTEGER)',
+                  'INSERT INTO test_table_shadow (SELECT * FROM staging)',
+                  'DROP TABLE IF EXISTS test_table_old',
+                  'ALTER TABLE test_table RENAME TO test_table_old',
+                  'ALTER TABLE test_table_shadow RENAME TO test_table',
+                  'DROP TABLE test_table_old CASCADE']
+        compare_scripts(
+            self.basic_table.swap_script(source, enforce_primary_key=False),
+            result)
+
+    def test_append_script(self):
+        """Tests if the append script moves a matching source into the shadow
+        table and swaps it in within a transaction
+        """
+        source = create_table('CREATE TABLE staging (id INTEGER);')
+        result = ['DROP TABLE IF EXISTS test_table_shadow',
+                  'CREATE TABLE test_table_shadow (id INTEGER)',
+                  'ALTER TABLE test_table_shadow APPEND FROM staging',
+                  'BEGIN',
+                  'DROP TABLE IF EXISTS test_table_old',
+                  'ALTER TABLE test_table RENAME TO test_table_old',
+                  'ALTER TABLE test_table_shadow RENAME TO test_table',
+                  'DROP TABLE test_table_old CASCADE',
+                  'COMMIT']
+        compare_scripts(
+            self.basic_table.append_script(source, enforce_primary_key=False),
+            result)
+
+    def test_append_script_copies_other_sources(self):
+        """Tests if a source with other columns is copied into the shadow
+        table and the table is never truncated
+        """
+        source = create_table('CREATE TABLE staging (id BIGINT);')
+        script = self.basic_table.append_script(source,
+                                                enforce_primary_key=False)
+        statements = [s.sql() for s in script.statements]
+        eq_(statements[2],
+            'INSERT INTO test_table_shadow (SELECT * FROM staging)')
+        eq_(any(s.startswith('TRUNCATE') or 'APPEND' in s
+                for s in statements), False)
+        eq_(statements.index('BEGIN') < statements.index(
+            'ALTER TABLE test_table RENAME TO test_table_old'), True)
+
+    def test_merge_script_join(self):
+        """Tests if the join upsert stages once and deletes with a join
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER DISTKEY, name VARCHAR(10), '
+            'PRIMARY KEY(id)) SORTKEY(id);')
+        source = create_table(
+            'CREATE TABLE staging (id INTEGER, name VARCHAR(10));')
+        result = [
+            ('CREATE TEMPORARY TABLE test_table_staging ( id INTEGER,'
+             'name VARCHAR(10),PRIMARY KEY( id ) ) DISTKEY(id) SORTKEY(id)'),
+            ('INSERT INTO test_table_staging ( SELECT id,name FROM ( '
+             'SELECT *, ROW_NUMBER() OVER ( PARTITION BY id ORDER BY id) '
+             'dataduct_row_number FROM staging) '
+             'WHERE dataduct_row_number = 1)'),
+            ('DELETE FROM test_table USING test_table_staging '
+             'WHERE test_table.id = test_table_staging.id'),
+            'INSERT INTO test_table (SELECT * FROM test_table_staging)',
+            'DROP TABLE IF EXISTS test_table_staging CASCADE']
+        compare_scripts(table.merge_script(source), result)
+
+    def test_merge_script_plan_shape(self):
+        """Tests that no script uses an IN subquery or a second copy
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER, id2 INTEGER, '
+            'name VARCHAR(10), PRIMARY KEY(id, id2));')
+        source = create_table(
+            'CREATE TABLE staging (id INTEGER, id2 INTEGER, '
+            'name VARCHAR(10));')
+        for use_merge in [False, True]:
+            script = table.merge_script(source, use_merge=use_merge)
+            sql = script.sql()
+            eq_(' IN (' in sql, False)
+            eq_(sql.count('CREATE TEMPORARY TABLE'), 1)
+            eq_(sql.count('INSERT INTO test_table_staging'), 1)
+            eq_(sql.count('FROM staging'), 1)
+
+    def test_merge_script_merge(self):
+        """Tests if the merge upsert updates and inserts with MERGE
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER, name VARCHAR(10), '
+            'PRIMARY KEY(id));')
+        source = create_table(
+            'CREATE TABLE staging (id INTEGER, name VARCHAR(10));')
+        script = table.merge_script(source, enforce_primary_key=False,
+                                    use_merge=True)
+
+        # The source is de-duplicated as MERGE rejects duplicate keys
+        eq_('ROW_NUMBER()' in script.statements[1].sql(), True)
+        eq_(script.statements[2].sql(),
+            'MERGE INTO test_table USING test_table_staging '
+            'ON test_table.id = test_table_staging.id '
+            'WHEN MATCHED THEN UPDATE SET name = test_table_staging.name '
+            'WHEN NOT MATCHED THEN INSERT (id,name) '
+            'VALUES (test_table_staging.id,test_table_staging.name)')
+
+    def test_merge_script_expression_source(self):
+        """Tests if a select with an unaliased expression is copied whole
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER, name VARCHAR(10), '
+            'amt INTEGER, PRIMARY KEY(id));')
+        script = table.merge_script(SelectStatement(
+            'SELECT id, name, amt + 1 FROM raw.orders'))
+        eq_(script.statements[1].sql(),
+            'INSERT INTO test_table_staging (SELECT * FROM '
+            '(SELECT id, name, amt + 1 FROM raw.orders))')
+        eq_('dataduct_row_number' in script.sql(), False)
+
+    def test_merge_script_unnamed_source(self):
+        """Tests if a source without column names falls back to a clone
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER, PRIMARY KEY(id));')
+        script = table.merge_script(SelectStatement('SELECT * FROM staging'))
+        eq_(script.statements[1].sql(),
+            'INSERT INTO test_table_staging (SELECT * FROM '
+            '(SELECT * FROM staging))')
+        eq_('test_table_staging_temp' in script.sql(), True)
+
+    def test_duplicate_count_scripts(self):
+        """Tests if the duplicates are counted without selecting every key
+        """
+        table = create_table(
+            'CREATE TABLE test_table (id INTEGER, id2 INTEGER, '
+            'PRIMARY KEY(id, id2));')
+        compare_scripts(
+            table.duplicate_count_script(),
+            ['SELECT COUNT(1) duplicate_keys FROM ( SELECT id,id2 '
+             'FROM test_table GROUP BY id,id2 HAVING COUNT(1) > 1 ) '
+             'duplicates'])
+        compare_scripts(
+            table.duplicate_sample_script(10),
+            ['SELECT id,id2 ,COUNT(1) duplicate_count FROM test_table '
+             'GROUP BY id,id2 HAVING COUNT(1) > 1 '
+             'ORDER BY duplicate_count DESC LIMIT 10'])
+        compare_scripts(
+            table.approximate_duplicate_count_script(),
+            ["SELECT COUNT(1) row_count ,APPROXIMATE COUNT(DISTINCT "
+             "CAST(id AS VARCHAR) || '|' || CAST(id2 AS VARCHAR)) key_count "
+             "FROM test_table"])
+
     def test_load_script(self):
         """Tests if the unload script generates successfully
         """
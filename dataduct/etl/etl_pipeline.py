@@ -42,6 +42,7 @@ MAX_RETRIES = config.etl.get('MAX_RETRIES', const.ZERO)
 S3_BASE_PATH = config.etl.get('S3_BASE_PATH', const.EMPTY_STR)
 SNS_TOPIC_ARN_FAILURE = config.etl.get('SNS_TOPIC_ARN_FAILURE', const.NONE)
 NAME_PREFIX = config.etl.get('NAME_PREFIX', const.EMPTY_STR)
+COMPRESSION = config.etl.get('COMPRESSION', const.NONE)
 QA_LOG_PATH = config.etl.get('QA_LOG_PATH', const.QA_STR)
 DP_INSTANCE_LOG_PATH = config.etl.get('DP_INSTANCE_LOG_PATH', const.NONE)
 DP_PIPELINE_LOG_PATH = config.etl.get('DP_PIPELINE_LOG_PATH', const.NONE)
@@ -63,7 +64,7 @@ class ETLPipeline(object):
     def __init__(self, name, frequency='one-time', ec2_resource_config=None,
                  time_delta=None, emr_cluster_config=None, load_time=None,
                  topic_arn=None, max_retries=MAX_RETRIES, teardown=None,
-                 bootstrap=None, description=None):
+                 bootstrap=None, description=None, compression=COMPRESSION):
         """Constructor for the pipeline class
 
         Args:
@@ -74,6 +75,8 @@ class ETLPipeline(object):
             topic_arn(str): sns alert to be used by the pipeline
             max_retries(int): number of retries for pipeline activities
             bootstrap(list of steps): bootstrap step definitions for resources
+            compression(str): compression format for the intermediate data
+                written by extract steps and read by load steps
         """
         if load_time and isinstance(load_time, str):
             load_hour, load_min = [int(x) for x in load_time.split(':')]
@@ -95,6 +98,11 @@ class ETLPipeline(object):
         self.max_retries = max_retries
         self.topic_arn = topic_arn
 
+        if compression is not None and \
+                compression not in const.COMPRESSION_FORMATS:
+            raise ETLInputError('Unknown compression %s' % compression)
+        self.compression = compression
+
         if bootstrap is not None:
             self.bootstrap_definitions = bootstrap
         elif getattr(config, 'bootstrap', None):
@@ -53,6 +53,20 @@ class EtlPipelineTests(unittest.TestCase):
         eq_(result.load_hour, None)
         eq_(result.load_min, None)
 
+    @staticmethod
+    def test_compression():
+        """Test that the compression of the pipeline is set
+        """
+        result = ETLPipeline('compression_pipeline', compression='zstd')
+        eq_(result.compression, 'zstd')
+
+    @staticmethod
+    @raises(ETLInputError)
+    def test_bad_compression_throws():
+        """Test that exception is thrown for an unknown compression
+        """
+        ETLPipeline('compression_pipeline', compression='zip')
+
     @raises(ETLInputError)
     def test_bad_data_type_throws(self):
         """Test that exception is thrown if the data_type parameter for
@@ -24,9 +24,13 @@ STEP_CLASSES = {
     'load-reload-pk': LoadReloadAndPrimaryKeyStep,
     'pipeline-dependencies': PipelineDependenciesStep,
     'primary-key-check': PrimaryKeyCheckStep,
+    'profile-check': ProfileCheckStep,
+    'qa-batch': QABatchStep,
     'qa-transform': QATransformStep,
+    'reconcile-check': ReconcileStep,
     'reload': ReloadStep,
     'sql-command': SqlCommandStep,
+    'table-maintenance': TableMaintenanceStep,
     'transform': TransformStep,
     'upsert': UpsertStep,
 }
@@ -28,6 +28,7 @@ class S3Node(PipelineObject):
                  precondition=None,
                  format=None,
                  compression=None,
+                 manifest=False,
                  **kwargs):
         """Constructor for the S3Node class
 
@@ -36,6 +37,8 @@ class S3Node(PipelineObject):
             schedule(Schedule): pipeline schedule
             s3_object(S3Path / S3File / S3Directory): s3 location
             precondition(Precondition): precondition to the data node
+            compression(str): compression format of the data in the node
+            manifest(bool): s3_object is a redshift manifest of the data files
             **kwargs(optional): Keyword arguments directly passed to base class
         """
 
@@ -56,18 +59,28 @@ class S3Node(PipelineObject):
         additional_args = {}
         if (isinstance(s3_object, S3Path) and s3_object.is_directory) or \
             (isinstance(s3_object, S3Directory)):
+            if manifest:
+                raise ETLInputError('Manifest must be a file')
             additional_args['directoryPath'] = s3_object
+        elif manifest:
+            additional_args['manifestFilePath'] = s3_object
         else:
             additional_args['filePath'] = s3_object
 
+        if compression is not None and \
+                compression not in const.COMPRESSION_FORMATS:
+            raise ETLInputError('Unknown compression %s' % compression)
+
         ### only gzip and none supported here, per aws s3datanode reqs
-        if compression == "gzip":
+        if compression == const.GZIP:
             additional_args['compression'] = "gzip"
         else:
             additional_args['compression'] = "none"
 
         # Save the s3_object variable
         self._s3_object = s3_object
+        self.compression = compression
+        self.manifest = manifest
 
         # Save the dependent nodes from the S3 Node
         self._dependency_nodes = list()
@@ -1,4 +1,9 @@
 from .check import Check
 from .count_check import CountCheck
+from .count_check import WindowCountCheck
 from .column_check import ColumnCheck
+from .hash_check import HashCheck
 from .primary_key_check import PrimaryKeyCheck
+from .sink import ResultSink
+from .profile_check import ProfileCheck
+from .reconcile import ReconcileCheck
@@ -0,0 +1,129 @@
+"""QA checks of many tables run by a single executor
+
+Count checks against the same database are combined into a single UNION ALL
+query, and every query of the batch runs concurrently on pooled connections.
+"""
+from collections import defaultdict
+
+import pandas.io.sql as pdsql
+
+from .count_check import CountCheck
+from .fetch import DEFAULT_WORKERS
+from .fetch import fetch_all
+from .fetch import REDSHIFT_HOST
+from .primary_key_check import PrimaryKeyCheck
+from .sink import ResultSink
+
+import logging
+logger = logging.getLogger(__name__)
+
+COUNT_CHECK = 'count'
+PRIMARY_KEY_CHECK = 'primary_key'
+BATCH_CHECK_TYPES = [COUNT_CHECK, PRIMARY_KEY_CHECK]
+
+
+def _subquery(sql):
+    """Query without the trailing semicolon so that it can be nested
+    """
+    return sql.strip().rstrip(';')
+
+
+def union_count_sql(count_queries):
+    """Single query with the index and the count of every count query
+
+    Args:
+        count_queries(list of tuple): Index of the check and a query
+            returning a single count
+
+    Returns:
+        sql(str): Query with one row of check_index, row_count per check
+    """
+    return '\nUNION ALL\n'.join(
+        'SELECT %d AS check_index, (%s) AS row_count' % (index,
+                                                          _subquery(sql))
+        for index, sql in count_queries)
+
+
+def run_batch(pool, checks, sns_topic_arn=None, workers=DEFAULT_WORKERS,
+              read=pdsql.read_sql):
+    """Run a batch of checks with one count query per database
+
+    Args:
+        pool(ConnectionPool): Pool of the connections to the databases
+        checks(list of dict): Checks with the type, name and queries of the
+            check, count checks have source_host, source_sql,
+            destination_sql and tolerance, primary key checks have table
+            and sql counting the duplicate keys
+        sns_topic_arn(str): sns topic arn for the checks
+        workers(int): Number of queries running at the same time
+        read(function): Reads the result of a query from a connection
+
+    Returns:
+        result(list of tuple): Check and its publish arguments in the order
+            of the checks
+    """
+    counts = defaultdict(list)
+    duplicates = list()
+    for index, check in enumerate(checks):
+        if check['type'] == COUNT_CHECK:
+            counts[check['source_host']].append((index, check['source_sql']))
+            counts[REDSHIFT_HOST].append((index, check['destination_sql']))
+        elif check['type'] == PRIMARY_KEY_CHECK:
+            duplicates.append(index)
+        else:
+            raise ValueError('Check type should be one of %s' %
+                             BATCH_CHECK_TYPES)
+
+    hosts = counts.keys()
+    queries = [(host, union_count_sql(counts[host])) for host in hosts]
+    queries.extend((REDSHIFT_HOST, checks[index]['sql'])
+                   for index in duplicates)
+    logger.info('Running %d checks with %d queries', len(checks),
+                len(queries))
+    data = fetch_all(pool, queries, workers=workers, read=read)
+
+    host_counts = dict()
+    for host, result in zip(hosts, data):
+        host_counts[host] = dict(zip(result.iloc[:, 0], result.iloc[:, 1]))
+    duplicate_counts = dict(
+        (index, result.iloc[0][0])
+        for index, result in zip(duplicates, data[len(hosts):]))
+
+    result = list()
+    for index, check in enumerate(checks):
+        if check['type'] == COUNT_CHECK:
+            result.append((
+                CountCheck(host_counts[check['source_host']][index],
+                           host_counts[REDSHIFT_HOST][index],
+                           name=check['name'], sns_topic_arn=sns_topic_arn,
+                           tolerance=check.get('tolerance', 1.0)),
+                {'dest_sql': check['destination_sql']}))
+        else:
+            result.append((
+                PrimaryKeyCheck(duplicate_counts[index], name=check['name'],
+                                sns_topic_arn=sns_topic_arn),
+                {'table': check['table']}))
+    return result
+
+
+def publish_batch(checks, log_to_s3=False, path_suffix=None):
+    """Publish the results of every check before failing on any of them
+
+    Args:
+        checks(list of tuple): Check and its publish arguments
+        log_to_s3(bool): Log the results of the checks as a single file
+        path_suffix(str): Suffix of the S3 path of the results
+    """
+    sink = ResultSink(path_suffix)
+    failures = list()
+    for check, publish_args in checks:
+        try:
+            check.publish(log_to_s3, sink=sink, **publish_args)
+        except Exception:
+            logger.exception('Check %s failed', check.name)
+            failures.append(check.name)
+
+    sink.flush()
+
+    if failures:
+        raise Exception('Failure on %s' % ', '.join(failures))
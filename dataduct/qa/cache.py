@@ -0,0 +1,193 @@
+"""Cache of the QA verdicts of tables that did not change since the check
+
+Retries and backfills re-run the checks of a table that was not loaded
+again. The verdict of a check is stored in S3 under a fingerprint of the
+check definition and a marker of the last change of the table, so the
+same check of an unchanged table publishes the stored verdict instead.
+"""
+from datetime import datetime
+import hashlib
+import json
+import os
+
+from ..config import Config
+from ..database.catalog import split_relation_name
+from ..s3 import S3File
+from ..s3 import S3Path
+from ..s3.utils import get_s3_bucket
+from ..utils import constants as const
+from ..utils.helpers import get_s3_base_path
+from .check import Check
+from .fetch import fetch_all
+from .fetch import REDSHIFT_HOST
+
+import logging
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = 'cache'
+
+# Arguments that change where a verdict is published but not the verdict
+PUBLISH_ARGUMENTS = ['cache', 'log_to_s3', 'sns_topic_arn']
+
+# An UPDATE is logged as a delete and an insert. The table id changes when
+# the table is recreated and tbl_rows counts the rows not vacuumed yet.
+TABLE_MARKER_QUERY = """
+    SELECT info.table_id
+        ,info.tbl_rows
+        ,inserts.last_insert
+        ,deletes.last_delete
+    FROM svv_table_info info
+    LEFT JOIN (
+        SELECT tbl, MAX(endtime) AS last_insert FROM stl_insert GROUP BY tbl
+    ) inserts ON inserts.tbl = info.table_id
+    LEFT JOIN (
+        SELECT tbl, MAX(endtime) AS last_delete FROM stl_delete GROUP BY tbl
+    ) deletes ON deletes.tbl = info.table_id
+    WHERE info."schema" = '{schema_name}'
+    AND info."table" = '{name}'
+"""
+
+
+def table_marker_sql(table_name):
+    """Query with the markers of the last change of a table
+    """
+    schema_name, name = split_relation_name(table_name)
+    return TABLE_MARKER_QUERY.format(schema_name=schema_name, name=name)
+
+
+def check_definition(args):
+    """Arguments of an executor that decide the verdict of its check
+    """
+    return dict((key, value) for key, value in vars(args).items()
+                if key not in PUBLISH_ARGUMENTS)
+
+
+def check_fingerprint(definition, marker):
+    """Hash of the check definition and the marker of the table
+    """
+    text = json.dumps([definition, marker], sort_keys=True, default=str)
+    return hashlib.sha1(text).hexdigest()
+
+
+class CachedCheck(Check):
+    """Verdict of a check stored by a previous run
+
+    Only the summary is stored as the results of a check may contain PII.
+    """
+    def __init__(self, record, **kwargs):
+        """Constructor for the CachedCheck class
+
+        Args:
+            record(dict): Verdict stored by ResultCache.put
+        """
+        super(CachedCheck, self).__init__(tolerance=record['tolerance'],
+                                          **kwargs)
+        self.record = record
+
+    @property
+    def success(self):
+        """Verdict of the cached run
+        """
+        return self.record['success']
+
+    @property
+    def error_rate(self):
+        """Error rate of the cached run
+        """
+        return self.record['error_rate']
+
+    @property
+    def summary(self):
+        """Summary of the cached run and when it was checked
+        """
+        return '\n'.join([self.record['summary'],
+                          'Cached: %s' % self.record['checked_at']])
+
+
+class ResultCache(object):
+    """Verdicts of the checks stored in S3 by fingerprint
+    """
+    def __init__(self, pool):
+        """Constructor for the ResultCache class
+
+        Args:
+            pool(ConnectionPool): Connections of the executor, used to read
+                the marker of the tables
+        """
+        self.pool = pool
+
+    def fingerprint(self, table_name, definition):
+        """Fingerprint of a check of the table
+
+        Returns:
+            fingerprint(str): None if the table has no marker, such as an
+                empty or missing table
+        """
+        data = fetch_all(self.pool,
+                         [(REDSHIFT_HOST, table_marker_sql(table_name))])[0]
+        if len(data) == 0:
+            return None
+        return check_fingerprint(definition, list(data.iloc[0]))
+
+    @staticmethod
+    def s3_path(fingerprint):
+        """Path of the verdict of a fingerprint
+        """
+        config = Config()
+        cache_dir_uri = os.path.join(
+            get_s3_base_path(), config.etl.get('QA_LOG_PATH', const.QA_STR),
+            CACHE_PATH)
+        return S3Path(key='%s.json' % fingerprint,
+                      parent_dir=S3Path(uri=cache_dir_uri, is_directory=True))
+
+    def get(self, fingerprint, **kwargs):
+        """Cached verdict of a fingerprint, None if not cached
+
+        Args:
+            **kwargs(optional): Keyword arguments passed to the CachedCheck
+        """
+        s3_path = self.s3_path(fingerprint)
+        key = get_s3_bucket(s3_path.bucket).get_key(s3_path.key)
+        if key is None:
+            return None
+        return CachedCheck(json.loads(key.get_contents_as_string()), **kwargs)
+
+    def put(self, fingerprint, check):
+        """Store the verdict of a check
+        """
+        error_rate = check.error_rate
+        record = {
+            'success': bool(check.success),
+            'tolerance': float(check.tolerance),
+            'error_rate': None if error_rate is None else float(error_rate),
+            'summary': check.summary,
+            'checked_at': datetime.utcnow().isoformat(),
+        }
+        S3File(text=json.dumps(record, sort_keys=True),
+               s3_path=self.s3_path(fingerprint)).upload_to_s3()
+
+    def run(self, table_name, definition, run_check, **kwargs):
+        """Cached verdict of the check, running it on a cache miss
+
+        Args:
+            table_name(str): Table checked by the check
+            definition(dict): Arguments that decide the verdict
+            run_check(function): Runs the check and returns it
+            **kwargs(optional): Keyword arguments passed to the CachedCheck
+
+        Returns:
+            check(Check): The cached or the new check
+        """
+        # The marker is read first so a change during the check is a miss
+        fingerprint = self.fingerprint(table_name, definition)
+        if fingerprint is None:
+            return run_check()
+
+        check = self.get(fingerprint, **kwargs)
+        if check is not None:
+            logger.info('Using the cached verdict %s', fingerprint)
+            return check
+
+        check = run_check()
+        self.put(fingerprint, check)
+        return check
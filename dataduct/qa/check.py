@@ -2,16 +2,12 @@
 """
 from boto.sns import SNSConnection
 from datetime import datetime
-import os
 
+from .sink import ResultSink
 from .utils import render_output
 from ..config import Config
 from ..database import SelectStatement
-from ..s3 import S3Path
-from ..s3 import S3File
-from ..utils import constants as const
 from ..utils.helpers import exactly_one
-from ..utils.helpers import get_s3_base_path
 
 QA_TEST_ROW_LENGTH = 8
 
@@ -96,9 +92,13 @@ class Check(object):
         return "Failure on %s" % self.name
 
     def publish(self, log_to_s3=False, dest_sql=None, table=None,
-                path_suffix=None):
+                path_suffix=None, sink=None):
         """Publish the results of the QA test
 
+        Args:
+            sink(ResultSink): Buffers the result with the other results of
+                the run, the result is logged on its own if None
+
         Note:
             Prints result summary, Exports check data, Call the alert function
             if specified
@@ -109,7 +109,10 @@ class Check(object):
         print self.summary
 
         if log_to_s3:
-            self.log_output_to_s3(dest_sql, table, path_suffix)
+            if sink is None:
+                self.log_output_to_s3(dest_sql, table, path_suffix)
+            else:
+                sink.add(self, dest_sql, table)
 
         if not self.success:
             if self.alert_func is not None:
@@ -118,9 +121,8 @@ class Check(object):
             else:
                 raise Exception(self.alert_subject)
 
-    def log_output_to_s3(self, destination_sql=None, table=None,
-                         path_suffix=None):
-        """Log the results of the QA test in S3
+    def output_row(self, destination_sql=None, table=None):
+        """Row of the QA test results logged for the table
         """
         if not exactly_one(destination_sql, table):
             raise Exception('Needs table or destination_sql')
@@ -130,8 +132,6 @@ class Check(object):
         else:
             full_table_name = table
 
-        config = Config()
-
         schema_name, table_name = full_table_name.split('.', 1)
         pipeline_name, _ = self.name.split(".", 1)
         timestamp = datetime.utcnow()
@@ -139,22 +139,13 @@ class Check(object):
         row = [schema_name, table_name, pipeline_name, timestamp]
         row.extend(self.export_output)
         if len(row) < QA_TEST_ROW_LENGTH:
-            row.extend(['NULL'] * (QA_TEST_ROW_LENGTH - len(row)))
-
-        # Convert to TSV
-        string = '\t'.join(map(str, row))
+            row.extend([None] * (QA_TEST_ROW_LENGTH - len(row)))
+        return row
 
-        # S3 Path computation
-        qa_test_dir_uri = os.path.join(
-            get_s3_base_path(), config.etl.get('QA_LOG_PATH', const.QA_STR),
-            config.etl.get('DP_QA_TESTS_LOG_PATH', 'dba_table_qa_tests'),
-            path_suffix if path_suffix else '')
-
-        parent_dir = S3Path(uri=qa_test_dir_uri, is_directory=True)
-
-        key = '_'.join(map(str, row)).replace('.', '_').replace(' ', '_')
-        key += '.tsv'
-
-        qa_tests_path = S3Path(key=key, parent_dir=parent_dir)
-        qa_tests_file = S3File(text=string, s3_path=qa_tests_path)
-        qa_tests_file.upload_to_s3()
+    def log_output_to_s3(self, destination_sql=None, table=None,
+                         path_suffix=None):
+        """Log the results of the QA test in S3
+        """
+        sink = ResultSink(path_suffix)
+        sink.add(self, destination_sql, table)
+        sink.flush()
@@ -4,7 +4,49 @@ from .check import Check
 from .utils import render_output
 
 
-class ColumnCheck(Check):
+def encode_value(value):
+    """Encode unicode values as utf-8 so they match byte strings
+    """
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+class ComparisonCheck(Check):
+    """Base class for QA tests comparing the values of keys across the ETL
+
+    Subclasses set errors, a dataframe of the differing source and
+    destination values indexed by the key, and the number of observed keys.
+    """
+    @property
+    def summary_lines(self):
+        """Lines of the summary, extended by the subclasses
+        """
+        return [
+            'Test Name: %s' % self.name,
+            'Success: %s' % self.success,
+            'Tolerance: %0.4f%%' % self.tolerance,
+            'Error Rate: %0.4f%%' % self.error_rate,
+            'Observed: %d' % self.observed,
+        ]
+
+    @property
+    def summary(self):
+        """Summary of the test results for the SNS message
+        """
+        return render_output(self.summary_lines)
+
+    @property
+    def results(self):
+        """Results from the the comparison of the errors
+        """
+        return render_output([
+            str(error) for error in zip(self.errors.index,
+                                        self.errors['source'],
+                                        self.errors['destination'])])
+
+
+class ColumnCheck(ComparisonCheck):
     """QA test for comparing columns across the ETL
     """
     def __init__(self, source_data, destination_data, **kwargs):
@@ -17,20 +59,19 @@ class ColumnCheck(Check):
         super(ColumnCheck, self).__init__(**kwargs)
         self.source_data = source_data
         self.destination_data = destination_data
-        self.errors = []
-        self.observed = 0
 
-        # Identify errors
-        for key in source_data.index:
-            if key not in destination_data.index:
-                continue
+        # Align the samples on the keys instead of looking up every key
+        source = ColumnCheck.column_values(source_data)
+        destination = ColumnCheck.column_values(destination_data)
+        joined = source.to_frame('source').join(
+            destination.to_frame('destination'), how='inner')
 
-            source_value = ColumnCheck.column_value(self.source_data, key)
-            dest_value = ColumnCheck.column_value(self.destination_data, key)
+        # Nulls on both sides are the same value
+        mismatched = (joined['source'] != joined['destination']) & ~(
+            joined['source'].isnull() & joined['destination'].isnull())
 
-            if source_value != dest_value:
-                self.errors.append((key, source_value, dest_value))
-            self.observed += 1
+        self.errors = joined[mismatched]
+        self.observed = len(joined)
 
     @property
     def error_rate(self):
@@ -47,37 +88,18 @@ class ColumnCheck(Check):
         return float(len(self.errors) * 100) / self.observed
 
     @staticmethod
-    def column_value(data, key):
-        """Fetch the value for a key in the dataframe
+    def column_values(data):
+        """Values of a single column dataframe with normalized encoding
 
         Args:
-            data(DataFrame): Single column dataframe
-            key(str): Key to lookup in the dataframe
+            data(DataFrame): Single column dataframe indexed by the keys
 
         Returns:
-            value(str): Value for the key, unicode values are encoded as utf-8
-        """
-        value = data.loc[key].values[0]
-        if isinstance(value, unicode):
-            return value.encode('utf-8')
-        return value
-
-    @property
-    def summary(self):
-        """Summary of the test results for the SNS message
-        """
-        return render_output(
-            [
-                'Test Name: %s' % self.name,
-                'Success: %s' % self.success,
-                'Tolerance: %0.4f%%' % self.tolerance,
-                'Error Rate: %0.4f%%' % self.error_rate,
-                'Observed: %d' % self.observed,
-            ]
-        )
-
-    @property
-    def results(self):
-        """Results from the the comparison of the errors
+            values(Series): Values for the keys, unicode values are encoded
+                as utf-8. Only the first value of a repeated key is kept
         """
-        return render_output([str(a) for a in self.errors])
+        values = data.iloc[:, 0]
+        values = values[~values.index.duplicated()]
+        if values.dtype != object:
+            return values
+        return values.map(encode_value)
@@ -1,9 +1,13 @@
 """QA test for comparing number of rows in the source system with the Warehouse
 """
+import pandas
 
 from .check import Check
 from .utils import render_output
 
+# Placeholder replaced with the first day of the window by the executor
+WINDOW_START_PLACEHOLDER = 'WINDOW_START'
+
 
 class CountCheck(Check):
     """QA test for comparing number of rows across the ETL
@@ -55,3 +59,76 @@ class CountCheck(Check):
                 'Destination Count: %d' % self.destination_count,
             ]
         )
+
+
+class WindowCountCheck(CountCheck):
+    """QA test comparing the number of rows of every day of a window
+    """
+    def __init__(self, source_counts, destination_counts, **kwargs):
+        """Constructor for the per day count QA
+
+        Args:
+            source_counts(DataFrame): Day and count of the source rows
+            destination_counts(DataFrame): Day and count of the warehouse rows
+        """
+        counts = self.day_counts(source_counts).to_frame('source').join(
+            self.day_counts(destination_counts).to_frame('destination'),
+            how='outer').fillna(0)
+        super(WindowCountCheck, self).__init__(
+            int(counts['source'].sum()), int(counts['destination'].sum()),
+            **kwargs)
+        self.counts = counts
+
+    @staticmethod
+    def day_counts(data):
+        """Counts indexed by the day, whatever the date type of the database
+        """
+        return pandas.Series(
+            list(data.iloc[:, 1]),
+            index=[str(day)[:10] for day in data.iloc[:, 0]]).groupby(
+                level=0).sum()
+
+    @property
+    def day_error_rates(self):
+        """Error rate of every day, days only in the warehouse are 100%
+        """
+        error_rates = list()
+        for day, row in self.counts.iterrows():
+            error_rate = self.calculate_error_rate(row['source'],
+                                                   row['destination'])
+            error_rates.append((day, 100.0 if error_rate is None
+                                else error_rate))
+        return error_rates
+
+    @property
+    def error_rate(self):
+        """The error rate of the worst day of the window
+        """
+        return max([rate for _, rate in self.day_error_rates] or [0])
+
+    @property
+    def summary(self):
+        """Summary of the test results for the SNS message
+        """
+        failed_days = [day for day, rate in self.day_error_rates
+                       if rate > self.tolerance]
+        return render_output(
+            [
+                'Test Name: %s' % self.name,
+                'Success: %s' % self.success,
+                'Tolerance: %0.4f%%' % self.tolerance,
+                'Error Rate: %0.4f%%' % self.error_rate,
+                'Source Count: %d' % self.source_count,
+                'Destination Count: %d' % self.destination_count,
+                'Days: %d' % len(self.counts),
+                'Failed Days: %s' % ', '.join(failed_days),
+            ]
+        )
+
+    @property
+    def results(self):
+        """Counts of every day of the window
+        """
+        return render_output([
+            '%s: %d %d' % (day, row['source'], row['destination'])
+            for day, row in self.counts.iterrows()])
@@ -0,0 +1,131 @@
+"""Concurrent queries for the QA executors with connections shared per host
+"""
+import threading
+
+from collections import defaultdict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
+import pandas.io.sql as pdsql
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Host name of the warehouse, every other host is a mysql config alias
+REDSHIFT_HOST = 'redshift'
+DEFAULT_CONNECTIONS_PER_HOST = 2
+DEFAULT_WORKERS = 4
+
+
+def connect_to_host(host):
+    """Open a connection to redshift or to a mysql host alias
+    """
+    # Imported here so that the checks do not need the database drivers
+    from ..data_access import rds_connection
+    from ..data_access import redshift_connection
+
+    if host == REDSHIFT_HOST:
+        return redshift_connection()
+    return rds_connection(host)
+
+
+class ConnectionPool(object):
+    """Connections shared by the checks of an executor
+
+    Idle connections of a host are reused by later queries, and at most
+    max_connections queries run against a host at the same time as a
+    connection is only used by one thread at a time.
+    """
+    def __init__(self, connect=connect_to_host,
+                 max_connections=DEFAULT_CONNECTIONS_PER_HOST):
+        """Constructor for the ConnectionPool class
+
+        Args:
+            connect(function): Opens a connection to a host
+            max_connections(int): Connections open per host
+        """
+        self._connect = connect
+        self._max_connections = max_connections
+        self._idle = defaultdict(list)
+        self._slots = dict()
+        self._lock = threading.Lock()
+
+    def _host_slots(self, host):
+        """Semaphore limiting the connections to the host
+        """
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(
+                    self._max_connections)
+            return self._slots[host]
+
+    @contextmanager
+    def connection(self, host):
+        """Borrow a connection to the host, opening one if none are idle
+        """
+        slots = self._host_slots(host)
+        slots.acquire()
+        try:
+            with self._lock:
+                idle = self._idle[host]
+                connection = idle.pop() if idle else None
+            if connection is None:
+                connection = self._connect(host)
+
+            try:
+                yield connection
+            except Exception:
+                # The connection may be left mid query
+                connection.close()
+                raise
+
+            with self._lock:
+                self._idle[host].append(connection)
+        finally:
+            slots.release()
+
+    def close(self):
+        """Close all the idle connections
+        """
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle = defaultdict(list)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def fetch_all(pool, queries, workers=DEFAULT_WORKERS, read=pdsql.read_sql):
+    """Run the queries concurrently, sharing the connections of the pool
+
+    Args:
+        pool(ConnectionPool): Pool of the connections to the hosts
+        queries(list of tuple): Host and SQL of every query
+        workers(int): Number of queries running at the same time
+        read(function): Reads the result of a query from a connection
+
+    Returns:
+        result(list of DataFrame): Results in the order of the queries
+    """
+    def fetch(query):
+        """Run a single query on a pooled connection
+        """
+        host, sql = query
+        with pool.connection(host) as connection:
+            logger.debug('Fetching from %s: %s', host, sql)
+            return read(sql, connection)
+
+    if len(queries) <= 1:
+        return [fetch(query) for query in queries]
+
+    thread_pool = ThreadPool(min(workers, len(queries)))
+    try:
+        return thread_pool.map(fetch, queries)
+    finally:
+        thread_pool.close()
+        thread_pool.join()
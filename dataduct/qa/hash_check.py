@@ -0,0 +1,196 @@
+"""QA test comparing per bucket checksums of the full source and warehouse
+"""
+import pandas
+
+from .check import Check
+from .utils import render_output
+
+MYSQL = 'mysql'
+REDSHIFT = 'redshift'
+DEFAULT_BUCKETS = 1024
+DEFAULT_DRILL_DOWN_BUCKETS = 16
+
+# Placeholder replaced with the mismatching buckets by the executor
+BUCKET_PLACEHOLDER = 'BUCKET_SET'
+
+COLUMN_TEMPLATE = "COALESCE(CONCAT({column_name}, ''), '')"
+
+# 60 bits of the MD5 for the row checksums and 32 bits for the buckets, the
+# checksums are summed as decimals so that they can not overflow
+HASH_TEMPLATES = {
+    MYSQL: 'CAST(CONV(SUBSTRING(MD5({string}), 1, {digits}), 16, 10) '
+           'AS UNSIGNED)',
+    REDSHIFT: 'STRTOL(SUBSTRING(MD5({string}), 1, {digits}), 16)',
+}
+SUM_TEMPLATES = {
+    MYSQL: 'SUM({column})',
+    REDSHIFT: 'SUM({column}::DECIMAL(38, 0))',
+}
+CHECKSUM_DIGITS = 15
+BUCKET_DIGITS = 8
+
+
+def concatenate_columns(column_names, dialect):
+    """Expression joining the text of the columns with a separator
+    """
+    columns = [COLUMN_TEMPLATE.format(column_name=c) for c in column_names]
+    if dialect == MYSQL:
+        return "CONCAT(%s)" % ", '|', ".join(columns)
+    return " || '|' || ".join(columns)
+
+
+def hash_rows_sql(select_sql, primary_keys, columns, buckets, dialect,
+                  sql_tail=''):
+    """Query with the key, bucket and checksum of every row of a select
+
+    Args:
+        select_sql(str): Query selecting the rows to check
+        primary_keys(list of str): Key columns of the query
+        columns(list of str): Other columns of the query
+        buckets(int): Number of buckets the keys are hashed into
+        dialect(str): mysql or redshift
+        sql_tail(str): Statement appended to the query
+    """
+    if dialect not in HASH_TEMPLATES:
+        raise ValueError('Dialect should be one of %s' % HASH_TEMPLATES.keys())
+
+    key_string = concatenate_columns(primary_keys, dialect)
+    row_string = concatenate_columns(primary_keys + columns, dialect)
+    bucket = 'MOD(%s, %d)' % (HASH_TEMPLATES[dialect].format(
+        string=key_string, digits=BUCKET_DIGITS), buckets)
+    checksum = HASH_TEMPLATES[dialect].format(string=row_string,
+                                              digits=CHECKSUM_DIGITS)
+
+    return '''SELECT {key_string} AS primary_key
+                ,{bucket} AS bucket
+                ,{checksum} AS row_checksum
+              FROM ({select_sql}) AS origin {sql_tail}'''.format(
+        key_string=key_string, bucket=bucket, checksum=checksum,
+        select_sql=select_sql, sql_tail=sql_tail)
+
+
+def bucket_checksums_sql(rows_sql, dialect):
+    """Query with the row count and checksum sum of every bucket
+    """
+    return '''SELECT bucket
+                ,COUNT(1) AS row_count
+                ,{checksum} AS checksum
+              FROM ({rows_sql}) AS hashed_rows
+              GROUP BY bucket'''.format(
+        checksum=SUM_TEMPLATES[dialect].format(column='row_checksum'),
+        rows_sql=rows_sql)
+
+
+def bucket_rows_sql(rows_sql):
+    """Query with the rows of the buckets in the bucket placeholder
+    """
+    return '''SELECT primary_key, row_checksum
+              FROM ({rows_sql}) AS hashed_rows
+              WHERE bucket IN {buckets}'''.format(
+        rows_sql=rows_sql, buckets=BUCKET_PLACEHOLDER)
+
+
+class HashCheck(Check):
+    """QA test comparing bucket checksums of the full tables across the ETL
+
+    Every row is hashed into a bucket by its key and only the count and sum
+    of the row checksums of every bucket are transferred. The rows of
+    mismatching buckets are compared key by key with drill_down.
+    """
+    def __init__(self, source_buckets, destination_buckets, **kwargs):
+        """Constructor for the HashCheck class
+
+        Args:
+            source_buckets(DataFrame): Row count and checksum of the source
+                buckets, indexed by the bucket
+            destination_buckets(DataFrame): Row count and checksum of the
+                destination buckets, indexed by the bucket
+        """
+        super(HashCheck, self).__init__(**kwargs)
+        joined = source_buckets.join(destination_buckets, how='outer',
+                                     lsuffix='_source',
+                                     rsuffix='_destination')
+        joined = joined.fillna(0)
+
+        mismatched = (
+            (joined['row_count_source'] != joined['row_count_destination']) |
+            (joined['checksum_source'] != joined['checksum_destination']))
+
+        self.buckets = joined
+        self.mismatched_buckets = list(joined.index[mismatched])
+        self.observed = int(max(joined['row_count_source'].sum(),
+                                joined['row_count_destination'].sum()))
+        self.errors = pandas.DataFrame(columns=['source', 'destination'])
+        self._drilled_buckets = list()
+
+    def drill_down(self, buckets, source_rows, destination_rows):
+        """Compare the rows of mismatching buckets key by key
+
+        Args:
+            buckets(list of int): Buckets the rows were selected from
+            source_rows(DataFrame): Row checksums of the source indexed by
+                the key
+            destination_rows(DataFrame): Row checksums of the destination
+                indexed by the key
+        """
+        joined = source_rows['row_checksum'].to_frame('source').join(
+            destination_rows['row_checksum'].to_frame('destination'),
+            how='outer')
+        errors = joined[joined['source'] != joined['destination']]
+        self.errors = pandas.concat([self.errors, errors])
+        self._drilled_buckets.extend(buckets)
+
+    @property
+    def undrilled_buckets(self):
+        """Mismatching buckets which were not compared key by key
+        """
+        return [b for b in self.mismatched_buckets
+                if b not in self._drilled_buckets]
+
+    @property
+    def error_count(self):
+        """Number of mismatching rows
+
+        Note:
+            Every row of a mismatching bucket that was not drilled into is
+            counted as an error, so this is an upper bound.
+        """
+        undrilled = self.buckets.loc[self.undrilled_buckets]
+        return len(self.errors) + int(
+            undrilled[['row_count_source', 'row_count_destination']]
+            .max(axis=1).sum())
+
+    @property
+    def error_rate(self):
+        """The error rate for the full table comparison
+        """
+        if self.observed == 0:
+            return 0.0
+
+        return float(self.error_count * 100) / self.observed
+
+    @property
+    def summary(self):
+        """Summary of the test results for the SNS message
+        """
+        return render_output(
+            [
+                'Test Name: %s' % self.name,
+                'Success: %s' % self.success,
+                'Tolerance: %0.4f%%' % self.tolerance,
+                'Error Rate: %0.4f%%' % self.error_rate,
+                'Observed: %d' % self.observed,
+                'Buckets: %d' % len(self.buckets),
+                'Mismatched Buckets: %d' % len(self.mismatched_buckets),
+                'Undrilled Buckets: %d' % len(self.undrilled_buckets),
+            ]
+        )
+
+    @property
+    def results(self):
+        """Keys of the mismatching rows with the row checksums
+        """
+        return render_output([
+            str(error) for error in zip(self.errors.index,
+                                        self.errors['source'],
+                                        self.errors['destination'])])
@@ -4,18 +4,39 @@
 from .check import Check
 from .utils import render_output
 
+# Relative error of the HyperLogLog distinct count of redshift
+APPROXIMATE_ERROR = 0.02
+
+
+def approximate_duplicate_count(row_count, key_count):
+    """Estimate of the duplicate rows from the row and distinct key counts
+
+    Note:
+        Differences within the error of the distinct count are not counted
+        as duplicates, so this only detects tables with many duplicates.
+    """
+    duplicate_count = row_count - key_count
+    if duplicate_count <= APPROXIMATE_ERROR * row_count:
+        return 0
+    return int(duplicate_count)
+
 
 class PrimaryKeyCheck(Check):
     """QA test for checking duplicate primary keys inside redshift
     """
-    def __init__(self, duplicate_count=0, **kwargs):
+    def __init__(self, duplicate_count=0, sample=None, approximate=False,
+                 **kwargs):
         """Constructor for Primary Key Check
 
         Args:
             duplicate_count(int): Number of duplicates
+            sample(DataFrame): Sample of the duplicate keys
+            approximate(bool): The count is an estimate of the duplicate rows
         """
         super(PrimaryKeyCheck, self).__init__(**kwargs)
         self.duplicate_count = duplicate_count
+        self.sample = sample
+        self.approximate = approximate
 
     @property
     def error_rate(self):
@@ -27,11 +48,22 @@ class PrimaryKeyCheck(Check):
     def summary(self):
         """Summary of the test results for the SNS message
         """
+        output = [
+            'Test Name: %s' % self.name,
+            'Success: %s' % self.success,
+            'Tolerance: %d' % self.tolerance,
+            'Error Rate: %d' % self.error_rate,
+        ]
+        if self.approximate:
+            output.append('Approximate: %s' % self.approximate)
+        return render_output(output)
+
+    @property
+    def results(self):
+        """Sample of the duplicate keys with the number of their rows
+        """
+        if self.sample is None:
+            return self.summary
+
         return render_output(
-            [
-                'Test Name: %s' % self.name,
-                'Success: %s' % self.success,
-                'Tolerance: %d' % self.tolerance,
-                'Error Rate: %d' % self.error_rate,
-            ]
-        )
+            [str(tuple(row)) for row in self.sample.itertuples(index=False)])
@@ -0,0 +1,210 @@
+"""QA test comparing the column statistics of a table with its previous run
+"""
+import json
+import os
+
+from .check import Check
+from .utils import render_output
+from ..config import Config
+from ..s3 import S3Path
+from ..utils import constants as const
+from ..utils.helpers import get_s3_base_path
+
+ROW_COUNT = 'row_count'
+NULL_RATE = 'null_rate'
+DISTINCT = 'distinct'
+MINIMUM = 'min'
+MAXIMUM = 'max'
+AVERAGE_LENGTH = 'avg_length'
+MAXIMUM_LENGTH = 'max_length'
+
+TEXT_TYPES = ('CHAR', 'VARCHAR', 'CHARACTER', 'NCHAR', 'NVARCHAR', 'TEXT',
+              'BPCHAR')
+# Redshift has no MIN and MAX of booleans
+UNORDERED_TYPES = ('BOOL', 'BOOLEAN')
+
+PROFILE_PATH = 'profiles'
+
+
+def _base_type(column):
+    """Type of the column without its size
+    """
+    column_type = column.column_type or ''
+    return column_type.split('(')[0].strip().upper()
+
+
+def profile_metrics(table):
+    """Statistics of every column and the expression computing them
+
+    Args:
+        table(Table): Table to profile
+
+    Returns:
+        result(list of tuple): Column name, metric and SQL expression
+    """
+    metrics = list()
+    for column in table.columns():
+        name = column.name
+        base_type = _base_type(column)
+        metrics.extend([
+            (name, NULL_RATE,
+             '100.0 * (COUNT(1) - COUNT(%s)) / GREATEST(COUNT(1), 1)' % name),
+            (name, DISTINCT, 'APPROXIMATE COUNT(DISTINCT %s)' % name),
+        ])
+        if base_type not in UNORDERED_TYPES:
+            metrics.extend([
+                (name, MINIMUM, 'MIN(%s)::VARCHAR' % name),
+                (name, MAXIMUM, 'MAX(%s)::VARCHAR' % name),
+            ])
+        if base_type in TEXT_TYPES:
+            metrics.extend([
+                (name, AVERAGE_LENGTH, 'AVG(LEN(%s)::FLOAT)' % name),
+                (name, MAXIMUM_LENGTH, 'MAX(LEN(%s))' % name),
+            ])
+    return metrics
+
+
+def profile_sql(table):
+    """Query computing the statistics of every column in a single scan
+    """
+    expressions = ['COUNT(1) AS %s' % ROW_COUNT]
+    expressions.extend(
+        '%s AS metric_%d' % (expression, index)
+        for index, (_, _, expression) in enumerate(profile_metrics(table)))
+    return 'SELECT %s FROM %s' % ('\n    ,'.join(expressions),
+                                  table.full_name)
+
+
+def _json_value(value):
+    """Value of a statistic that can be stored as JSON
+    """
+    if value is None or isinstance(value, basestring):
+        return value
+    if value != value:
+        # Statistics of empty tables are NaN
+        return None
+    if isinstance(value, (int, long)) or float(value).is_integer():
+        return int(value)
+    return float(value)
+
+
+def read_profile(table, row):
+    """Profile of the table from the row returned by the profile query
+
+    Args:
+        table(Table): Table which was profiled
+        row(list): Values of the row of the profile query
+
+    Returns:
+        profile(dict): Row count and the statistics of every column
+    """
+    profile = {ROW_COUNT: _json_value(row[0]), 'columns': dict()}
+    for (name, metric, _), value in zip(profile_metrics(table), row[1:]):
+        profile['columns'].setdefault(name, dict())[metric] = \
+            _json_value(value)
+    return profile
+
+
+def profile_s3_path(table_name, path_suffix=None):
+    """Path of the profile stored for the table
+    """
+    config = Config()
+    profile_dir_uri = os.path.join(
+        get_s3_base_path(), config.etl.get('QA_LOG_PATH', const.QA_STR),
+        PROFILE_PATH, path_suffix if path_suffix else '')
+    return S3Path(key='%s.json' % table_name,
+                  parent_dir=S3Path(uri=profile_dir_uri, is_directory=True))
+
+
+def relative_change(previous, current):
+    """Change of a value in percent of the previous value
+    """
+    if previous == current:
+        return 0.0
+    if not previous:
+        return 100.0
+    return abs(current - previous) * 100.0 / abs(previous)
+
+
+class ProfileCheck(Check):
+    """QA test comparing the column statistics with the previous profile
+
+    Null rates are compared in percentage points, distinct and average
+    length estimates by their change in percent. The min and max values are
+    only reported.
+    """
+    def __init__(self, profile, previous_profile=None,
+                 null_rate_tolerance=1.0, distinct_tolerance=10.0,
+                 length_tolerance=10.0, **kwargs):
+        """Constructor for the ProfileCheck class
+
+        Args:
+            profile(dict): Profile of the current run
+            previous_profile(dict): Profile of the previous run
+            null_rate_tolerance(float): Change of null rates in percentage
+                points
+            distinct_tolerance(float): Change of distinct estimates in
+                percent
+            length_tolerance(float): Change of average lengths in percent
+        """
+        super(ProfileCheck, self).__init__(**kwargs)
+        self.profile = profile
+        self.previous_profile = previous_profile
+        self.thresholds = [
+            (NULL_RATE, null_rate_tolerance, lambda p, c: abs(c - p)),
+            (DISTINCT, distinct_tolerance, relative_change),
+            (AVERAGE_LENGTH, length_tolerance, relative_change),
+        ]
+        self.regressions = self.compare()
+
+    def compare(self):
+        """Statistics which moved beyond their tolerance
+
+        Returns:
+            result(list of tuple): Column, metric, previous and current value
+        """
+        if self.previous_profile is None:
+            return list()
+
+        regressions = list()
+        previous_columns = self.previous_profile['columns']
+        for name, metrics in sorted(self.profile['columns'].items()):
+            if name not in previous_columns:
+                continue
+            for metric, tolerance, change in self.thresholds:
+                previous = previous_columns[name].get(metric)
+                current = metrics.get(metric)
+                if previous is None or current is None:
+                    continue
+                if change(previous, current) > tolerance:
+                    regressions.append((name, metric, previous, current))
+        return regressions
+
+    @property
+    def error_rate(self):
+        """Number of statistics which moved beyond their tolerance
+        """
+        return len(self.regressions)
+
+    @property
+    def summary(self):
+        """Summary of the test results for the SNS message
+        """
+        return render_output(
+            [
+                'Test Name: %s' % self.name,
+                'Success: %s' % self.success,
+                'Row Count: %d' % self.profile[ROW_COUNT],
+                'Columns: %d' % len(self.profile['columns']),
+                'Previous Profile: %s' % (self.previous_profile is not None),
+                'Regressions: %d' % self.error_rate,
+            ]
+        )
+
+    @property
+    def results(self):
+        """Statistics which moved beyond their tolerance, with the profile
+        """
+        return render_output(
+            [str(regression) for regression in self.regressions] +
+            [json.dumps(self.profile, sort_keys=True)])
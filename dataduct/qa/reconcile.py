@@ -0,0 +1,238 @@
+"""QA test reconciling every row of the source and warehouse by its key
+
+Both sides are read ordered by the primary key and diffed with a sorted
+merge, so the memory used does not depend on the size of the tables.
+"""
+import pandas
+
+from .column_check import ComparisonCheck
+from .column_check import encode_value
+from .hash_check import concatenate_columns
+from .hash_check import HASH_TEMPLATES
+
+MATCHED = 'matched'
+MISSING = 'missing'
+EXTRA = 'extra'
+CHANGED = 'changed'
+
+DEFAULT_SAMPLE_SIZE = 100
+OUTPUT_BATCH_SIZE = 10000
+
+# Placeholder replaced with the key range of a chunk by the executor
+KEY_RANGE_PLACEHOLDER = 'KEY_RANGE'
+
+
+def reconcile_sql(select_sql, primary_keys, columns, dialect):
+    """Query with the keys and the text of the other columns, by key order
+
+    Args:
+        select_sql(str): Query selecting the rows to reconcile
+        primary_keys(list of str): Key columns of the query
+        columns(list of str): Other columns of the query
+        dialect(str): mysql or redshift
+    """
+    if dialect not in HASH_TEMPLATES:
+        raise ValueError('Dialect should be one of %s' % HASH_TEMPLATES.keys())
+
+    key_string = ','.join(primary_keys)
+    return '''SELECT {key_string}, {row_string} AS row_value
+              FROM ({select_sql}) AS origin {key_range}
+              ORDER BY {key_string}'''.format(
+        key_string=key_string,
+        row_string=concatenate_columns(columns, dialect),
+        select_sql=select_sql, key_range=KEY_RANGE_PLACEHOLDER)
+
+
+def key_bounds_sql(select_sql, key):
+    """Query with the smallest and largest value of a key column
+    """
+    return '''SELECT MIN({key}), MAX({key})
+              FROM ({select_sql}) AS origin'''.format(key=key,
+                                                      select_sql=select_sql)
+
+
+def row_value(values):
+    """Value of a row without its key, None for a row on one side only
+    """
+    if values is None or len(values) != 1:
+        return values
+    return values[0]
+
+
+def ordered_rows(rows, key_length):
+    """Rows with normalized encoding, checking that the keys are ordered
+
+    Raises:
+        ValueError: If a key is smaller than the previous one, as a merge of
+            sides sorted with different collations would report every key
+    """
+    previous_key = None
+    for row in rows:
+        row = tuple(encode_value(value) for value in row)
+        key = row[:key_length]
+        if previous_key is not None and key < previous_key:
+            raise ValueError('Rows are not ordered by the key at %s' % (key,))
+        previous_key = key
+        yield row
+
+
+def merge_diff(source_rows, destination_rows, key_length):
+    """Compare two sequences of rows sorted by their key
+
+    Args:
+        source_rows(iterable): Source rows, keys first
+        destination_rows(iterable): Destination rows, keys first
+        key_length(int): Number of key columns
+
+    Yields:
+        result(tuple): Kind of the row, key, source and destination values
+    """
+    source = ordered_rows(source_rows, key_length)
+    destination = ordered_rows(destination_rows, key_length)
+    source_row = next(source, None)
+    destination_row = next(destination, None)
+
+    while source_row is not None or destination_row is not None:
+        if destination_row is None or (
+                source_row is not None and
+                source_row[:key_length] < destination_row[:key_length]):
+            yield (MISSING, source_row[:key_length],
+                   source_row[key_length:], None)
+            source_row = next(source, None)
+        elif source_row is None or (
+                destination_row[:key_length] < source_row[:key_length]):
+            yield (EXTRA, destination_row[:key_length], None,
+                   destination_row[key_length:])
+            destination_row = next(destination, None)
+        else:
+            kind = MATCHED
+            if source_row[key_length:] != destination_row[key_length:]:
+                kind = CHANGED
+            yield (kind, source_row[:key_length], source_row[key_length:],
+                   destination_row[key_length:])
+            source_row = next(source, None)
+            destination_row = next(destination, None)
+
+
+class DiffSummary(object):
+    """Counts of the reconciled rows and a sample of the differences
+    """
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE):
+        """Constructor for the DiffSummary class
+
+        Args:
+            sample_size(int): Number of differences kept for the results
+        """
+        self.sample_size = sample_size
+        self.counts = dict.fromkeys([MATCHED, MISSING, EXTRA, CHANGED], 0)
+        self.sample = list()
+
+    def add(self, kind, key, source_value, destination_value):
+        """Count a reconciled row
+        """
+        self.counts[kind] += 1
+        if kind != MATCHED and len(self.sample) < self.sample_size:
+            self.sample.append((kind, key, row_value(source_value),
+                                row_value(destination_value)))
+
+    def update(self, other):
+        """Add the counts and sample of another chunk
+        """
+        for kind, count in other.counts.items():
+            self.counts[kind] += count
+        self.sample.extend(
+            other.sample[:max(self.sample_size - len(self.sample), 0)])
+
+    @property
+    def observed(self):
+        """Number of distinct keys on either side
+        """
+        return sum(self.counts.values())
+
+    @property
+    def error_count(self):
+        """Number of missing, extra and changed rows
+        """
+        return self.observed - self.counts[MATCHED]
+
+
+def reconcile(source_rows, destination_rows, key_length, output=None,
+              sample_size=DEFAULT_SAMPLE_SIZE):
+    """Diff the rows and pass every difference to the output in batches
+
+    Args:
+        source_rows(iterable): Source rows ordered by the key
+        destination_rows(iterable): Destination rows ordered by the key
+        key_length(int): Number of key columns
+        output(function): Receives lists of differences as rows of the
+            kind, key columns, source and destination values
+        sample_size(int): Number of differences kept for the results
+
+    Returns:
+        summary(DiffSummary): Counts and sample of the differences
+    """
+    summary = DiffSummary(sample_size)
+    batch = list()
+    for kind, key, source_value, destination_value in merge_diff(
+            source_rows, destination_rows, key_length):
+        summary.add(kind, key, source_value, destination_value)
+        if kind == MATCHED or output is None:
+            continue
+
+        batch.append((kind,) + key + (row_value(source_value),
+                                      row_value(destination_value)))
+        if len(batch) >= OUTPUT_BATCH_SIZE:
+            output(batch)
+            batch = list()
+
+    if batch:
+        output(batch)
+    return summary
+
+
+class ReconcileCheck(ComparisonCheck):
+    """QA test reconciling every row across the ETL
+
+    The results list the sampled differences the same way as the column
+    check, the full list of differences is written by the executor.
+    """
+    def __init__(self, summary, output_path=None, **kwargs):
+        """Constructor for the ReconcileCheck class
+
+        Args:
+            summary(DiffSummary): Counts and sample of the differences
+            output_path(str): Location of the full list of differences
+        """
+        super(ReconcileCheck, self).__init__(**kwargs)
+        self.summary_counts = summary.counts
+        self.output_path = output_path
+        self.observed = summary.observed
+        self.error_count = summary.error_count
+
+        keys = [key[0] if len(key) == 1 else key
+                for _, key, _, _ in summary.sample]
+        self.errors = pandas.DataFrame(
+            [(source, destination)
+             for _, _, source, destination in summary.sample],
+            columns=['source', 'destination'],
+            index=pandas.Index(keys, tupleize_cols=False))
+
+    @property
+    def error_rate(self):
+        """The error rate of the reconciliation, over the keys of both sides
+        """
+        if self.observed == 0:
+            return 0.0
+
+        return float(self.error_count * 100) / self.observed
+
+    @property
+    def summary_lines(self):
+        """Lines of the summary with the counts of every kind of difference
+        """
+        return super(ReconcileCheck, self).summary_lines + [
+            'Missing: %d' % self.summary_counts[MISSING],
+            'Extra: %d' % self.summary_counts[EXTRA],
+            'Changed: %d' % self.summary_counts[CHANGED],
+            'Differences: %s' % self.output_path,
+        ]
@@ -0,0 +1,122 @@
+"""Sink writing the QA results of a run to S3 or redshift at once
+"""
+from cStringIO import StringIO
+from datetime import datetime
+import gzip
+import os
+import uuid
+
+from ..config import Config
+from ..s3 import S3File
+from ..s3 import S3Path
+from ..utils import constants as const
+from ..utils.helpers import get_s3_base_path
+from .fetch import connect_to_host
+from .fetch import REDSHIFT_HOST
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Rows inserted by a single INSERT statement
+INSERT_BATCH_SIZE = 1000
+
+
+class ResultSink(object):
+    """Buffer of the QA result rows of a run
+
+    The rows are flushed as a single gzipped TSV file in the QA log path, or
+    inserted into the QA_RESULTS_TABLE of the etl config when it is set.
+    """
+    def __init__(self, path_suffix=None, table=None, connect=connect_to_host):
+        """Constructor for the ResultSink class
+
+        Args:
+            path_suffix(str): Suffix of the S3 path of the results
+            table(str): Redshift table of the results, defaults to the
+                QA_RESULTS_TABLE of the etl config
+            connect(function): Opens a connection to a host
+        """
+        config = Config()
+        if table is None:
+            table = config.etl.get('QA_RESULTS_TABLE', None)
+
+        self.path_suffix = path_suffix
+        self.table = table
+        self.rows = list()
+        self._connect = connect
+
+    def add(self, check, destination_sql=None, table=None):
+        """Buffer the result row of a check
+        """
+        self.rows.append(check.output_row(destination_sql, table))
+
+    @property
+    def text(self):
+        """TSV of the buffered rows
+        """
+        return ''.join(
+            '\t'.join('NULL' if value is None else str(value)
+                      for value in row) + '\n'
+            for row in self.rows)
+
+    @property
+    def compressed_text(self):
+        """Gzipped TSV of the buffered rows
+        """
+        buffer = StringIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as f:
+            f.write(self.text)
+        return buffer.getvalue()
+
+    @property
+    def s3_path(self):
+        """Path of the file of the run, unique across the runs
+        """
+        config = Config()
+        qa_test_dir_uri = os.path.join(
+            get_s3_base_path(), config.etl.get('QA_LOG_PATH', const.QA_STR),
+            config.etl.get('DP_QA_TESTS_LOG_PATH', 'dba_table_qa_tests'),
+            self.path_suffix if self.path_suffix else '')
+
+        pipeline_name = self.rows[0][2] if self.rows else ''
+        key = '%s_%s_%s.tsv.gz' % (
+            pipeline_name, datetime.utcnow().strftime('%Y%m%d%H%M%S'),
+            uuid.uuid4().hex[:8])
+        return S3Path(key=key.replace(' ', '_'),
+                      parent_dir=S3Path(uri=qa_test_dir_uri,
+                                        is_directory=True))
+
+    def insert_statements(self):
+        """Multi row INSERT statements with their parameters
+        """
+        for start in range(0, len(self.rows), INSERT_BATCH_SIZE):
+            rows = self.rows[start:start + INSERT_BATCH_SIZE]
+            values = ','.join(
+                '(%s)' % ','.join(['%s'] * len(row)) for row in rows)
+            yield ('INSERT INTO %s VALUES %s' % (self.table, values),
+                   [value for row in rows for value in row])
+
+    def flush(self):
+        """Write the buffered rows and empty the buffer
+        """
+        if not self.rows:
+            return
+
+        if self.table is not None:
+            connection = self._connect(REDSHIFT_HOST)
+            try:
+                cursor = connection.cursor()
+                for sql, parameters in self.insert_statements():
+                    cursor.execute(sql, parameters)
+                connection.commit()
+            finally:
+                connection.close()
+            logger.info('Inserted %d QA results into %s', len(self.rows),
+                        self.table)
+        else:
+            s3_file = S3File(text=self.compressed_text, s3_path=self.s3_path)
+            s3_file.upload_to_s3()
+            logger.info('Logged %d QA results to %s', len(self.rows),
+                        s3_file.s3_path.uri)
+
+        self.rows = list()
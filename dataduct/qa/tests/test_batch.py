@@ -0,0 +1,119 @@
+"""Tests for the batched QA checks
+"""
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+from nose.tools import raises
+import pandas
+
+from ..batch import COUNT_CHECK
+from ..batch import PRIMARY_KEY_CHECK
+from ..batch import publish_batch
+from ..batch import run_batch
+from ..batch import union_count_sql
+from ..fetch import ConnectionPool
+
+SOURCE_COUNTS = {
+    'SELECT COUNT(1) FROM a': 10,
+    'SELECT COUNT(1) FROM b': 20,
+}
+DESTINATION_COUNTS = {
+    'SELECT COUNT(1) FROM dev.a': 10,
+    'SELECT COUNT(1) FROM dev.b': 5,
+}
+
+
+class TestBatch(TestCase):
+    """Tests for the batched QA checks
+    """
+
+    def setUp(self):
+        """Setup a pool of mock connections and a batch of checks
+        """
+        self.pool = ConnectionPool(lambda host: host)
+        self.queries = list()
+        self.checks = [
+            {'type': COUNT_CHECK, 'name': 'a', 'source_host': 'mysql',
+             'source_sql': 'SELECT COUNT(1) FROM a;',
+             'destination_sql': 'SELECT COUNT(1) FROM dev.a;',
+             'tolerance': 1.0},
+            {'type': PRIMARY_KEY_CHECK, 'name': 'pk', 'table': 'dev.a',
+             'sql': 'SELECT COUNT(1) duplicate_keys FROM dev.a;'},
+            {'type': COUNT_CHECK, 'name': 'b', 'source_host': 'mysql',
+             'source_sql': 'SELECT COUNT(1) FROM b;',
+             'destination_sql': 'SELECT COUNT(1) FROM dev.b;',
+             'tolerance': 1.0},
+        ]
+
+    def read(self, sql, host):
+        """Evaluate the batch queries from the fixed counts
+        """
+        self.queries.append((host, sql))
+        if sql.startswith('SELECT COUNT(1) duplicate_keys'):
+            return pandas.DataFrame([[3]])
+
+        counts = SOURCE_COUNTS if host == 'mysql' else DESTINATION_COUNTS
+        rows = list()
+        for select in sql.split('\nUNION ALL\n'):
+            index, query = select[len('SELECT '):].split(' AS check_index, ')
+            rows.append((int(index), counts[query[1:-len(') AS row_count')]]))
+        return pandas.DataFrame(rows, columns=['check_index', 'row_count'])
+
+    def test_union_count_sql(self):
+        """Test that the count queries are nested without semicolons
+        """
+        eq_(union_count_sql([(0, 'SELECT COUNT(1) FROM a;'),
+                             (2, 'SELECT COUNT(1) FROM b')]),
+            'SELECT 0 AS check_index, (SELECT COUNT(1) FROM a) AS row_count'
+            '\nUNION ALL\n'
+            'SELECT 2 AS check_index, (SELECT COUNT(1) FROM b) AS row_count')
+
+    def test_one_count_query_per_host(self):
+        """Test that the counts of a host are fetched with a single query
+        """
+        result = run_batch(self.pool, self.checks, sns_topic_arn='',
+                           read=self.read)
+        eq_(sorted(host for host, _ in self.queries),
+            ['mysql', 'redshift', 'redshift'])
+
+        checks = [check for check, _ in result]
+        eq_([check.name for check in checks], ['a', 'pk', 'b'])
+        eq_((checks[0].source_count, checks[0].destination_count), (10, 10))
+        eq_(checks[1].duplicate_count, 3)
+        eq_((checks[2].source_count, checks[2].destination_count), (20, 5))
+        eq_([publish_args for _, publish_args in result],
+            [{'dest_sql': 'SELECT COUNT(1) FROM dev.a;'}, {'table': 'dev.a'},
+             {'dest_sql': 'SELECT COUNT(1) FROM dev.b;'}])
+
+    @raises(ValueError)
+    def test_unknown_check_type(self):
+        """Test that only count and primary key checks can be batched
+        """
+        run_batch(self.pool, [{'type': 'column', 'name': 'c'}],
+                  read=self.read)
+
+    def test_publish_all_before_failing(self):
+        """Test that every check is published before the batch fails
+        """
+        checks = list()
+        for name in ['a', 'b', 'c']:
+            check = MagicMock()
+            check.name = name
+            if name != 'b':
+                check.publish.side_effect = Exception('Failure on %s' % name)
+            checks.append((check, {'table': 'dev.%s' % name}))
+
+        try:
+            publish_batch(checks, log_to_s3=True)
+        except Exception as error:
+            eq_(str(error), 'Failure on a, c')
+        else:
+            raise AssertionError('The batch should fail')
+
+        sinks = set()
+        for check, _ in checks:
+            eq_(check.publish.call_count, 1)
+            args, kwargs = check.publish.call_args
+            eq_((args, kwargs['table']), ((True,), 'dev.%s' % check.name))
+            sinks.add(kwargs['sink'])
+        eq_(len(sinks), 1)
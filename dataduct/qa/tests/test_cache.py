@@ -0,0 +1,105 @@
+"""Tests for the ResultCache
+"""
+from argparse import Namespace
+from datetime import datetime
+import json
+
+from unittest import TestCase
+from mock import MagicMock
+from mock import patch
+from nose.tools import eq_
+import pandas
+
+from ..cache import check_definition
+from ..cache import check_fingerprint
+from ..cache import ResultCache
+from ..cache import table_marker_sql
+from ..primary_key_check import PrimaryKeyCheck
+
+
+class TestResultCache(TestCase):
+    """Tests for the ResultCache
+    """
+
+    def setUp(self):
+        """Setup a cache reading a fixed table marker
+        """
+        self.marker = [1234, 10, datetime(2020, 1, 1), None]
+        self.cache = ResultCache(MagicMock())
+        self.stored = dict()
+
+        fetch_all = patch('dataduct.qa.cache.fetch_all',
+                          side_effect=lambda pool, queries: [
+                              pandas.DataFrame([self.marker])])
+        fetch_all.start()
+        self.addCleanup(fetch_all.stop)
+
+    def test_marker_sql(self):
+        """Test that the marker is read for the schema and table
+        """
+        sql = table_marker_sql('Dev.Test')
+        eq_('"schema" = \'dev\'' in sql, True)
+        eq_('"table" = \'test\'' in sql, True)
+
+    def test_fingerprint(self):
+        """Test that the fingerprint changes with the definition and marker
+        """
+        fingerprint = check_fingerprint({'table': 'a'}, self.marker)
+        eq_(fingerprint, check_fingerprint({'table': 'a'}, self.marker))
+        eq_(fingerprint == check_fingerprint({'table': 'b'}, self.marker),
+            False)
+        eq_(fingerprint == check_fingerprint({'table': 'a'}, [1234, 11]),
+            False)
+
+    def test_definition(self):
+        """Test that the publishing arguments are not part of the definition
+        """
+        args = Namespace(table='dev.test', cache=True, log_to_s3=True,
+                         sns_topic_arn='arn', test_name='pipeline.pk')
+        eq_(check_definition(args),
+            {'table': 'dev.test', 'test_name': 'pipeline.pk'})
+
+    def test_run(self):
+        """Test that the verdict is only computed on a cache miss
+        """
+        def upload(text, s3_path):
+            """Store the uploaded text in memory
+            """
+            self.stored[s3_path.key] = text
+            return MagicMock()
+
+        def get_key(key):
+            """Stored text of a key, None if not stored
+            """
+            if key not in self.stored:
+                return None
+            return MagicMock(
+                get_contents_as_string=lambda: self.stored[key])
+
+        run_check = MagicMock(return_value=PrimaryKeyCheck(
+            3, name='pipeline.pk', sns_topic_arn=''))
+        with patch('dataduct.qa.cache.S3File', side_effect=upload), \
+                patch('dataduct.qa.cache.get_s3_bucket') as get_s3_bucket:
+            get_s3_bucket.return_value.get_key.side_effect = get_key
+
+            check = self.cache.run('dev.test', {}, run_check,
+                                   name='pipeline.pk', sns_topic_arn='')
+            eq_(check.success, False)
+            cached = self.cache.run('dev.test', {}, run_check,
+                                    name='pipeline.pk', sns_topic_arn='')
+
+        eq_(run_check.call_count, 1)
+        eq_((cached.success, cached.error_rate, cached.tolerance),
+            (False, 3.0, 0.0))
+        eq_(cached.summary.splitlines()[:-1], check.summary.splitlines())
+        eq_(json.loads(self.stored.values()[0])['success'], False)
+
+    def test_missing_marker(self):
+        """Test that a table without a marker is always checked
+        """
+        self.marker = None
+        with patch('dataduct.qa.cache.fetch_all',
+                   return_value=[pandas.DataFrame([])]):
+            run_check = MagicMock()
+            eq_(self.cache.run('dev.test', {}, run_check),
+                run_check.return_value)
@@ -0,0 +1,62 @@
+"""Tests for the ColumnCheck
+"""
+from unittest import TestCase
+from nose.tools import eq_
+import pandas
+
+from ..column_check import ColumnCheck
+
+
+def sample(keys, values, names=('id',)):
+    """Single column dataframe indexed by the keys
+    """
+    if isinstance(keys[0], tuple):
+        index = pandas.MultiIndex.from_tuples(keys, names=names)
+    else:
+        index = pandas.Index(keys, name=names[0])
+    return pandas.DataFrame({'value': values}, index=index)
+
+
+class TestColumnCheck(TestCase):
+    """Tests for the ColumnCheck
+    """
+
+    def test_only_shared_keys_observed(self):
+        """Test that keys missing from the destination are not compared
+        """
+        check = ColumnCheck(sample([1, 2, 3], ['a', 'b', 'c']),
+                            sample([2, 3, 4], ['b', 'x', 'd']),
+                            name='test', sns_topic_arn='')
+        eq_(check.observed, 2)
+        eq_(list(check.errors.index), [3])
+        eq_(check.error_rate, 50.0)
+        eq_(check.results.splitlines()[-1], "(3, 'c', 'x')")
+
+    def test_unicode_matches_utf8(self):
+        """Test that unicode source values match utf-8 destination values
+        """
+        check = ColumnCheck(sample([1, 2], [u'caf\xe9', None]),
+                            sample([1, 2], ['caf\xc3\xa9', None]),
+                            name='test', sns_topic_arn='')
+        eq_(check.observed, 2)
+        eq_(len(check.errors), 0)
+
+    def test_compound_keys(self):
+        """Test that compound keys are aligned on every level
+        """
+        names = ('id', 'version')
+        check = ColumnCheck(
+            sample([(1, 1), (1, 2), (2, 1)], [1.5, 2.0, 3.0], names),
+            sample([(1, 2), (2, 1), (1, 1)], [2.0, 4.0, 1.5], names),
+            name='test', sns_topic_arn='')
+        eq_(check.observed, 3)
+        eq_(list(check.errors.index), [(2, 1)])
+        eq_(list(check.errors['destination']), [4.0])
+
+    def test_no_shared_keys(self):
+        """Test that the error rate is undefined without shared keys
+        """
+        check = ColumnCheck(sample([1], ['a']), sample([2], ['a']),
+                            name='test', sns_topic_arn='')
+        eq_(check.error_rate, None)
+        eq_(check.success, False)
@@ -0,0 +1,57 @@
+"""Tests for the count checks
+"""
+from datetime import date
+from unittest import TestCase
+from nose.tools import eq_
+import pandas
+
+from ..count_check import WindowCountCheck
+
+
+def day_counts(rows):
+    """Day and count rows as returned by the window count queries
+    """
+    return pandas.DataFrame(rows, columns=['day', 'row_count'])
+
+
+class TestWindowCountCheck(TestCase):
+    """Tests for the WindowCountCheck
+    """
+
+    def test_matching_days(self):
+        """Test that days in another order and date type match
+        """
+        check = WindowCountCheck(
+            day_counts([(date(2020, 1, 1), 10), (date(2020, 1, 2), 20)]),
+            day_counts([('2020-01-02', 20), ('2020-01-01 00:00:00', 10)]),
+            name='test', sns_topic_arn='')
+        eq_((check.source_count, check.destination_count), (30, 30))
+        eq_(check.error_rate, 0)
+        eq_(check.success, True)
+
+    def test_failed_days(self):
+        """Test that the worst day decides and missing days are localized
+        """
+        check = WindowCountCheck(
+            day_counts([('2020-01-01', 100), ('2020-01-02', 10)]),
+            day_counts([('2020-01-01', 100), ('2020-01-02', 9),
+                        ('2020-01-03', 5)]),
+            name='test', sns_topic_arn='', tolerance=5.0)
+        eq_(check.day_error_rates, [('2020-01-01', 0.0),
+                                    ('2020-01-02', 10.0),
+                                    ('2020-01-03', 100.0)])
+        eq_(check.error_rate, 100.0)
+        eq_(check.success, False)
+        eq_(check.summary.splitlines()[-1],
+            'Failed Days: 2020-01-02, 2020-01-03')
+        eq_(check.results.splitlines()[1:], ['2020-01-01: 100 100',
+                                             '2020-01-02: 10 9',
+                                             '2020-01-03: 0 5'])
+
+    def test_empty_window(self):
+        """Test that a window without rows succeeds
+        """
+        check = WindowCountCheck(day_counts([]), day_counts([]),
+                                 name='test', sns_topic_arn='')
+        eq_(check.error_rate, 0)
+        eq_(check.success, True)
@@ -0,0 +1,103 @@
+"""Tests for the concurrent QA fetch
+"""
+import threading
+import time
+
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+from nose.tools import raises
+
+from ..fetch import ConnectionPool
+from ..fetch import fetch_all
+
+
+class TestFetch(TestCase):
+    """Tests for the ConnectionPool and fetch_all
+    """
+
+    def setUp(self):
+        """Setup a pool opening mock connections
+        """
+        self.connections = list()
+
+        def connect(host):
+            """Open a mock connection to the host
+            """
+            connection = MagicMock()
+            connection.host = host
+            self.connections.append(connection)
+            return connection
+
+        self.pool = ConnectionPool(connect, max_connections=2)
+
+    def test_results_in_query_order(self):
+        """Test that every query runs on a connection to its host
+        """
+        result = fetch_all(self.pool, [('mysql', 'a'), ('redshift', 'b')],
+                           read=lambda sql, c: (sql, c.host))
+        eq_(result, [('a', 'mysql'), ('b', 'redshift')])
+
+    def test_queries_run_concurrently(self):
+        """Test that the wall time is that of the slowest query
+        """
+        def read(sql, connection):
+            """Slow query
+            """
+            time.sleep(0.2)
+            return sql
+
+        start = time.time()
+        fetch_all(self.pool, [('mysql', 'a'), ('redshift', 'b')], read=read)
+        eq_(time.time() - start < 0.35, True)
+
+    def test_connections_shared(self):
+        """Test that later queries reuse the idle connections of a host
+        """
+        read = lambda sql, connection: sql
+        for _ in range(3):
+            fetch_all(self.pool, [('mysql', 'a'), ('redshift', 'b')],
+                      read=read)
+        eq_(sorted(c.host for c in self.connections), ['mysql', 'redshift'])
+
+        self.pool.close()
+        eq_([c.close.call_count for c in self.connections], [1, 1])
+
+    def test_connections_per_host_limited(self):
+        """Test that a host never has more than max_connections queries
+        """
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def read(sql, connection):
+            """Track the number of queries running at once
+            """
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return sql
+
+        fetch_all(self.pool, [('mysql', str(i)) for i in range(6)],
+                  workers=6, read=read)
+        eq_(running[1], 2)
+        eq_(len(self.connections), 2)
+
+    @raises(ValueError)
+    def test_failed_query_closes_connection(self):
+        """Test that a connection is not reused after a failed query
+        """
+        def read(sql, connection):
+            """Failing query
+            """
+            raise ValueError(sql)
+
+        try:
+            fetch_all(self.pool, [('mysql', 'a')], read=read)
+        finally:
+            eq_(self.connections[0].close.call_count, 1)
+            fetch_all(self.pool, [('mysql', 'b')],
+                      read=lambda sql, c: sql)
+            eq_(len(self.connections), 2)
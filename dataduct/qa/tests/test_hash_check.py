@@ -0,0 +1,98 @@
+"""Tests for the HashCheck
+"""
+from decimal import Decimal
+from unittest import TestCase
+from nose.tools import eq_
+from nose.tools import raises
+import pandas
+
+from ..hash_check import bucket_checksums_sql
+from ..hash_check import bucket_rows_sql
+from ..hash_check import hash_rows_sql
+from ..hash_check import HashCheck
+from ..hash_check import MYSQL
+from ..hash_check import REDSHIFT
+
+
+def buckets(rows):
+    """Bucket checksums indexed by the bucket
+    """
+    return pandas.DataFrame(
+        [(b, c, Decimal(s)) for b, c, s in rows],
+        columns=['bucket', 'row_count', 'checksum']).set_index('bucket')
+
+
+def row_checksums(rows):
+    """Row checksums indexed by the key
+    """
+    return pandas.DataFrame(
+        rows, columns=['primary_key', 'row_checksum']).set_index(
+            'primary_key')
+
+
+class TestHashCheck(TestCase):
+    """Tests for the HashCheck
+    """
+
+    def test_matching_buckets(self):
+        """Test that identical buckets have no errors
+        """
+        check = HashCheck(buckets([(0, 2, 10), (1, 1, 5)]),
+                          buckets([(1, 1, 5), (0, 2, 10)]),
+                          name='test', sns_topic_arn='')
+        eq_(check.mismatched_buckets, [])
+        eq_(check.observed, 3)
+        eq_(check.error_rate, 0)
+        eq_(check.success, True)
+
+    def test_mismatched_buckets(self):
+        """Test that missing buckets and changed checksums mismatch
+        """
+        check = HashCheck(buckets([(0, 2, 10), (1, 1, 5), (2, 3, 9)]),
+                          buckets([(0, 2, 11), (1, 1, 5)]),
+                          name='test', sns_topic_arn='')
+        eq_(sorted(check.mismatched_buckets), [0, 2])
+
+        # Undrilled buckets count all of their rows as errors
+        eq_(check.error_count, 5)
+        eq_(check.error_rate, 5 * 100.0 / 6)
+
+    def test_drill_down(self):
+        """Test that drilling down finds the changed and missing keys
+        """
+        check = HashCheck(buckets([(0, 2, 10), (2, 3, 9)]),
+                          buckets([(0, 2, 11), (2, 3, 9)]),
+                          name='test', sns_topic_arn='')
+        check.drill_down([0], row_checksums([('1', 4), ('2', 6)]),
+                         row_checksums([('1', 4), ('3', 7)]))
+        eq_(check.undrilled_buckets, [])
+        eq_(sorted(check.errors.index), ['2', '3'])
+        eq_(check.error_count, 2)
+        eq_(check.results.splitlines()[1:], ["('2', 6.0, nan)",
+                                             "('3', nan, 7.0)"])
+
+    def test_hash_rows_sql_dialects(self):
+        """Test that both dialects hash the same separated row text
+        """
+        mysql_sql = hash_rows_sql('SELECT id, name FROM t', ['id'], ['name'],
+                                  64, MYSQL, 'WHERE id > 0')
+        redshift_sql = hash_rows_sql('SELECT id, name FROM t', ['id'],
+                                     ['name'], 64, REDSHIFT)
+
+        eq_("CONCAT(COALESCE(CONCAT(id, ''), ''), '|', "
+            "COALESCE(CONCAT(name, ''), ''))" in mysql_sql, True)
+        eq_("COALESCE(CONCAT(id, ''), '') || '|' || "
+            "COALESCE(CONCAT(name, ''), '')" in redshift_sql, True)
+        eq_('CONV(SUBSTRING(MD5(' in mysql_sql, True)
+        eq_('STRTOL(SUBSTRING(MD5(' in redshift_sql, True)
+        eq_(mysql_sql.strip().endswith('WHERE id > 0'), True)
+
+        eq_('::DECIMAL(38, 0)' in bucket_checksums_sql(redshift_sql,
+                                                       REDSHIFT), True)
+        eq_('WHERE bucket IN BUCKET_SET' in bucket_rows_sql(mysql_sql), True)
+
+    @raises(ValueError)
+    def test_unknown_dialect(self):
+        """Test that only the mysql and redshift dialects are supported
+        """
+        hash_rows_sql('SELECT 1', ['a'], ['b'], 8, 'oracle')
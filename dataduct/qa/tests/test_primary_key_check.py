@@ -0,0 +1,39 @@
+"""Tests for the PrimaryKeyCheck
+"""
+from unittest import TestCase
+from nose.tools import eq_
+import pandas
+
+from ..primary_key_check import approximate_duplicate_count
+from ..primary_key_check import PrimaryKeyCheck
+
+
+class TestPrimaryKeyCheck(TestCase):
+    """Tests for the PrimaryKeyCheck
+    """
+
+    def test_approximate_duplicate_count(self):
+        """Test that differences within the estimate error are ignored
+        """
+        eq_(approximate_duplicate_count(1000, 990), 0)
+        eq_(approximate_duplicate_count(1000, 1010), 0)
+        eq_(approximate_duplicate_count(1000, 900), 100)
+
+    def test_sample_results(self):
+        """Test that the sampled keys are in the results only
+        """
+        sample = pandas.DataFrame([(1, 3), (2, 2)],
+                                  columns=['id', 'duplicate_count'])
+        check = PrimaryKeyCheck(2, sample=sample, name='test',
+                                sns_topic_arn='')
+        eq_(check.success, False)
+        eq_(check.results.splitlines()[1:], ['(1, 3)', '(2, 2)'])
+        eq_('(1, 3)' in check.summary, False)
+
+    def test_approximate_summary(self):
+        """Test that approximate counts are flagged in the summary
+        """
+        check = PrimaryKeyCheck(0, approximate=True, name='test',
+                                sns_topic_arn='')
+        eq_(check.summary.splitlines()[-1], 'Approximate: True')
+        eq_(check.results, check.summary)
@@ -0,0 +1,78 @@
+"""Tests for the ProfileCheck
+"""
+from decimal import Decimal
+from unittest import TestCase
+from nose.tools import eq_
+
+from ...database import SqlScript
+from ...database import Table
+from ..profile_check import ProfileCheck
+from ..profile_check import profile_metrics
+from ..profile_check import profile_sql
+from ..profile_check import read_profile
+
+
+class TestProfileCheck(TestCase):
+    """Tests for the ProfileCheck
+    """
+
+    def setUp(self):
+        """Setup a table with a number, a text and a boolean column
+        """
+        self.table = Table(SqlScript(
+            'CREATE TABLE dev.test (id INTEGER, name VARCHAR(10), '
+            'active BOOLEAN, PRIMARY KEY(id));'))
+
+    def profile(self, null_rate=0.0, distinct=100, avg_length=5.5):
+        """Profile of the test table
+        """
+        return read_profile(self.table, [
+            100,
+            0.0, 100, '1', '100',
+            null_rate, distinct, 'a', 'z', avg_length, 10,
+            Decimal('0.0'), 2])
+
+    def test_single_scan(self):
+        """Test that every statistic is computed by one select of the table
+        """
+        sql = profile_sql(self.table)
+        eq_(sql.count('FROM'), 1)
+        eq_(sql.count(' AS metric_'), 12)
+        eq_([(name, metric) for name, metric, _ in profile_metrics(self.table)
+             if name == 'active'],
+            [('active', 'null_rate'), ('active', 'distinct')])
+        eq_('AVG(LEN(name)::FLOAT)' in sql, True)
+        eq_('LEN(id)' in sql, False)
+
+    def test_read_profile(self):
+        """Test that the row is read into JSON values per column
+        """
+        profile = self.profile()
+        eq_(profile['row_count'], 100)
+        eq_(profile['columns']['name'],
+            {'null_rate': 0, 'distinct': 100, 'min': 'a', 'max': 'z',
+             'avg_length': 5.5, 'max_length': 10})
+        eq_(profile['columns']['active'], {'null_rate': 0, 'distinct': 2})
+
+    def test_first_run(self):
+        """Test that a profile without a previous profile succeeds
+        """
+        check = ProfileCheck(self.profile(null_rate=50.0), name='test',
+                             sns_topic_arn='')
+        eq_(check.success, True)
+        eq_(check.summary.splitlines()[-2:],
+            ['Previous Profile: False', 'Regressions: 0'])
+
+    def test_regressions(self):
+        """Test that only statistics beyond their tolerance are regressions
+        """
+        check = ProfileCheck(
+            self.profile(null_rate=0.5, distinct=150, avg_length=5.6),
+            self.profile(), name='test', sns_topic_arn='')
+        eq_(check.regressions, [('name', 'distinct', 100, 150)])
+        eq_(check.success, False)
+
+        check = ProfileCheck(
+            self.profile(null_rate=2.0), self.profile(),
+            null_rate_tolerance=5.0, name='test', sns_topic_arn='')
+        eq_(check.success, True)
@@ -0,0 +1,112 @@
+"""Tests for the reconcile check
+"""
+from unittest import TestCase
+from nose.tools import eq_
+from nose.tools import raises
+
+from ..reconcile import CHANGED
+from ..reconcile import DiffSummary
+from ..reconcile import EXTRA
+from ..reconcile import MATCHED
+from ..reconcile import merge_diff
+from ..reconcile import MISSING
+from ..reconcile import reconcile
+from ..reconcile import ReconcileCheck
+from ..reconcile import reconcile_sql
+
+
+class TestReconcile(TestCase):
+    """Tests for the sorted merge diff of rows
+    """
+
+    def setUp(self):
+        """Setup rows with a missing, an extra and a changed key
+        """
+        self.source = [(1, 'a'), (2, u'b'), (3, 'c'), (5, 'e')]
+        self.destination = [(1, 'a'), (3, 'x'), (4, 'd'), (5, 'e')]
+
+    def test_merge_diff(self):
+        """Test that every key of both sides gets its kind
+        """
+        eq_(list(merge_diff(self.source, self.destination, 1)), [
+            (MATCHED, (1,), ('a',), ('a',)),
+            (MISSING, (2,), ('b',), None),
+            (CHANGED, (3,), ('c',), ('x',)),
+            (EXTRA, (4,), None, ('d',)),
+            (MATCHED, (5,), ('e',), ('e',)),
+        ])
+
+    def test_one_side_empty(self):
+        """Test that the rows of a single side are all missing or extra
+        """
+        eq_([kind for kind, _, _, _ in merge_diff(self.source, [], 1)],
+            [MISSING] * 4)
+        eq_([kind for kind, _, _, _ in merge_diff([], self.destination, 1)],
+            [EXTRA] * 4)
+
+    def test_composite_key(self):
+        """Test that composite keys are compared as tuples
+        """
+        eq_([kind for kind, _, _, _ in merge_diff(
+            [(1, 'a', 'x'), (1, 'b', 'y')], [(1, 'b', 'y'), (2, 'a', 'z')],
+            2)], [MISSING, MATCHED, EXTRA])
+
+    @raises(ValueError)
+    def test_unordered_rows(self):
+        """Test that rows out of key order are rejected
+        """
+        list(merge_diff([(2, 'b'), (1, 'a')], [], 1))
+
+    def test_reconcile_output(self):
+        """Test that only the differences are passed to the output
+        """
+        batches = list()
+        summary = reconcile(self.source, self.destination, 1,
+                            batches.append, sample_size=1)
+        eq_(batches, [[(MISSING, 2, 'b', None), (CHANGED, 3, 'c', 'x'),
+                       (EXTRA, 4, None, 'd')]])
+        eq_((summary.observed, summary.error_count), (5, 3))
+        eq_(summary.sample, [(MISSING, (2,), 'b', None)])
+
+    def test_summary_update(self):
+        """Test that the summaries of chunks add up
+        """
+        summary = DiffSummary(sample_size=2)
+        summary.update(reconcile(self.source, self.destination, 1))
+        summary.update(reconcile([(6, 'f')], [], 1))
+        eq_(summary.counts,
+            {MATCHED: 2, MISSING: 2, CHANGED: 1, EXTRA: 1})
+        eq_(len(summary.sample), 2)
+
+    def test_reconcile_sql(self):
+        """Test that the rows are ordered by the key
+        """
+        sql = reconcile_sql('SELECT id, name FROM test', ['id'], ['name'],
+                            'redshift')
+        eq_(sql.split()[-3:], ['ORDER', 'BY', 'id'])
+        eq_('KEY_RANGE' in sql, True)
+
+
+class TestReconcileCheck(TestCase):
+    """Tests for the ReconcileCheck
+    """
+
+    def test_reconcile_check(self):
+        """Test the error rate and the listed differences
+        """
+        summary = reconcile([(1, 'a'), (2, 'b')], [(1, 'x'), (2, 'b')], 1)
+        check = ReconcileCheck(summary, output_path='s3://bucket/diff/',
+                               name='test', sns_topic_arn='', tolerance=10.0)
+        eq_(check.error_rate, 50.0)
+        eq_(check.success, False)
+        eq_(check.summary.splitlines()[-4:],
+            ['Missing: 0', 'Extra: 0', 'Changed: 1',
+             'Differences: s3://bucket/diff/'])
+        eq_('x' in check.results, True)
+
+    def test_empty_tables(self):
+        """Test that empty tables succeed
+        """
+        check = ReconcileCheck(DiffSummary(), name='test', sns_topic_arn='')
+        eq_(check.error_rate, 0.0)
+        eq_(check.success, True)
@@ -0,0 +1,79 @@
+"""Tests for the ResultSink
+"""
+from cStringIO import StringIO
+import gzip
+
+from unittest import TestCase
+from mock import MagicMock
+from mock import patch
+from nose.tools import eq_
+
+from ..count_check import CountCheck
+from ..primary_key_check import PrimaryKeyCheck
+from ..sink import ResultSink
+
+
+class TestResultSink(TestCase):
+    """Tests for the ResultSink
+    """
+
+    def setUp(self):
+        """Setup checks of two tables
+        """
+        self.count_check = CountCheck(10, 10, name='pipeline.count',
+                                      sns_topic_arn='')
+        self.pk_check = PrimaryKeyCheck(0, name='pipeline.pk',
+                                        sns_topic_arn='')
+
+    def test_rows_of_the_run(self):
+        """Test that the rows of all checks are buffered as one TSV
+        """
+        sink = ResultSink()
+        self.count_check.publish(True, dest_sql='SELECT id FROM dev.a',
+                                 sink=sink)
+        self.pk_check.publish(True, table='dev.b', sink=sink)
+
+        lines = [line.split('\t') for line in sink.text.splitlines()]
+        eq_([line[:3] + line[4:] for line in lines],
+            [['dev', 'a', 'pipeline', 'pipeline.count', '1', '0', '0.0'],
+             ['dev', 'b', 'pipeline', 'pipeline.pk', '1', '0', '0']])
+
+        text = gzip.GzipFile(fileobj=StringIO(sink.compressed_text)).read()
+        eq_(text, sink.text)
+
+    @patch('dataduct.qa.sink.S3File')
+    def test_flush_single_file(self, s3_file):
+        """Test that a flush uploads one gzipped file of all the rows
+        """
+        sink = ResultSink(path_suffix='daily')
+        sink.add(self.count_check, 'SELECT id FROM dev.a')
+        sink.add(self.pk_check, table='dev.b')
+        sink.flush()
+
+        eq_(s3_file.call_count, 1)
+        s3_path = s3_file.call_args[1]['s3_path']
+        eq_('/dba_table_qa_tests/daily/pipeline_' in s3_path.uri, True)
+        eq_(s3_path.uri.endswith('.tsv.gz'), True)
+        eq_(sink.rows, [])
+
+        sink.flush()
+        eq_(s3_file.call_count, 1)
+
+    def test_flush_to_table(self):
+        """Test that the rows are inserted with multi row INSERTs
+        """
+        connection = MagicMock()
+        sink = ResultSink(table='dev.qa_results',
+                          connect=lambda host: connection)
+        for _ in range(1001):
+            sink.add(self.pk_check, table='dev.b')
+
+        statements = list(sink.insert_statements())
+        eq_([len(parameters) for _, parameters in statements], [8000, 8])
+        eq_(statements[1][0], 'INSERT INTO dev.qa_results VALUES '
+            '(%s,%s,%s,%s,%s,%s,%s,%s)')
+
+        sink.flush()
+        cursor = connection.cursor.return_value
+        eq_(cursor.execute.call_count, 2)
+        eq_(connection.close.call_count, 1)
@@ -2,3 +2,4 @@ from .s3_file import S3File
 from .s3_path import S3Path
 from .s3_directory import S3Directory
 from .s3_log_path import S3LogPath
+from .s3_stream import S3StreamWriter
@@ -0,0 +1,113 @@
+"""
+Writable stream uploaded to S3 with a multipart upload
+"""
+from cStringIO import StringIO
+
+from ..utils.exceptions import ETLInputError
+from .s3_path import S3Path
+from .utils import get_s3_bucket
+
+# S3 rejects parts other than the last one that are smaller than 5mb
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+
+
+class S3StreamWriter(object):
+    """File like object that streams its contents to an S3 key
+
+    Data is buffered in memory and uploaded a part at a time, so the
+    contents never touch the local disk and at most one part is held in
+    memory. The key only exists once the writer is closed successfully.
+    """
+    def __init__(self, s3_path, part_size=DEFAULT_PART_SIZE, bucket=None):
+        """Constructor for the S3StreamWriter class
+
+        Args:
+            s3_path(S3Path): Path of the key to write
+            part_size(int): Number of bytes uploaded in every part
+            bucket(boto.s3.bucket.Bucket): Bucket of the key, looked up
+                from the path if None
+        """
+        if not isinstance(s3_path, S3Path) or s3_path.is_directory:
+            raise ETLInputError('Output path should be an S3Path to a file')
+
+        if part_size < MIN_PART_SIZE:
+            raise ETLInputError('Part size should be atleast %d bytes' %
+                                MIN_PART_SIZE)
+
+        if bucket is None:
+            bucket = get_s3_bucket(s3_path.bucket)
+
+        self.s3_path = s3_path
+        self.part_size = part_size
+        self.bytes_written = 0
+        self._bucket = bucket
+        self._upload = None
+        self._part_count = 0
+        self._buffer = StringIO()
+        self._closed = False
+
+    def _upload_part(self):
+        """Upload the buffered data as the next part
+        """
+        if self._upload is None:
+            self._upload = self._bucket.initiate_multipart_upload(
+                self.s3_path.key)
+
+        self._part_count += 1
+        self._buffer.seek(0)
+        self._upload.upload_part_from_file(self._buffer, self._part_count)
+        self._buffer = StringIO()
+
+    def write(self, data):
+        """Write data to the stream, uploading a part once it is large enough
+        """
+        if self._closed:
+            raise ValueError('Write to a closed S3StreamWriter')
+
+        self._buffer.write(data)
+        self.bytes_written += len(data)
+        if self._buffer.tell() >= self.part_size:
+            self._upload_part()
+
+    def flush(self):
+        """Data is only uploaded in full parts, so there is nothing to flush
+        """
+        pass
+
+    def close(self):
+        """Upload the remaining data and complete the upload
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            if self._upload is None:
+                # Small outputs are uploaded with a single request
+                key = self._bucket.new_key(self.s3_path.key)
+                key.set_contents_from_string(self._buffer.getvalue())
+            else:
+                if self._buffer.tell() > 0:
+                    self._upload_part()
+                self._upload.complete_upload()
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Cancel the upload so that no partial key is left behind
+        """
+        self._closed = True
+        if self._upload is not None:
+            self._upload.cancel_upload()
+            self._upload = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,81 @@
+"""Tests for the S3StreamWriter
+"""
+from unittest import TestCase
+from mock import MagicMock
+from nose.tools import eq_
+from nose.tools import raises
+
+from ...utils.exceptions import ETLInputError
+from ..s3_path import S3Path
+from ..s3_stream import MIN_PART_SIZE
+from ..s3_stream import S3StreamWriter
+
+
+class TestS3StreamWriter(TestCase):
+    """Tests for the S3StreamWriter
+    """
+
+    def setUp(self):
+        """Setup a mock bucket recording the uploaded parts
+        """
+        self.parts = list()
+
+        def upload_part(fp, part_num):
+            """Record the contents of the part
+            """
+            self.parts.append((part_num, fp.read()))
+
+        self.upload = MagicMock()
+        self.upload.upload_part_from_file.side_effect = upload_part
+        self.bucket = MagicMock()
+        self.bucket.initiate_multipart_upload.return_value = self.upload
+        self.path = S3Path(uri='s3://bucket/data/part-0000.gz')
+
+    def test_small_output_single_request(self):
+        """Test that outputs smaller than a part skip the multipart upload
+        """
+        with S3StreamWriter(self.path, bucket=self.bucket) as writer:
+            writer.write('a\tb\n')
+
+        eq_(self.bucket.initiate_multipart_upload.call_count, 0)
+        self.bucket.new_key.assert_called_once_with('data/part-0000.gz')
+        self.bucket.new_key.return_value.set_contents_from_string.\
+            assert_called_once_with('a\tb\n')
+
+    def test_large_output_uploaded_in_parts(self):
+        """Test that the data is uploaded a part at a time
+        """
+        data = 'x' * (MIN_PART_SIZE - 1)
+        with S3StreamWriter(self.path, part_size=MIN_PART_SIZE,
+                            bucket=self.bucket) as writer:
+            writer.write(data)
+            eq_(self.parts, [])
+            writer.write('yy')
+            eq_(len(self.parts), 1)
+            writer.write('z')
+
+        eq_([(n, len(p)) for n, p in self.parts],
+            [(1, MIN_PART_SIZE + 1), (2, 1)])
+        eq_(writer.bytes_written, MIN_PART_SIZE + 2)
+        eq_(self.upload.complete_upload.call_count, 1)
+
+    def test_error_aborts_upload(self):
+        """Test that an error cancels the upload instead of completing it
+        """
+        try:
+            with S3StreamWriter(self.path, part_size=MIN_PART_SIZE,
+                                bucket=self.bucket) as writer:
+                writer.write('x' * MIN_PART_SIZE)
+                raise ValueError('extract failed')
+        except ValueError:
+            pass
+
+        eq_(self.upload.cancel_upload.call_count, 1)
+        eq_(self.upload.complete_upload.call_count, 0)
+
+    @raises(ETLInputError)
+    def test_directory_path_raises(self):
+        """Test that the output must be a file
+        """
+        S3StreamWriter(S3Path(uri='s3://bucket/data', is_directory=True),
+                       bucket=self.bucket)
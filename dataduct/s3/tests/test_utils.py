@@ -0,0 +1,58 @@
+"""Tests for the S3 utility functions
+"""
+from unittest import TestCase
+from mock import MagicMock
+from mock import patch
+from nose.tools import eq_
+from nose.tools import raises
+
+from ...utils.exceptions import ETLInputError
+from ..s3_path import S3Path
+from ..utils import list_s3_files
+
+
+def s3_key(name, size=10):
+    """Mock boto key with a name and a size
+    """
+    key = MagicMock(size=size)
+    key.name = name
+    return key
+
+
+class TestListS3Files(TestCase):
+    """Tests for listing the files under an S3 path
+    """
+
+    @patch('dataduct.s3.utils.get_s3_bucket')
+    def test_list_files(self, get_s3_bucket):
+        """Test that only the non empty files under the path are listed
+        """
+        bucket = get_s3_bucket.return_value
+        bucket.list.return_value = [
+            s3_key('data/part-0001'),
+            s3_key('data/part-0000'),
+            s3_key('data/empty', size=0),
+            s3_key('data/sub_$folder$'),
+            s3_key('data_other/part-0000'),
+        ]
+
+        keys = list_s3_files(S3Path(uri='s3://bucket/data/',
+                                    is_directory=True))
+        get_s3_bucket.assert_called_once_with('bucket')
+        bucket.list.assert_called_once_with(prefix='data')
+        eq_([key.name for key in keys], ['data/part-0000', 'data/part-0001'])
+
+    @patch('dataduct.s3.utils.get_s3_bucket')
+    def test_list_single_file(self, get_s3_bucket):
+        """Test that a file path lists the file itself
+        """
+        get_s3_bucket.return_value.list.return_value = [
+            s3_key('data/part-0000'), s3_key('data/part-0000.gz')]
+        keys = list_s3_files(S3Path(uri='s3://bucket/data/part-0000'))
+        eq_([key.name for key in keys], ['data/part-0000'])
+
+    @raises(ETLInputError)
+    def test_list_requires_s3_path(self):
+        """Test that the path has to be an S3Path
+        """
+        list_s3_files('s3://bucket/data/')
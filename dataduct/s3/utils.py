@@ -47,6 +47,32 @@ def read_from_s3(s3_path):
     return key.get_contents_as_string()
 
 
+def list_s3_files(s3_path):
+    """Lists the non empty files under an s3 path
+
+    Args:
+        s3_path(S3Path): Path of the file or directory to be listed
+
+    Returns:
+        keys(list of boto.s3.key.Key): Keys of the files sorted by name
+    """
+    if not isinstance(s3_path, S3Path):
+        raise ETLInputError('Input path should be of type S3Path')
+
+    bucket = get_s3_bucket(s3_path.bucket)
+    prefix = s3_path.key.rstrip('/')
+
+    # bucket.list pages through all the keys unlike get_all_keys
+    keys = list()
+    for key in bucket.list(prefix=prefix):
+        if key.name != prefix and not key.name.startswith(prefix + '/'):
+            continue
+        if key.size == 0 or key.name.endswith('_$folder$'):
+            continue
+        keys.append(key)
+    return sorted(keys, key=lambda x: x.name)
+
+
 def _multipart_upload(bucket, key_name, file_path):
     """Multipart upload for really large files
     """
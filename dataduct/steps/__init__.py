@@ -16,8 +16,12 @@ from .load_postgres import LoadPostgresStep
 from .load_reload_pk import LoadReloadAndPrimaryKeyStep
 from .pipeline_dependencies import PipelineDependenciesStep
 from .primary_key_check import PrimaryKeyCheckStep
+from .profile_check import ProfileCheckStep
+from .qa_batch import QABatchStep
 from .qa_transform import QATransformStep
+from .reconcile import ReconcileStep
 from .reload import ReloadStep
 from .sql_command import SqlCommandStep
+from .table_maintenance import TableMaintenanceStep
 from .transform import TransformStep
 from .upsert import UpsertStep
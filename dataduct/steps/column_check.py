@@ -4,6 +4,13 @@ from ..config import Config
 from ..database import SelectStatement
 from ..database import SqlScript
 from ..database import Table
+from ..qa.hash_check import bucket_checksums_sql
+from ..qa.hash_check import bucket_rows_sql
+from ..qa.hash_check import DEFAULT_BUCKETS
+from ..qa.hash_check import DEFAULT_DRILL_DOWN_BUCKETS
+from ..qa.hash_check import hash_rows_sql
+from ..qa.hash_check import MYSQL
+from ..qa.hash_check import REDSHIFT
 from ..utils import constants as const
 from ..utils.exceptions import ETLInputError
 from ..utils.helpers import exactly_one
@@ -14,6 +21,57 @@ config = Config()
 COLUMN_TEMPLATE = "COALESCE(CONCAT({column_name}, ''), '')"
 
 
+def key_columns(source_sql, destination_table_definition, destination_sql):
+    """Key and other columns of both sides of a check by primary key
+
+    Args:
+        source_sql(str): Query selecting the source rows
+        destination_table_definition(file): Table definition for the
+            destination table, its primary key is the key
+        destination_sql(str): Query selecting the destination rows, the
+            last column is the only non-key column
+
+    Returns:
+        result(tuple): Destination table name, and the query, key columns
+            and other columns of the source and of the destination
+    """
+    if destination_table_definition is not None:
+        with open(parse_path(destination_table_definition)) as f:
+            destination_table = Table(SqlScript(f.read()))
+
+        primary_key_index = [
+            idx for idx, col in enumerate(destination_table.columns())
+            if col.primary]
+        destination_names = [c.name for c in destination_table.columns()]
+        destination_sql = 'SELECT %s FROM %s' % (
+            ','.join(destination_names), destination_table.full_name)
+        table_name = destination_table.full_name
+    else:
+        select_stmnt = SelectStatement(destination_sql)
+        destination_names = [
+            c.name.split('.')[-1] for c in select_stmnt.columns()]
+        primary_key_index = range(len(destination_names))[:-1]
+        table_name = select_stmnt.dependencies[0]
+
+    if len(primary_key_index) in [0, len(destination_names)]:
+        raise ValueError('Cannot check table without pk or non-pk columns')
+
+    origin_sql = SelectStatement(SqlScript(source_sql).statements[0].sql())
+    source_names = [x.name.split('.')[-1] for x in origin_sql.columns()]
+
+    def split_names(names):
+        """Key and other columns by the position of the keys
+        """
+        return ([names[idx] for idx in primary_key_index],
+                [name for idx, name in enumerate(names)
+                 if idx not in primary_key_index])
+
+    return (table_name,
+            (origin_sql.sql(),) + split_names(source_names),
+            (SqlScript(destination_sql).statements[0].sql(),) +
+            split_names(destination_names))
+
+
 class ColumnCheckStep(QATransformStep):
     """ColumnCheckStep class that checks if the rows of a table has been
     populated with the correct values
@@ -23,37 +81,58 @@ class ColumnCheckStep(QATransformStep):
                  destination_table_definition=None, script=None,
                  destination_sql=None, sql_tail_for_source=None,
                  sample_size=100, tolerance=1.0, script_arguments=None,
-                 log_to_s3=False, command=None, **kwargs):
+                 log_to_s3=False, command=None, mode=None,
+                 buckets=DEFAULT_BUCKETS,
+                 drill_down_buckets=DEFAULT_DRILL_DOWN_BUCKETS, **kwargs):
         """Constructor for the ColumnCheckStep class
 
         Args:
             destination_table_definition(file):
                 table definition for the destination table
+            mode(str): sample to compare sampled rows, or hash to compare
+                checksums of the full tables
+            buckets(int): Number of key hash buckets in the hash mode
+            drill_down_buckets(int): Most mismatching buckets compared row
+                by row in the hash mode
             **kwargs(optional): Keyword arguments directly passed to base class
         """
 
         if not exactly_one(destination_table_definition, destination_sql):
             raise ETLInputError('One of dest table or dest sql needed')
 
+        if mode is None:
+            mode = const.COLUMN_CHECK_SAMPLE
+        if mode not in const.COLUMN_CHECK_MODES:
+            raise ETLInputError('Column check mode should be one of %s' %
+                                const.COLUMN_CHECK_MODES)
+
         if script_arguments is None:
             script_arguments = list()
 
         if sql_tail_for_source is None:
             sql_tail_for_source = ''
 
-        # Get the EDW column SQL
-        dest_sql, primary_key_index = self.convert_destination_to_column_sql(
-            destination_table_definition, destination_sql)
-
-        src_sql = self.convert_source_to_column_sql(source_sql,
-                                                    primary_key_index,
-                                                    sql_tail_for_source)
+        if mode == const.COLUMN_CHECK_HASH:
+            script_arguments.extend(self.hash_arguments(
+                source_sql, destination_table_definition, destination_sql,
+                sql_tail_for_source, buckets, drill_down_buckets))
+        else:
+            # Get the EDW column SQL
+            dest_sql, primary_key_index = \
+                self.convert_destination_to_column_sql(
+                    destination_table_definition, destination_sql)
+
+            src_sql = self.convert_source_to_column_sql(source_sql,
+                                                        primary_key_index,
+                                                        sql_tail_for_source)
+            script_arguments.extend([
+                '--sample_size=%s' % str(sample_size),
+                '--destination_sql=%s' % dest_sql,
+                '--source_sql=%s' % src_sql,
+            ])
 
         script_arguments.extend([
-            '--sample_size=%s' % str(sample_size),
             '--tolerance=%s' % str(tolerance),
-            '--destination_sql=%s' % dest_sql,
-            '--source_sql=%s' % src_sql,
             '--source_host=%s' % source_host
         ])
 
@@ -67,6 +146,38 @@ class ColumnCheckStep(QATransformStep):
             id=id, script=script, command=command,
             script_arguments=script_arguments, **kwargs)
 
+    @staticmethod
+    def hash_arguments(source_sql, destination_table_definition,
+                       destination_sql, sql_tail_for_source, buckets,
+                       drill_down_buckets):
+        """Arguments comparing bucket checksums of the full tables
+        """
+        table_name, source, destination = key_columns(
+            source_sql, destination_table_definition, destination_sql)
+        source_sql, source_keys, source_columns = source
+        destination_sql, destination_keys, destination_columns = destination
+
+        source_rows_sql = hash_rows_sql(
+            source_sql, source_keys, source_columns, buckets=buckets,
+            dialect=MYSQL, sql_tail=sql_tail_for_source)
+        destination_rows_sql = hash_rows_sql(
+            destination_sql, destination_keys, destination_columns,
+            buckets=buckets, dialect=REDSHIFT)
+
+        return [
+            '--mode=%s' % const.COLUMN_CHECK_HASH,
+            '--table=%s' % table_name,
+            '--drill_down_buckets=%d' % drill_down_buckets,
+            '--source_sql=%s' % SqlScript(
+                bucket_checksums_sql(source_rows_sql, MYSQL)).sql(),
+            '--source_rows_sql=%s' % SqlScript(
+                bucket_rows_sql(source_rows_sql)).sql(),
+            '--destination_sql=%s' % SqlScript(
+                bucket_checksums_sql(destination_rows_sql, REDSHIFT)).sql(),
+            '--destination_rows_sql=%s' % SqlScript(
+                bucket_rows_sql(destination_rows_sql)).sql(),
+        ]
+
     @staticmethod
     def convert_destination_to_column_sql(destination_table_definition=None,
                                           destination_sql=None):
@@ -4,10 +4,12 @@ from ..config import Config
 from ..database import SqlScript
 from ..database import SqlStatement
 from ..database import Table
+from ..qa.count_check import WINDOW_START_PLACEHOLDER
 from ..utils import constants as const
 from ..utils.exceptions import ETLInputError
 from ..utils.helpers import exactly_one
 from ..utils.helpers import parse_path
+from .delta_load import window_start_sql
 from .qa_transform import QATransformStep
 
 config = Config()
@@ -22,39 +24,33 @@ class CountCheckStep(QATransformStep):
                  source_table_name=None, destination_table_name=None,
                  destination_table_definition=None, destination_sql=None,
                  tolerance=1.0, script_arguments=None, log_to_s3=False,
-                 script=None, source_count_sql=None, command=None, **kwargs):
+                 script=None, source_count_sql=None, command=None,
+                 date_column=None, window=0, **kwargs):
         """Constructor for the CountCheckStep class
 
         Args:
             source_sql(str): SQL select script from the source table
             destination_table_name(str): table name for the destination table
+            date_column(str): Compare the counts of every day of the delta
+                load window of this column instead of the full counts
+            window(int): number of days before last loaded day to compare
             **kwargs(optional): Keyword arguments directly passed to base class
         """
 
-        if not exactly_one(destination_table_name, destination_sql,
-                           destination_table_definition):
-            raise ETLInputError(
-                'One of dest table name/schema or dest sql needed')
-
-        if not exactly_one(source_sql, source_table_name, source_count_sql):
-            raise ETLInputError('One of source table name or source sql ' +
-                                'or source count needed')
-
         if script_arguments is None:
             script_arguments = list()
 
-        if destination_table_definition is not None:
-            with open(parse_path(destination_table_definition)) as f:
-                destination_table_string = f.read()
-            destination_table = Table(SqlScript(destination_table_string))
-            destination_table_name = destination_table.full_name
-
-        # Get the EDW column SQL
-        dest_sql = self.convert_destination_to_count_sql(
-            destination_table_name, destination_sql)
-
-        src_sql = self.convert_source_to_count_sql(
-            source_table_name, source_sql, source_count_sql)
+        if date_column is None:
+            src_sql, dest_sql = self.count_queries(
+                source_sql, source_table_name, source_count_sql,
+                destination_table_name, destination_table_definition,
+                destination_sql)
+        else:
+            src_sql, dest_sql, start_sql = self.window_count_queries(
+                date_column, window, source_sql, source_table_name,
+                source_count_sql, destination_table_name,
+                destination_table_definition, destination_sql)
+            script_arguments.append('--window_start_sql=%s' % start_sql)
 
         script_arguments.extend([
             '--tolerance=%s' % str(tolerance),
@@ -73,6 +69,105 @@ class CountCheckStep(QATransformStep):
             id=id, command=command, script=script,
             script_arguments=script_arguments, **kwargs)
 
+    @classmethod
+    def count_queries(cls, source_sql=None, source_table_name=None,
+                      source_count_sql=None, destination_table_name=None,
+                      destination_table_definition=None,
+                      destination_sql=None):
+        """Queries counting the rows of the source and the destination
+
+        Returns:
+            result(tuple): Source and destination count queries
+        """
+        destination_table_name = cls.destination_name(
+            source_sql, source_table_name, source_count_sql,
+            destination_table_name, destination_table_definition,
+            destination_sql)
+
+        # Get the EDW column SQL
+        dest_sql = cls.convert_destination_to_count_sql(
+            destination_table_name, destination_sql)
+
+        src_sql = cls.convert_source_to_count_sql(
+            source_table_name, source_sql, source_count_sql)
+        return src_sql, dest_sql
+
+    @classmethod
+    def window_count_queries(cls, date_column, window=0, source_sql=None,
+                             source_table_name=None, source_count_sql=None,
+                             destination_table_name=None,
+                             destination_table_definition=None,
+                             destination_sql=None):
+        """Queries counting the rows of every day of the delta load window
+
+        Returns:
+            result(tuple): Source and destination count queries, and the
+                query selecting the first day of the window
+        """
+        if source_count_sql is not None:
+            raise ETLInputError('Window count checks need source sql or ' +
+                                'source table name')
+
+        destination_table_name = cls.destination_name(
+            source_sql, source_table_name, source_count_sql,
+            destination_table_name, destination_table_definition,
+            destination_sql)
+
+        def relation(table_name, sql, alias):
+            """Table or aliased subquery of the rows to count
+            """
+            if table_name is not None:
+                return table_name
+            return '(%s) %s' % (SqlStatement(sql).sql(), alias)
+
+        destination = relation(destination_table_name, destination_sql,
+                               'destination')
+        start_sql = 'SELECT %s' % window_start_sql(date_column, destination,
+                                                    window)
+        return (
+            cls.convert_to_window_count_sql(
+                relation(source_table_name, source_sql, 'source'),
+                date_column),
+            cls.convert_to_window_count_sql(destination, date_column),
+            SqlScript(start_sql).sql(),
+        )
+
+    @staticmethod
+    def destination_name(source_sql=None, source_table_name=None,
+                         source_count_sql=None, destination_table_name=None,
+                         destination_table_definition=None,
+                         destination_sql=None):
+        """Validate the rows to count and get the destination table name
+        """
+        if not exactly_one(destination_table_name, destination_sql,
+                           destination_table_definition):
+            raise ETLInputError(
+                'One of dest table name/schema or dest sql needed')
+
+        if not exactly_one(source_sql, source_table_name, source_count_sql):
+            raise ETLInputError('One of source table name or source sql ' +
+                                'or source count needed')
+
+        if destination_table_definition is not None:
+            with open(parse_path(destination_table_definition)) as f:
+                destination_table_string = f.read()
+            destination_table = Table(SqlScript(destination_table_string))
+            destination_table_name = destination_table.full_name
+        return destination_table_name
+
+    @staticmethod
+    def convert_to_window_count_sql(relation, date_column):
+        """Count the rows of every day from the first day of the window
+        """
+        sql = '''SELECT CAST({date_column} AS DATE) AS day
+                    ,COUNT(1) AS row_count
+                 FROM {relation}
+                 WHERE {date_column} >= {window_start}
+                 GROUP BY CAST({date_column} AS DATE)'''.format(
+            date_column=date_column, relation=relation,
+            window_start=WINDOW_START_PLACEHOLDER)
+        return SqlScript(sql).sql()
+
     @staticmethod
     def convert_destination_to_count_sql(destination_table=None,
                                          destination_sql=None):
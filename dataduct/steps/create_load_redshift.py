@@ -15,12 +15,16 @@ class CreateAndLoadStep(TransformStep):
     """
 
     def __init__(self, id, table_definition, input_node,
-                 script_arguments=None, **kwargs):
+                 script_arguments=None, manifest=False, compression=None,
+                 **kwargs):
         """Constructor for the CreateAndLoadStep class
 
         Args:
             table_definition(filepath): schema file for the table to be loaded
             script_arguments(list of str): list of arguments to the script
+            manifest(bool): Load all input files with a single manifest COPY
+            compression(str): Compression format of the input files,
+                defaults to the compression of the input nodes
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         with open(parse_path(table_definition)) as f:
@@ -36,6 +40,16 @@ class CreateAndLoadStep(TransformStep):
         if script_arguments is None:
             script_arguments = list()
 
+        if self.input_manifest(input_node):
+            script_arguments.append('--input_manifest')
+        elif manifest:
+            script_arguments.append('--manifest')
+
+        if compression is None:
+            compression = self.input_compression(input_node)
+        if compression is not None:
+            script_arguments.append('--compression=%s' % compression)
+
         script_arguments.extend([
             '--table_definition=%s' % table.sql().sql(),
             '--s3_input_paths'] + input_paths)
@@ -22,10 +22,13 @@ class CreateUpdateSqlStep(TransformStep):
                  analyze_table=True,
                  script_arguments=None,
                  non_transactional=False,
+                 maintenance=False,
                  **kwargs):
         """Constructor for the CreateUpdateStep class
 
         Args:
+            maintenance(bool): VACUUM and ANALYZE the table only if enough
+                of it changed, instead of always running ANALYZE
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         if not exactly_one(command, script):
@@ -47,7 +50,9 @@ class CreateUpdateSqlStep(TransformStep):
             '--sql=%s' % sql_script.s3_path.uri
         ]
 
-        if analyze_table:
+        if maintenance:
+            arguments.append('--maintenance')
+        elif analyze_table:
             arguments.append('--analyze')
 
         if non_transactional:
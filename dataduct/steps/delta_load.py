@@ -6,6 +6,23 @@ from ..utils.helpers import parse_path
 from .upsert import UpsertStep
 
 
+def window_start_sql(date_column, table_name, window=0):
+    """Expression of the first day reloaded by a delta load of the table
+
+    Args:
+        date_column(string): name of the date column of the table
+        table_name(string): table, or aliased subquery, holding the column
+        window(int): number of days before last loaded day to update
+    """
+    return """
+                COALESCE(
+                    (SELECT MAX({date_column}) FROM {table_name}),
+                    '1800-01-01'::DATE
+                ) - {window}""".format(date_column=date_column,
+                                       table_name=table_name,
+                                       window=window)
+
+
 class DeltaLoadStep(UpsertStep):
     """DeltaLoadStep Step class that creates the table if needed and loads data
     """
@@ -21,14 +38,10 @@ class DeltaLoadStep(UpsertStep):
         """
         dest = Table(SqlScript(filename=parse_path(destination)))
         delta_clause = """
-            WHERE {date_column} >=
-                COALESCE(
-                    (SELECT MAX({date_column}) FROM {destination}),
-                    '1800-01-01'::DATE
-                ) - {window}
+            WHERE {date_column} >= {window_start}
         """.format(date_column=date_column,
-                   destination=dest.full_name,
-                   window=window)
+                   window_start=window_start_sql(date_column, dest.full_name,
+                                                 window))
         super(DeltaLoadStep, self).__init__(destination=destination,
                                             filter_clause=delta_clause,
                                             **kwargs)
@@ -508,6 +508,68 @@ class ETLStep(object):
 
         return input_args
 
+    @staticmethod
+    def clean_output_command(splits=None, compression=None,
+                             column_count=None):
+        """Shell command cleaning the input staging dir into the output one
+
+        Args:
+            splits(int): Number of parts, defaults to the redshift slice count
+            compression(str): Compression format of the parts
+            column_count(int): Number of fields expected in every row
+        """
+        command = [const.CLEAN_FILES_COMMAND,
+                   '--input_dir=${INPUT1_STAGING_DIR}',
+                   '--output_dir=${OUTPUT1_STAGING_DIR}']
+        if splits is not None:
+            command.append('--splits=%d' % splits)
+        if compression is not None:
+            command.append('--compression=%s' % compression)
+        if column_count is not None:
+            command.append('--column_count=%d' % column_count)
+        return ' '.join(command)
+
+    @staticmethod
+    def input_compression(input_node):
+        """Compression format of the data in the input s3 nodes
+
+        Args:
+            input_node(S3Node / dict of S3Node): Input nodes of the step
+
+        Raises:
+            ETLInputError: If the input nodes are compressed differently
+        """
+        if isinstance(input_node, dict):
+            input_nodes = input_node.values()
+        else:
+            input_nodes = [input_node]
+
+        compressions = set(getattr(node, 'compression', None)
+                           for node in input_nodes)
+        if len(compressions) > 1:
+            raise ETLInputError('Input nodes have different compressions')
+        return compressions.pop() if compressions else None
+
+    @staticmethod
+    def input_manifest(input_node):
+        """Check if the input s3 node is a redshift manifest of the data
+
+        Args:
+            input_node(S3Node / dict of S3Node): Input nodes of the step
+
+        Raises:
+            ETLInputError: If a manifest is combined with other input nodes
+        """
+        if isinstance(input_node, dict):
+            input_nodes = input_node.values()
+        else:
+            input_nodes = [input_node]
+
+        manifests = [getattr(node, 'manifest', False) for node in input_nodes]
+        if any(manifests) and len(manifests) > 1:
+            raise ETLInputError('A manifest must be the only input node')
+        return any(manifests)
+
     @staticmethod
     def get_output_s3_path(output_path, is_directory=True):
         """Create an S3 Path variable based on the output path
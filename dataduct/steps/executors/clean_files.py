@@ -0,0 +1,278 @@
+"""Script that cleans extracted TSV files before they are loaded
+"""
+import argparse
+import os
+import sys
+
+from multiprocessing import Pool
+from multiprocessing import cpu_count
+
+from dataduct.database import SqlStatement
+from dataduct.database import Table
+from dataduct.steps.executors.split_files import PartWriter
+from dataduct.steps.executors.split_files import default_splits
+from dataduct.utils import constants as const
+
+BLOCK_SIZE = 8 * 1024 * 1024  # 8mb
+
+# AWS copy activities write nulls as an escaped \n
+DEFAULT_NULL_MARKER = '\\\\n'
+
+# Control characters other than tab, newline and carriage return
+CONTROL_CHARACTERS = ''.join(
+    chr(c) for c in range(32) if chr(c) not in '\t\n\r') + chr(127)
+
+MAX_REJECTED_ROWS_SHOWN = 10
+
+
+def replace_nulls(block, null_marker):
+    """Replace the fields that only contain the null marker with NULL
+
+    Note:
+        Plain string replaces are used as they are several times faster
+        than a regex. Adjacent null fields share a separator, so the
+        replaces are done twice.
+
+    Args:
+        block(str): Whole rows of TSV data
+        null_marker(str): Field value that should be loaded as NULL
+
+    Returns:
+        block(str): Rows with the null fields replaced
+    """
+    if null_marker not in block:
+        return block
+
+    # Pad the block so that the first and last fields also have separators
+    block = '\n' + block + '\n'
+    for _ in range(2):
+        for before in '\t\n':
+            for after in '\t\r\n':
+                block = block.replace(before + null_marker + after,
+                                      before + const.NULL_STR + after)
+    return block[1:-1]
+
+
+def field_count(row):
+    """Number of fields in a row, ignoring escaped tabs
+    """
+    if '\\\t' not in row:
+        return row.count('\t') + 1
+
+    # An escaped backslash does not escape the tab after it
+    row = row.replace('\\\\', '')
+    return row.count('\t') - row.count('\\\t') + 1
+
+
+def ends_with_escape(text):
+    """Check if the text ends with a backslash that is not escaped
+    """
+    return (len(text) - len(text.rstrip('\\'))) % 2 == 1
+
+
+def split_rows(block):
+    """Rows of a block with their newlines
+
+    Note:
+        Unlike splitlines, only newlines end a row and carriage returns
+        are data of the field. Newlines escaped with a backslash are data
+        of the field as well.
+    """
+    if '\r' not in block and '\\\n' not in block:
+        # The other line breaks are control characters stripped before
+        return block.splitlines(True)
+
+    lines = block.split('\n')
+    rows = list()
+    row = ''
+    for line in lines[:-1]:
+        row += line + '\n'
+        if not ends_with_escape(line):
+            rows.append(row)
+            row = ''
+
+    row += lines[-1]
+    if row:
+        rows.append(row)
+    return rows
+
+
+def clean_block(lines, null_marker, column_count=None):
+    """Normalize nulls and strip control characters from a block of rows
+
+    Args:
+        lines(list of str): Rows of the block
+        null_marker(str): Field value that should be loaded as NULL
+        column_count(int): Expected number of fields in every row
+
+    Returns:
+        result(tuple): The cleaned rows and the rejected rows
+    """
+    block = ''.join(lines).translate(None, CONTROL_CHARACTERS)
+    block = replace_nulls(block, null_marker)
+    rows = split_rows(block)
+
+    if column_count is None:
+        return rows, list()
+
+    # Without escaped tabs field_count is the number of tabs of every row
+    tab_count = column_count - 1
+    if '\\\t' not in block and \
+            all(row.count('\t') == tab_count for row in rows):
+        return rows, list()
+
+    valid, rejected = list(), list()
+    for row in rows:
+        if field_count(row) == column_count:
+            valid.append(row)
+        else:
+            rejected.append(row)
+    return valid, rejected
+
+
+def clean_files(input_paths, output_dir, part_indexes, compression=None,
+                null_marker=DEFAULT_NULL_MARKER, column_count=None):
+    """Clean the input files into parts in the output directory
+
+    Args:
+        input_paths(list of str): Paths of the TSV files to clean
+        output_dir(str): Directory for the part files
+        part_indexes(list of int): Indexes used to name the parts
+        compression(str): Compression format of the parts
+        null_marker(str): Field value that should be loaded as NULL
+        column_count(int): Expected number of fields in every row
+
+    Returns:
+        result(tuple): Number of rows written, number of rejected rows and
+            a sample of the rejected rows
+    """
+    writer = PartWriter(output_dir, part_indexes, compression)
+    rejected_count = 0
+    rejected_sample = list()
+    try:
+        for input_path in input_paths:
+            with open(input_path, 'rb') as input_file:
+                while True:
+                    # readlines with a size hint only returns whole lines
+                    lines = input_file.readlines(BLOCK_SIZE)
+                    if not lines:
+                        break
+                    # Keep a row with escaped newlines in a single block
+                    while lines[-1].endswith('\n') and \
+                            ends_with_escape(lines[-1][:-1]):
+                        line = input_file.readline()
+                        if not line:
+                            break
+                        lines.append(line)
+                    rows, rejected_rows = clean_block(
+                        lines, null_marker, column_count)
+                    if rows:
+                        writer.write(rows)
+                    rejected_count += len(rejected_rows)
+                    rejected_sample.extend(rejected_rows[
+                        :MAX_REJECTED_ROWS_SHOWN - len(rejected_sample)])
+    finally:
+        writer.close()
+
+    return writer.row_count, rejected_count, rejected_sample
+
+
+def _clean_files_worker(arguments):
+    """Process pool entry point for clean_files
+    """
+    return clean_files(*arguments)
+
+
+def group_files(input_paths, count):
+    """Split the files into groups of roughly equal total size
+    """
+    groups = [list() for _ in range(count)]
+    sizes = [0] * count
+    for path in sorted(input_paths, key=os.path.getsize, reverse=True):
+        index = sizes.index(min(sizes))
+        groups[index].append(path)
+        sizes[index] += os.path.getsize(path)
+    return [sorted(group) for group in groups if group]
+
+
+def clean_directory(input_paths, output_dir, splits, workers,
+                    compression=None, null_marker=DEFAULT_NULL_MARKER,
+                    column_count=None):
+    """Clean the input files with a process per group of files
+
+    Note:
+        Every process writes its own parts, so the output has the larger of
+        splits and the number of processes files.
+
+    Returns:
+        result(tuple): Number of rows written, number of rejected rows and
+            a sample of the rejected rows
+    """
+    groups = group_files(input_paths, workers) or [list()]
+    part_count = max(splits, len(groups))
+    arguments = [
+        (group, output_dir, range(index, part_count, len(groups)),
+         compression, null_marker, column_count)
+        for index, group in enumerate(groups)]
+
+    if len(arguments) == 1:
+        results = [_clean_files_worker(arguments[0])]
+    else:
+        pool = Pool(len(arguments))
+        try:
+            results = pool.map(_clean_files_worker, arguments)
+        finally:
+            pool.close()
+            pool.join()
+
+    row_count = sum(r[0] for r in results)
+    rejected_count = sum(r[1] for r in results)
+    rejected_sample = [row for r in results for row in r[2]]
+    return row_count, rejected_count, rejected_sample
+
+
+def clean_files_runner():
+    """Clean the files of the input directory into the output directory
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input_dir', dest='input_dir', required=True)
+    parser.add_argument('--output_dir', dest='output_dir', required=True)
+    parser.add_argument('--splits', dest='splits', type=int,
+                        default=default_splits())
+    parser.add_argument('--workers', dest='workers', type=int,
+                        default=cpu_count())
+    parser.add_argument('--compression', dest='compression', default=None,
+                        choices=const.COMPRESSION_FORMATS)
+    parser.add_argument('--null_marker', dest='null_marker',
+                        default=DEFAULT_NULL_MARKER)
+    parser.add_argument('--table_definition', dest='table_definition',
+                        default=None)
+    parser.add_argument('--column_count', dest='column_count', type=int,
+                        default=None)
+    parser.add_argument('--max_error', dest='max_error', type=int, default=0)
+    args = parser.parse_args()
+
+    column_count = args.column_count
+    if args.table_definition is not None:
+        table = Table(SqlStatement(args.table_definition))
+        column_count = len(table.columns())
+
+    input_paths = [os.path.join(args.input_dir, f)
+                   for f in os.listdir(args.input_dir)]
+    input_paths = [p for p in input_paths
+                   if os.path.isfile(p) and os.path.getsize(p) > 0]
+
+    row_count, rejected_count, rejected_sample = clean_directory(
+        input_paths, args.output_dir, args.splits, args.workers,
+        args.compression, args.null_marker, column_count)
+
+    for row in rejected_sample[:MAX_REJECTED_ROWS_SHOWN]:
+        sys.stderr.write('Rejected row with %d fields: %s' % (
+            field_count(row), row))
+
+    print 'Cleaned %d rows into %s, rejected %d rows' % (
+        row_count, args.output_dir, rejected_count)
+
+    if rejected_count > args.max_error:
+        raise Exception('%d rows do not have %d columns' % (
+            rejected_count, column_count))
@@ -6,51 +6,52 @@ import argparse
 import collections
 import re
 import pandas
-import pandas.io.sql as pdsql
-from dataduct.data_access import redshift_connection
-from dataduct.data_access import rds_connection
 from dataduct.qa import ColumnCheck
+from dataduct.qa import HashCheck
+from dataduct.qa.fetch import ConnectionPool
+from dataduct.qa.fetch import fetch_all
+from dataduct.qa.fetch import REDSHIFT_HOST
+from dataduct.qa.hash_check import BUCKET_PLACEHOLDER
+from dataduct.utils import constants as const
 
 pandas.options.display.max_colwidth = 1000
 pandas.options.display.max_rows = 1000
 
 
-def get_source_data(sql, hostname, sample_size):
+def get_source_data(sql, hostname, sample_size, pool):
     """Gets the DataFrame containing all the rows of the table
     The DataFrame will be indexed by the table's primary key(s)
 
     Args:
         sql(str): The table definition representing the table to query
-        connection(Connection): A connection to the database
+        hostname(str): Host alias of the source database
+        pool(ConnectionPool): Pool of the connections to the databases
 
     Returns:
         DataFrame: The rows of the table
     """
-    connection = rds_connection(hostname)
     query = re.sub(
         r'(?i)LIMIT_PLACEHOLDER',
         str(sample_size),
         sql,
     )
 
-    data = pdsql.read_sql(query, connection)
-    connection.close()
+    data = fetch_all(pool, [(hostname, query)])[0]
     # All columns apart from last are PK columns
     return data.set_index(list(data.columns[:-1]))
 
 
-def get_destination_data(sql, primary_keys):
+def get_destination_data(sql, primary_keys, pool):
     """Gets the DataFrame containing all the rows of the table
     The DataFrame will be indexed by the table's primary key(s)
 
     Args:
         sql(str): The table definition representing the table to query
+        pool(ConnectionPool): Pool of the connections to the databases
 
     Returns:
         DataFrame: The rows of the table
     """
-    connection = redshift_connection()
-
     # Make primary_keys always a list of tuples
     if isinstance(primary_keys[0], basestring):
         primary_keys = [(pk) for pk in primary_keys]
@@ -79,12 +80,40 @@ def get_destination_data(sql, primary_keys):
 
     print query
 
-    data = pdsql.read_sql(query, connection)
-    connection.close()
+    data = fetch_all(pool, [(REDSHIFT_HOST, query)])[0]
     # All columns apart from last are PK columns
     return data.set_index(list(data.columns[:-1]))
 
 
+def hash_column_check(args, pool):
+    """Compare the bucket checksums and drill down into mismatching buckets
+    """
+    # The source and the destination are queried at the same time
+    source_buckets, destination_buckets = fetch_all(pool, [
+        (args.source_host, args.source_sql),
+        (REDSHIFT_HOST, args.destination_sql)])
+    check = HashCheck(source_buckets.set_index('bucket'),
+                      destination_buckets.set_index('bucket'),
+                      name=args.test_name,
+                      sns_topic_arn=args.sns_topic_arn,
+                      tolerance=args.tolerance)
+
+    buckets = check.mismatched_buckets[:args.drill_down_buckets]
+    if buckets:
+        bucket_set = '(%s)' % ','.join(str(int(b)) for b in buckets)
+        source_rows, destination_rows = fetch_all(pool, [
+            (args.source_host,
+             args.source_rows_sql.replace(BUCKET_PLACEHOLDER, bucket_set)),
+            (REDSHIFT_HOST,
+             args.destination_rows_sql.replace(BUCKET_PLACEHOLDER,
+                                               bucket_set))])
+        check.drill_down(buckets, source_rows.set_index('primary_key'),
+                         destination_rows.set_index('primary_key'))
+
+    check.publish(args.log_to_s3, table=args.table,
+                  path_suffix=args.path_suffix)
+
+
 def column_check():
     """Args (taken in through argparse):
         source_sql: SQL script of the source data
@@ -96,7 +125,17 @@ def column_check():
     parser.add_argument('--source_host', dest='source_host', required=True)
     parser.add_argument('--destination_sql', dest='destination_sql',
                         required=True)
-    parser.add_argument('--sample_size', dest='sample_size', required=True)
+    parser.add_argument('--sample_size', dest='sample_size', default=None)
+    parser.add_argument('--mode', dest='mode',
+                        default=const.COLUMN_CHECK_SAMPLE,
+                        choices=const.COLUMN_CHECK_MODES)
+    parser.add_argument('--table', dest='table', default=None)
+    parser.add_argument('--source_rows_sql', dest='source_rows_sql',
+                        default=None)
+    parser.add_argument('--destination_rows_sql',
+                        dest='destination_rows_sql', default=None)
+    parser.add_argument('--drill_down_buckets', dest='drill_down_buckets',
+                        type=int, default=0)
     parser.add_argument('--tolerance', type=float, dest='tolerance',
                         default=1.0)
     parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
@@ -107,14 +146,18 @@ def column_check():
 
     args = parser.parse_args()
 
-    # Open up a connection and read the source and destination tables
-    source_data = get_source_data(args.source_sql, args.source_host,
-                                   args.sample_size)
-    print source_data.to_string().encode('utf-8')
+    with ConnectionPool() as pool:
+        if args.mode == const.COLUMN_CHECK_HASH:
+            return hash_column_check(args, pool)
+
+        # The destination query needs the keys sampled from the source
+        source_data = get_source_data(args.source_sql, args.source_host,
+                                      args.sample_size, pool)
+        print source_data.to_string().encode('utf-8')
 
-    destination_data = get_destination_data(args.destination_sql,
-                                             list(source_data.index))
-    print destination_data.to_string().encode('utf-8')
+        destination_data = get_destination_data(args.destination_sql,
+                                                list(source_data.index), pool)
+        print destination_data.to_string().encode('utf-8')
 
     check = ColumnCheck(source_data, destination_data,
                         name=args.test_name,
@@ -3,51 +3,45 @@ number of rows in the destination table
 """
 
 import argparse
-import pandas.io.sql as pdsql
-from dataduct.data_access import redshift_connection
-from dataduct.data_access import rds_connection
 from dataduct.qa import CountCheck
+from dataduct.qa import WindowCountCheck
+from dataduct.qa.count_check import WINDOW_START_PLACEHOLDER
+from dataduct.qa.fetch import ConnectionPool
+from dataduct.qa.fetch import fetch_all
+from dataduct.qa.fetch import REDSHIFT_HOST
 
 
-def _get_source_data(sql, hostname):
-    """Gets the DataFrame containing all the rows of the table
-    The DataFrame will be indexed by the table's primary key(s)
-
-    Args:
-        sql(str): The table definition representing the table to query
-        connection(Connection): A connection to the database
-
-    Returns:
-        DataFrame: The rows of the table
+def window_count_check(args):
+    """Compare the counts of every day from the first day of the window
     """
-    connection = rds_connection(hostname)
-    data = pdsql.read_sql(sql, connection)
-    connection.close()
-    return data.iloc[0][0]
-
-
-def _get_destination_data(sql):
-    """Gets the DataFrame containing all the rows of the table
-    The DataFrame will be indexed by the table's primary key(s)
-
-    Args:
-        sql(str): The table definition representing the table to query
-        connection(Connection): A connection to the database
-
-    Returns:
-        DataFrame: The rows of the table
-    """
-    connection = redshift_connection()
-    data = pdsql.read_sql(sql, connection)
-    connection.close()
-    # All columns apart from last are PK columns
-    return data.iloc[0][0]
+    with ConnectionPool() as pool:
+        window_start = fetch_all(
+            pool, [(REDSHIFT_HOST, args.window_start_sql)])[0].iloc[0][0]
+        window_start = "'%s'" % str(window_start)[:10]
+
+        source_sql = args.source_sql.replace(WINDOW_START_PLACEHOLDER,
+                                             window_start)
+        destination_sql = args.destination_sql.replace(
+            WINDOW_START_PLACEHOLDER, window_start)
+        source_data, destination_data = fetch_all(pool, [
+            (args.source_host, source_sql),
+            (REDSHIFT_HOST, destination_sql)])
+
+    check = WindowCountCheck(source_data, destination_data,
+                             name=args.test_name,
+                             sns_topic_arn=args.sns_topic_arn,
+                             tolerance=args.tolerance)
+
+    check.publish(args.log_to_s3, dest_sql=destination_sql,
+                  path_suffix=args.path_suffix)
 
 
 def count_check():
     """Args (taken in through argparse):
         source_sql: SQL script of the source data
         destination_sql: SQL script of the destination data
+        window_start_sql: SQL script of the first day of the window of
+            the per day counts
     """
     parser = argparse.ArgumentParser()
 
@@ -55,6 +49,8 @@ def count_check():
     parser.add_argument('--source_host', dest='source_host', required=True)
     parser.add_argument('--destination_sql', dest='destination_sql',
                         required=True)
+    parser.add_argument('--window_start_sql', dest='window_start_sql',
+                        default=None)
     parser.add_argument('--tolerance', type=float, dest='tolerance',
                         default=1.0)
     parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
@@ -65,8 +61,16 @@ def count_check():
 
     args = parser.parse_args()
 
-    source_count = _get_source_data(args.source_sql, args.source_host)
-    destination_count = _get_destination_data(args.destination_sql)
+    if args.window_start_sql is not None:
+        return window_count_check(args)
+
+    # Both counts are fetched at the same time
+    with ConnectionPool() as pool:
+        source_data, destination_data = fetch_all(pool, [
+            (args.source_host, args.source_sql),
+            (REDSHIFT_HOST, args.destination_sql)])
+    source_count = source_data.iloc[0][0]
+    destination_count = destination_data.iloc[0][0]
 
     check = CountCheck(source_count, destination_count,
                        name=args.test_name,
@@ -2,25 +2,43 @@
 """
 
 import argparse
-import pandas.io.sql as pdsql
+import json
 import psycopg2.extras
 
+from dataduct.config import Config
 from dataduct.config import get_aws_credentials
 from dataduct.data_access import redshift_connection
+from dataduct.database import Catalog
 from dataduct.database import SqlStatement
 from dataduct.database import Table
+from dataduct.s3 import S3File
+from dataduct.s3 import S3Path
+from dataduct.s3.utils import list_s3_files
+from dataduct.utils import constants as const
 from dataduct.utils.helpers import stringify_credentials
 from sys import stderr
 
+config = Config()
+
+COPY_UPDATE_OPTIONS = ['ON', 'OFF']
+
 
 def load_redshift(table, input_paths, max_error=0,
                   replace_invalid_char=None, no_escape=False, gzip=False,
-                  command_options=None):
+                  command_options=None, manifest_path=None,
+                  compupdate='OFF', statupdate='OFF', compression=None):
     """Load redshift table with the data in the input s3 paths
+
+    Note:
+        With a manifest path a single COPY loads all the files listed in the
+        manifest instead of one COPY per input path.
     """
     table_name = table.full_name
     print 'Loading data into %s' % table_name
 
+    if gzip:
+        compression = const.GZIP
+
     # Credentials string
     aws_key, aws_secret, token = get_aws_credentials()
     creds = stringify_credentials(aws_key, aws_secret, token)
@@ -36,28 +54,67 @@ def load_redshift(table, input_paths, max_error=0,
 
     template = (
         "COPY {table} FROM '{path}' WITH CREDENTIALS AS '{creds}' "
-        "COMPUPDATE OFF STATUPDATE OFF {options};"
+        "COMPUPDATE {compupdate} STATUPDATE {statupdate} {options};"
     )
 
-    for input_path in input_paths:
-        if not command_options:
-            command_options = (
-                "DELIMITER '\t' {escape} {gzip} NULL AS 'NULL' "
-                "TRUNCATECOLUMNS {max_error} {invalid_char_str}"
-            ).format(escape='ESCAPE' if not no_escape else '',
-                     gzip='GZIP' if gzip else '',
-                     max_error=error_string,
-                     invalid_char_str=invalid_char_str)
+    if not command_options:
+        command_options = (
+            "DELIMITER '\t' {escape} {compression} NULL AS 'NULL' "
+            "TRUNCATECOLUMNS {max_error} {invalid_char_str}"
+        ).format(escape='ESCAPE' if not no_escape else '',
+                 compression=compression.upper() if compression else '',
+                 max_error=error_string,
+                 invalid_char_str=invalid_char_str)
+
+    if manifest_path is not None:
+        copy_paths = [manifest_path]
+        command_options = 'MANIFEST ' + command_options
+    else:
+        copy_paths = input_paths
 
+    for copy_path in copy_paths:
         statement = template.format(table=table_name,
-                                    path=input_path,
+                                    path=copy_path,
                                     creds=creds,
+                                    compupdate=compupdate,
+                                    statupdate=statupdate,
                                     options=command_options)
         query.append(statement)
 
     return ' '.join(query)
 
 
+def create_manifest(input_paths, manifest_path, slice_count=None):
+    """Write a COPY manifest listing all the files under the input paths
+
+    Args:
+        input_paths(list of str): S3 uris of the files or directories to load
+        manifest_path(str): S3 uri where the manifest is written
+        slice_count(int): Number of slices in the cluster, used to warn
+            about file counts that leave slices idle during the COPY
+    """
+    keys = list()
+    for input_path in input_paths:
+        keys.extend(list_s3_files(S3Path(uri=input_path, is_directory=True)))
+
+    if not keys:
+        raise Exception('No files to load in %s' % ', '.join(input_paths))
+
+    if slice_count and len(keys) % slice_count != 0:
+        stderr.write(
+            'Loading %d files on %d slices, split the input into a multiple '
+            'of the slice count to load on all slices in parallel\n' % (
+                len(keys), slice_count))
+
+    manifest = {'entries': [
+        {'url': 's3://%s/%s' % (key.bucket.name, key.name),
+         'mandatory': True} for key in keys]}
+
+    S3File(text=json.dumps(manifest, indent=4),
+           s3_path=S3Path(uri=manifest_path)).upload_to_s3()
+    print 'Wrote manifest with %d files to %s' % (len(keys), manifest_path)
+
+
 def create_error_retrieval_query(input_paths):
     condition = ("filename Like '%{input_path}%'".format(input_path=input_path)
                  for input_path in input_paths)
@@ -67,22 +124,6 @@ def create_error_retrieval_query(input_paths):
     return query
 
 
-def get_redshift_table_colunms(table, cursor):
-    table_name = table.table_name
-    schema_name = table.schema_name
-
-    set_search_path_query = "SET search_path TO {schema}".format(
-        schema=schema_name)
-    cursor.execute(set_search_path_query)
-    query = ("SELECT def.column FROM pg_table_def def "
-             "WHERE schemaname = '{schema_name}' "
-             "AND tablename = '{table_name}'").format(schema_name=schema_name,
-                                                      table_name=table_name)
-    cursor.execute(query)
-    columns = sorted([row["column"] for row in cursor.fetchall()])
-    return columns
-
-
 def create_load_redshift_runner():
     parser = argparse.ArgumentParser()
     parser.add_argument('--table_definition', dest='table_definition',
@@ -91,29 +132,43 @@ def create_load_redshift_runner():
     parser.add_argument('--replace_invalid_char', dest='replace_invalid_char',
                         default=None)
     parser.add_argument('--no_escape', action='store_true', default=False)
-    parser.add_argument('--gzip', action='store_true', default=False)
+    parser.add_argument('--compression', dest='compression', default=None,
+                        choices=const.COMPRESSION_FORMATS)
+    parser.add_argument('--gzip', dest='compression', action='store_const',
+                        const=const.GZIP)
     parser.add_argument('--command_options', dest='command_options',
                         default=None)
     parser.add_argument('--s3_input_paths', dest='input_paths', nargs='+')
     parser.add_argument('--force_drop_table', dest='force_drop_table',
                         default=False)
+    parser.add_argument('--manifest', action='store_true', default=False)
+    parser.add_argument('--manifest_path', dest='manifest_path', default=None)
+    parser.add_argument('--input_manifest', action='store_true',
+                        default=False)
+    parser.add_argument('--slice_count', dest='slice_count', type=int,
+                        default=config.redshift.get('SLICE_COUNT', None))
+    parser.add_argument('--compupdate', dest='compupdate', default='OFF',
+                        choices=COPY_UPDATE_OPTIONS)
+    parser.add_argument('--statupdate', dest='statupdate', default='OFF',
+                        choices=COPY_UPDATE_OPTIONS)
     script_arguments = parser.parse_args()
     print script_arguments
 
     table = Table(SqlStatement(script_arguments.table_definition))
     connection = redshift_connection(
         cursor_factory=psycopg2.extras.RealDictCursor)
-    table_not_exists = pdsql.read_sql(table.check_not_exists_script().sql(),
-                                      connection).loc[0][0]
+    catalog = Catalog(connection)
+    redshift_columns = catalog.columns(table.full_name)
 
     cursor = connection.cursor()
     # Create table in redshift, this is safe due to the if exists condition
-    if table_not_exists:
+    if redshift_columns is None:
         cursor.execute(table.create_script().sql())
     else:
         columns = sorted(
             [column.column_name.lower() for column in table.columns()])
-        redshift_table_columns = get_redshift_table_colunms(table, cursor)
+        redshift_table_columns = sorted(
+            [column.name for column in redshift_columns])
 
         if columns != redshift_table_columns:
             error_string = (
@@ -125,11 +180,25 @@ def create_load_redshift_runner():
                     redshift_table_columns=", ".join(redshift_table_columns))
             raise Exception(error_string)
 
+    manifest_path = None
+    if script_arguments.input_manifest:
+        # The input is already a manifest, e.g. written by an UNLOAD
+        manifest_path = script_arguments.input_paths[0]
+    elif script_arguments.manifest:
+        manifest_path = script_arguments.manifest_path
+        if manifest_path is None:
+            manifest_path = '%s.manifest' % \
+                script_arguments.input_paths[0].rstrip('/')
+        create_manifest(script_arguments.input_paths, manifest_path,
+                        script_arguments.slice_count)
+
     # Load data into redshift
     load_query = load_redshift(
         table, script_arguments.input_paths, script_arguments.max_error,
         script_arguments.replace_invalid_char, script_arguments.no_escape,
-        script_arguments.gzip, script_arguments.command_options)
+        False, script_arguments.command_options, manifest_path,
+        script_arguments.compupdate, script_arguments.statupdate,
+        script_arguments.compression)
     try:
         cursor.execute(load_query)
         cursor.execute('COMMIT')
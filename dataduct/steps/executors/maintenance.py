@@ -0,0 +1,27 @@
+"""Script that runs the VACUUM and ANALYZE commands queued by the loads
+"""
+import argparse
+
+from dataduct.data_access import redshift_connection
+from dataduct.database import TableMaintenance
+
+
+def maintenance_runner():
+    """Run the queued maintenance, meant for an off-peak schedule
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tables', dest='tables', nargs='+', default=None)
+    args = parser.parse_args()
+
+    connection = redshift_connection()
+    # VACUUM can not run inside a transaction
+    connection.autocommit = True
+    try:
+        cursor = connection.cursor()
+        commands = TableMaintenance.from_config().run_queue(cursor,
+                                                            args.tables)
+        cursor.close()
+    finally:
+        connection.close()
+
+    print 'Ran %d maintenance commands' % len(commands)
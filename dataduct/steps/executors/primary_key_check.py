@@ -2,30 +2,74 @@
 """
 
 import argparse
-import pandas.io.sql as pdsql
-from dataduct.data_access import redshift_connection
 from dataduct.database import SqlScript
 from dataduct.database import Table
 from dataduct.qa import PrimaryKeyCheck
+from dataduct.qa.cache import check_definition
+from dataduct.qa.cache import ResultCache
+from dataduct.qa.fetch import ConnectionPool
+from dataduct.qa.fetch import fetch_all
+from dataduct.qa.fetch import REDSHIFT_HOST
+from dataduct.qa.primary_key_check import approximate_duplicate_count
+from dataduct.utils import constants as const
 
 
 def primary_key_check():
     parser = argparse.ArgumentParser()
 
     parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--mode', dest='mode', default=const.PK_CHECK_COUNT,
+                        choices=const.PK_CHECK_MODES)
+    parser.add_argument('--sample_size', type=int, dest='sample_size',
+                        default=0)
     parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
     parser.add_argument('--test_name', dest='test_name',
                         default="Check Primary Key")
     parser.add_argument('--log_to_s3', action='store_true', default=False)
     parser.add_argument('--path_suffix', dest='path_suffix', default=None)
+    parser.add_argument('--cache', action='store_true', default=False)
 
     args = parser.parse_args()
 
-    connection = redshift_connection()
     table = Table(SqlScript(args.table))
-    result = pdsql.read_sql(table.select_duplicates_script().sql(), connection)
-    check = PrimaryKeyCheck(len(result), name=args.test_name,
-                            sns_topic_arn=args.sns_topic_arn)
+
+    def run_check(pool):
+        """Count the duplicate keys of the table
+        """
+        # Only the count and a bounded sample of the duplicate keys are
+        # fetched
+        if args.mode == const.PK_CHECK_APPROXIMATE:
+            queries = [table.approximate_duplicate_count_script().sql()]
+        else:
+            queries = [table.duplicate_count_script().sql()]
+        if args.sample_size > 0:
+            queries.append(
+                table.duplicate_sample_script(args.sample_size).sql())
+
+        result = fetch_all(pool, [(REDSHIFT_HOST, sql) for sql in queries])
+
+        approximate = args.mode == const.PK_CHECK_APPROXIMATE
+        if approximate:
+            row_count, key_count = result[0].iloc[0]
+            duplicate_count = approximate_duplicate_count(row_count,
+                                                          key_count)
+        else:
+            duplicate_count = result[0].iloc[0][0]
+        sample = result[1] if args.sample_size > 0 else None
+
+        return PrimaryKeyCheck(duplicate_count, sample=sample,
+                               approximate=approximate,
+                               name=args.test_name,
+                               sns_topic_arn=args.sns_topic_arn)
+
+    with ConnectionPool() as pool:
+        if args.cache:
+            check = ResultCache(pool).run(
+                table.full_name, check_definition(args),
+                lambda: run_check(pool), name=args.test_name,
+                sns_topic_arn=args.sns_topic_arn)
+        else:
+            check = run_check(pool)
+
     check.publish(args.log_to_s3, table=table.full_name,
                   path_suffix=args.path_suffix)
-    connection.close()
@@ -0,0 +1,84 @@
+"""Script that compares the column statistics of a table with the profile of
+the previous run
+"""
+
+import argparse
+import json
+from dataduct.database import SqlScript
+from dataduct.database import Table
+from dataduct.qa import ProfileCheck
+from dataduct.qa.cache import check_definition
+from dataduct.qa.cache import ResultCache
+from dataduct.qa.fetch import ConnectionPool
+from dataduct.qa.fetch import fetch_all
+from dataduct.qa.fetch import REDSHIFT_HOST
+from dataduct.qa.profile_check import profile_s3_path
+from dataduct.qa.profile_check import profile_sql
+from dataduct.qa.profile_check import read_profile
+from dataduct.s3 import S3File
+from dataduct.s3.utils import get_s3_bucket
+
+
+def _previous_profile(s3_path):
+    """Profile stored by the previous run, None on the first run
+    """
+    key = get_s3_bucket(s3_path.bucket).get_key(s3_path.key)
+    if key is None:
+        return None
+    return json.loads(key.get_contents_as_string())
+
+
+def profile_check():
+    """Args (taken in through argparse):
+        table: SQL definition of the table to profile
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--null_rate_tolerance', type=float,
+                        dest='null_rate_tolerance', default=1.0)
+    parser.add_argument('--distinct_tolerance', type=float,
+                        dest='distinct_tolerance', default=10.0)
+    parser.add_argument('--length_tolerance', type=float,
+                        dest='length_tolerance', default=10.0)
+    parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
+    parser.add_argument('--test_name', dest='test_name',
+                        default='Check Profile')
+    parser.add_argument('--log_to_s3', action='store_true', default=False)
+    parser.add_argument('--path_suffix', dest='path_suffix', default=None)
+    parser.add_argument('--cache', action='store_true', default=False)
+
+    args = parser.parse_args()
+
+    table = Table(SqlScript(args.table))
+    s3_path = profile_s3_path(table.full_name, args.path_suffix)
+
+    def run_check(pool):
+        """Profile the table and compare it with the previous profile
+        """
+        data = fetch_all(pool, [(REDSHIFT_HOST, profile_sql(table))])[0]
+        check = ProfileCheck(read_profile(table, list(data.iloc[0])),
+                             _previous_profile(s3_path),
+                             null_rate_tolerance=args.null_rate_tolerance,
+                             distinct_tolerance=args.distinct_tolerance,
+                             length_tolerance=args.length_tolerance,
+                             name=args.test_name,
+                             sns_topic_arn=args.sns_topic_arn)
+
+        # Regressions are compared with the last good profile until fixed
+        if check.success:
+            S3File(text=json.dumps(check.profile, sort_keys=True),
+                   s3_path=s3_path).upload_to_s3()
+        return check
+
+    with ConnectionPool() as pool:
+        if args.cache:
+            check = ResultCache(pool).run(
+                table.full_name, check_definition(args),
+                lambda: run_check(pool), name=args.test_name,
+                sns_topic_arn=args.sns_topic_arn)
+        else:
+            check = run_check(pool)
+
+    check.publish(args.log_to_s3, table=table.full_name,
+                  path_suffix=args.path_suffix)
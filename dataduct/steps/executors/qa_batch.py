@@ -0,0 +1,37 @@
+"""Script that runs a batch of count and primary key checks
+"""
+
+import argparse
+import json
+from dataduct.qa.batch import publish_batch
+from dataduct.qa.batch import run_batch
+from dataduct.qa.fetch import ConnectionPool
+
+
+def qa_batch():
+    """Args (taken in through argparse):
+        checks: JSON list of the checks to run
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--checks', dest='checks', type=json.loads,
+                        required=True)
+    parser.add_argument('--workers', type=int, dest='workers', default=4)
+    parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
+    parser.add_argument('--test_name', dest='test_name',
+                        default='Check Batch')
+    parser.add_argument('--log_to_s3', action='store_true', default=False)
+    parser.add_argument('--path_suffix', dest='path_suffix', default=None)
+
+    args = parser.parse_args()
+
+    for check in args.checks:
+        check['name'] = '%s.%s' % (args.test_name, check['name'])
+
+    # Queries of a host run in parallel on up to workers connections
+    with ConnectionPool(max_connections=args.workers) as pool:
+        checks = run_batch(pool, args.checks,
+                           sns_topic_arn=args.sns_topic_arn,
+                           workers=args.workers)
+
+    publish_batch(checks, args.log_to_s3, path_suffix=args.path_suffix)
@@ -0,0 +1,190 @@
+"""Script that reconciles every row of the source and destination tables
+"""
+
+import argparse
+import os
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+
+from dataduct.config import Config
+from dataduct.data_access import rds_connection
+from dataduct.data_access import redshift_connection
+from dataduct.qa import ReconcileCheck
+from dataduct.qa.reconcile import DiffSummary
+from dataduct.qa.reconcile import KEY_RANGE_PLACEHOLDER
+from dataduct.qa.reconcile import reconcile
+from dataduct.s3 import S3Path
+from dataduct.s3 import S3StreamWriter
+from dataduct.steps.executors.stream_extract import compressor
+from dataduct.steps.executors.stream_extract import FETCH_SIZE
+from dataduct.steps.executors.stream_extract import format_rows
+from dataduct.steps.executors.stream_extract import key_ranges
+from dataduct.steps.executors.stream_extract import part_path
+from dataduct.steps.executors.stream_extract import NET_WRITE_TIMEOUT
+from dataduct.utils import constants as const
+from dataduct.utils.helpers import get_s3_base_path
+
+config = Config()
+
+RECONCILE_PATH = 'reconcile'
+
+
+def cursor_rows(cursor):
+    """Rows of an executed query, fetched in batches
+    """
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield row
+
+
+def key_bounds(source_host, source_sql, destination_sql):
+    """Smallest and largest key of both sides
+    """
+    bounds = list()
+    connection = rds_connection(source_host)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(source_sql)
+        bounds.extend(cursor.fetchall()[0])
+    finally:
+        connection.close()
+
+    connection = redshift_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(destination_sql)
+        bounds.extend(cursor.fetchall()[0])
+    finally:
+        connection.close()
+
+    bounds = [bound for bound in bounds if bound is not None]
+    if not bounds:
+        return None, None
+    return min(bounds), max(bounds)
+
+
+def key_range_clause(key, bounds):
+    """Filter of the rows of a chunk, no filter for a single chunk
+    """
+    if bounds is None:
+        return ''
+    return 'WHERE %s BETWEEN %d AND %d' % (key, bounds[0], bounds[1])
+
+
+def reconcile_chunk(args, index, bounds, output_dir):
+    """Diff the rows of a key range and stream the differences to S3
+
+    Returns:
+        summary(DiffSummary): Counts and sample of the differences
+    """
+    source_sql = args.source_sql.replace(
+        KEY_RANGE_PLACEHOLDER, key_range_clause(args.source_key, bounds))
+    destination_sql = args.destination_sql.replace(
+        KEY_RANGE_PLACEHOLDER, key_range_clause(args.destination_key, bounds))
+
+    # rds_connection uses an unbuffered SSCursor and a named cursor is
+    # server side in redshift, neither side is loaded into memory
+    source_connection = rds_connection(args.source_host)
+    destination_connection = redshift_connection(autocommit=False)
+    try:
+        source_cursor = source_connection.cursor()
+        source_cursor.execute('SET SESSION net_write_timeout = %d' %
+                              NET_WRITE_TIMEOUT)
+        source_cursor.execute(source_sql)
+
+        destination_cursor = destination_connection.cursor(
+            name='dataduct_reconcile_%d' % index)
+        destination_cursor.itersize = FETCH_SIZE
+        destination_cursor.execute(destination_sql)
+
+        stream_compressor = compressor(const.GZIP)
+        with S3StreamWriter(part_path(output_dir, index,
+                                      const.GZIP)) as writer:
+            def output(rows):
+                """Write a batch of differences as gzipped TSV
+                """
+                writer.write(stream_compressor.compress(format_rows(rows)))
+
+            summary = reconcile(cursor_rows(source_cursor),
+                                cursor_rows(destination_cursor),
+                                args.key_length, output, args.sample_size)
+            writer.write(stream_compressor.flush())
+    finally:
+        source_connection.close()
+        destination_connection.close()
+    return summary
+
+
+def reconcile_check():
+    """Args (taken in through argparse):
+        source_sql: SQL script of the source rows ordered by the key
+        destination_sql: SQL script of the destination rows ordered by the
+            key
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--source_host', dest='source_host', required=True)
+    parser.add_argument('--source_sql', dest='source_sql', required=True)
+    parser.add_argument('--destination_sql', dest='destination_sql',
+                        required=True)
+    parser.add_argument('--key_length', type=int, dest='key_length',
+                        required=True)
+    parser.add_argument('--source_key', dest='source_key', required=True)
+    parser.add_argument('--destination_key', dest='destination_key',
+                        required=True)
+    parser.add_argument('--source_bounds_sql', dest='source_bounds_sql',
+                        required=True)
+    parser.add_argument('--destination_bounds_sql',
+                        dest='destination_bounds_sql', required=True)
+    parser.add_argument('--chunks', type=int, dest='chunks', default=1)
+    parser.add_argument('--workers', type=int, dest='workers', default=None)
+    parser.add_argument('--sample_size', type=int, dest='sample_size',
+                        default=100)
+    parser.add_argument('--tolerance', type=float, dest='tolerance',
+                        default=0.0)
+    parser.add_argument('--sns_topic_arn', dest='sns_topic_arn', default=None)
+    parser.add_argument('--test_name', dest='test_name',
+                        default='Check Reconcile')
+    parser.add_argument('--log_to_s3', action='store_true', default=False)
+    parser.add_argument('--path_suffix', dest='path_suffix', default=None)
+
+    args = parser.parse_args()
+
+    chunks = [None]
+    if args.chunks > 1:
+        min_value, max_value = key_bounds(args.source_host,
+                                          args.source_bounds_sql,
+                                          args.destination_bounds_sql)
+        chunks = key_ranges(min_value, max_value, args.chunks)
+
+    output_dir = S3Path(
+        uri=os.path.join(
+            get_s3_base_path(), config.etl.get('QA_LOG_PATH', const.QA_STR),
+            RECONCILE_PATH, args.table,
+            datetime.utcnow().strftime('%Y%m%d%H%M%S')),
+        is_directory=True)
+
+    pool = ThreadPool(max(min(args.workers or len(chunks), len(chunks)), 1))
+    try:
+        summaries = pool.map(
+            lambda chunk: reconcile_chunk(args, chunk[0], chunk[1],
+                                          output_dir),
+            list(enumerate(chunks)))
+    finally:
+        pool.close()
+        pool.join()
+
+    summary = DiffSummary(args.sample_size)
+    for chunk_summary in summaries:
+        summary.update(chunk_summary)
+
+    check = ReconcileCheck(summary, output_path=output_dir.uri,
+                           name=args.test_name,
+                           sns_topic_arn=args.sns_topic_arn,
+                           tolerance=args.tolerance)
+    check.publish(args.log_to_s3, table=args.table,
+                  path_suffix=args.path_suffix)
@@ -6,12 +6,15 @@ a transform step with the script_directory argument
 # imports
 import argparse
 import os
-import pandas.io.sql as pdsql
 import subprocess
 
 from dataduct.data_access import redshift_connection
+from dataduct.database import Catalog
+from dataduct.database import SqlScript
 from dataduct.database import SqlStatement
 from dataduct.database import Table
+from dataduct.database import TableMaintenance
+from dataduct.database import View
 from dataduct.s3 import S3File
 from dataduct.s3 import S3Path
 
@@ -63,6 +66,9 @@ def sql_runner():
     parser.add_argument('--analyze', action='store_true', default=False)
     parser.add_argument('--non_transactional', action='store_true',
                         default=False)
+    parser.add_argument('--recreate_dependencies', action='store_true',
+                        default=False)
+    parser.add_argument('--maintenance', action='store_true', default=False)
 
     args, sql_arguments = parser.parse_known_args()
     print args, sql_arguments
@@ -82,20 +88,51 @@ def sql_runner():
         # transaction.
         connection.autocommit = False
 
-    table_not_exists = pdsql.read_sql(table.check_not_exists_script().sql(),
-                                      connection).loc[0][0]
+    catalog = Catalog(connection)
 
     cursor = connection.cursor()
     # Create table in redshift, this is safe due to the if exists condition
-    if table_not_exists:
+    if not catalog.exists(table.full_name):
         cursor.execute(table.create_script().sql())
 
+    # The query drops the table with its views and the foreign keys
+    # referencing it, e.g. a shadow table swap, so their live definitions
+    # are read before running it. The definitions of the other relations
+    # are not passed to the executor, so they come from the catalog.
+    if args.recreate_dependencies:
+        dependencies_script = SqlScript()
+        for _, sql in catalog.dependent_views(table.full_name):
+            dependencies_script.append(
+                View(SqlStatement(sql)).recreate_script())
+        for _, sql in catalog.foreign_key_references(table.full_name):
+            dependencies_script.append(sql)
+        statements = SqlScript(sql_query).statements
+        if statements and statements[-1].sql().upper() == 'COMMIT':
+            # Recreate the views in the transaction that drops them
+            sql_query = SqlScript(statements=statements[:-1]).append(
+                dependencies_script).append('COMMIT').sql()
+        else:
+            sql_query = SqlScript(sql_query).append(dependencies_script).sql()
+
+    maintenance = None
+    if args.maintenance:
+        maintenance = TableMaintenance.from_config()
+
     # Load data into redshift with upsert query
     # If there are sql_arguments, place them along with the query
     # Otherwise, don't include them to avoid having to use %% everytime
     if len(sql_arguments) >= 1:
         print cursor.mogrify(sql_query, tuple(sql_arguments))
         cursor.execute(sql_query, tuple(sql_arguments))
+    elif args.non_transactional or maintenance is not None:
+        # Statements such as ALTER TABLE APPEND can not run inside the
+        # implicit transaction of a multi statement query, and the rows
+        # changed by every statement decide the maintenance
+        for statement in SqlScript(sql_query).statements:
+            print statement.sql()
+            cursor.execute(statement.sql())
+            if maintenance is not None:
+                maintenance.record(statement.sql(), cursor.rowcount)
     else:
         print sql_query
         cursor.execute(sql_query)
@@ -105,5 +142,10 @@ def sql_runner():
     if args.analyze:
         cursor.execute(table.analyze_script().sql())
 
+    # VACUUM and ANALYZE if enough of the table changed
+    if maintenance is not None:
+        connection.autocommit = True
+        maintenance.run(cursor, table.full_name)
+
     cursor.close()
     connection.close()
@@ -0,0 +1,125 @@
+"""Writers that split rows into equal sized output files
+"""
+import bz2
+import gzip
+import os
+import subprocess
+
+from dataduct.config import Config
+from dataduct.utils import constants as const
+
+config = Config()
+
+COMPRESS_LEVEL = 6
+
+FILE_EXTENSIONS = {
+    const.GZIP: '.gz',
+    const.BZIP2: '.bz2',
+    const.LZOP: '.lzo',
+    const.ZSTD: '.zst',
+}
+
+# Formats without a python module are compressed by the command line tools
+COMPRESS_COMMANDS = {
+    const.LZOP: ['lzop', '-c'],
+    const.ZSTD: ['zstd', '-c', '-q'],
+}
+
+
+def default_splits():
+    """Number of output files, one per slice of the redshift cluster
+    """
+    redshift_config = getattr(config, 'redshift', dict())
+    return redshift_config.get('SLICE_COUNT', None) or 1
+
+
+class CompressCommandFile(object):
+    """Writable file compressed by piping it through a command
+    """
+    def __init__(self, command, path):
+        """Constructor for the CompressCommandFile class
+
+        Args:
+            command(list of str): Command compressing stdin to stdout
+            path(str): Path of the compressed output file
+        """
+        self._output = open(path, 'wb')
+        self._process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=self._output)
+
+    def writelines(self, lines):
+        """Write the lines to the compression command
+        """
+        self._process.stdin.writelines(lines)
+
+    def close(self):
+        """Wait for the compression command to finish
+        """
+        self._process.stdin.close()
+        return_code = self._process.wait()
+        self._output.close()
+        if return_code != 0:
+            raise RuntimeError('Compression failed with code %d' % return_code)
+
+
+def open_part(output_dir, index, compression=None):
+    """Open the output file for a part
+    """
+    path = os.path.join(output_dir, 'part-%04d' % index)
+    if compression is None:
+        return open(path, 'wb')
+
+    path += FILE_EXTENSIONS[compression]
+    if compression == const.GZIP:
+        return gzip.open(path, 'wb', COMPRESS_LEVEL)
+    if compression == const.BZIP2:
+        return bz2.BZ2File(path, 'wb')
+    return CompressCommandFile(COMPRESS_COMMANDS[compression], path)
+
+
+class PartWriter(object):
+    """Writes blocks of rows round robin into a set of part files
+
+    Note:
+        The first part is always created so that empty inputs still produce
+        an output file, the others are only created once there is data.
+    """
+    def __init__(self, output_dir, part_indexes, compression=None):
+        """Constructor for the PartWriter class
+
+        Args:
+            output_dir(str): Directory for the part files
+            part_indexes(list of int): Indexes used to name the parts
+            compression(str): Compression format of the parts
+        """
+        if not part_indexes:
+            raise ValueError('Atleast one part is needed')
+
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        self.output_dir = output_dir
+        self.part_indexes = list(part_indexes)
+        self.compression = compression
+        self.row_count = 0
+        self._parts = [open_part(output_dir, self.part_indexes[0],
+                                 compression)]
+        self._next = 0
+
+    def write(self, lines):
+        """Write a block of rows to the next part
+        """
+        if self._next == len(self._parts):
+            self._parts.append(open_part(
+                self.output_dir, self.part_indexes[self._next],
+                self.compression))
+
+        self._parts[self._next].writelines(lines)
+        self.row_count += len(lines)
+        self._next = (self._next + 1) % len(self.part_indexes)
+
+    def close(self):
+        """Close all the parts
+        """
+        for part in self._parts:
+            part.close()
@@ -0,0 +1,484 @@
+"""Script that streams a table extract from a database straight to S3
+"""
+import argparse
+import bz2
+import re
+import sys
+import zlib
+
+from multiprocessing.pool import ThreadPool
+
+from dataduct.config import Config
+from dataduct.data_access import postgres_connection
+from dataduct.data_access import rds_connection
+from dataduct.s3 import S3Path
+from dataduct.s3 import S3StreamWriter
+from dataduct.steps.executors.split_files import FILE_EXTENSIONS
+from dataduct.steps.executors.split_files import default_splits
+from dataduct.utils import constants as const
+
+config = Config()
+
+FETCH_SIZE = 10000
+COMPRESS_LEVEL = 6
+
+# Rows are streamed with the connection held open, give the server time
+# to wait while a batch is compressed and uploaded
+NET_WRITE_TIMEOUT = 3600
+
+# Characters escaped for a redshift COPY with the ESCAPE option
+ESCAPED_CHARACTERS = ['\\', '\t', '\n', '\r']
+
+PRIMARY_KEY_QUERY = """
+    SELECT column_name
+    FROM information_schema.key_column_usage
+    WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND constraint_name = 'PRIMARY'
+    ORDER BY ordinal_position
+"""
+
+POSTGRES_PRIMARY_KEY_QUERY = """
+    SELECT a.attname
+    FROM pg_index i
+    JOIN pg_attribute a
+        ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+    WHERE i.indrelid = %s::regclass
+        AND i.indisprimary
+"""
+
+POSTGRES_PAGE_COUNT_QUERY = """
+    SELECT relpages FROM pg_class WHERE oid = %s::regclass
+"""
+
+POSTGRES_COPY_COMMAND = "COPY ({sql}) TO STDOUT WITH NULL AS 'NULL'"
+
+# Postgres text format escapes converted to the redshift ESCAPE format,
+# the other control characters are dropped
+POSTGRES_ESCAPE_PATTERN = re.compile(r'\\(.)')
+POSTGRES_ESCAPES = {
+    '\\': '\\\\',
+    't': '\\\t',
+    'n': '\\\n',
+    'r': '\\\r',
+}
+
+
+def format_value(value):
+    """Convert a database value into a TSV field
+    """
+    if value is None:
+        return const.NULL_STR
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+    elif isinstance(value, float):
+        value = repr(value)
+    elif not isinstance(value, str):
+        value = str(value)
+
+    if '\x00' in value:
+        value = value.replace('\x00', '')
+    for character in ESCAPED_CHARACTERS:
+        if character in value:
+            value = value.replace(character, '\\' + character)
+    return value
+
+
+def format_rows(rows):
+    """Convert a batch of database rows into TSV
+    """
+    return ''.join('\t'.join([format_value(v) for v in row]) + '\n'
+                   for row in rows)
+
+
+def key_ranges(min_value, max_value, partitions):
+    """Split an integer key range into inclusive bounds of equal width
+
+    Returns:
+        result(list of tuple): Bounds of every partition, a single None
+            partition if the range can not be split
+    """
+    if not isinstance(min_value, (int, long)) or \
+            not isinstance(max_value, (int, long)):
+        return [None]
+
+    width = (max_value - min_value) // partitions + 1
+    return [(start, min(start + width - 1, max_value))
+            for start in xrange(min_value, max_value + 1, width)]
+
+
+def compressor(compression):
+    """Streaming compressor object for the compression format
+    """
+    if compression == const.GZIP:
+        # A window size of 16 + 15 writes the gzip header and trailer
+        return zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 16 + 15)
+    if compression == const.BZIP2:
+        return bz2.BZ2Compressor()
+    return None
+
+
+def stream_rows(cursor, output_path, compression=None):
+    """Stream the rows of an executed query to an S3 file
+
+    Args:
+        cursor(Cursor): Cursor that executed the query
+        output_path(S3Path): Path of the S3 file
+        compression(str): Compression format of the file
+
+    Returns:
+        row_count(int): Number of rows written
+    """
+    row_count = 0
+    stream_compressor = compressor(compression)
+    with S3StreamWriter(output_path) as writer:
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            data = format_rows(rows)
+            if stream_compressor is not None:
+                data = stream_compressor.compress(data)
+            writer.write(data)
+            row_count += len(rows)
+
+        if stream_compressor is not None:
+            writer.write(stream_compressor.flush())
+    return row_count
+
+
+def convert_postgres_escape(match):
+    """Redshift escape for a Postgres text format escape
+    """
+    return POSTGRES_ESCAPES.get(match.group(1), '')
+
+
+class CopyStream(object):
+    """Writable file for copy_expert that compresses the rows into S3
+
+    Note:
+        Postgres escapes are converted to the redshift ESCAPE format. Data
+        is only converted up to the last newline, escaped newlines are
+        never literal so an escape never spans two conversions.
+    """
+    def __init__(self, writer, compression=None):
+        """Constructor for the CopyStream class
+
+        Args:
+            writer(S3StreamWriter): Stream for the S3 file
+            compression(str): Compression format of the file
+        """
+        self.writer = writer
+        self.row_count = 0
+        self._compressor = compressor(compression)
+        self._remainder = ''
+
+    def _write_rows(self, data):
+        """Convert and write whole rows
+        """
+        # Newlines in values are escaped, so every newline ends a row
+        self.row_count += data.count('\n')
+        if '\\' in data:
+            data = POSTGRES_ESCAPE_PATTERN.sub(convert_postgres_escape, data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self.writer.write(data)
+
+    def write(self, data):
+        """Write the data received from the COPY
+        """
+        data = self._remainder + data
+        end = data.rfind('\n') + 1
+        self._remainder = data[end:]
+        if end > 0:
+            self._write_rows(data[:end])
+
+    def close(self):
+        """Write the remaining data and finish the compression
+        """
+        if self._remainder:
+            self._write_rows(self._remainder)
+            self._remainder = ''
+        if self._compressor is not None:
+            self.writer.write(self._compressor.flush())
+
+
+def part_path(output_dir, index, compression=None):
+    """S3 path of the file for a partition
+    """
+    name = 'part-%04d' % index + FILE_EXTENSIONS.get(compression, '')
+    return S3Path(key=name, parent_dir=output_dir)
+
+
+def run_partitions(extract, partition_count, workers=None):
+    """Run the extract of every partition on a pool of threads
+
+    Args:
+        extract(function): Extracts the partition with the given index and
+            returns its number of rows
+        partition_count(int): Number of partitions
+        workers(int): Number of partitions extracted concurrently, all of
+            them if None
+
+    Returns:
+        row_count(int): Number of rows extracted
+    """
+    if workers is None:
+        workers = partition_count
+
+    pool = ThreadPool(max(min(workers, partition_count), 1))
+    try:
+        row_counts = pool.map(extract, range(partition_count))
+    finally:
+        pool.close()
+        pool.join()
+    return sum(row_counts)
+
+
+def rds_credentials(host_name, database):
+    """Connection credentials for the primary and every read replica
+
+    Returns:
+        result(list of dict): Credentials used round robin by the partitions
+    """
+    host_config = config.mysql[host_name]
+    hosts = host_config.get('READ_REPLICAS', None) or [host_config['HOST']]
+    return [dict(host_config, HOST=host, DATABASE=database) for host in hosts]
+
+
+def rds_primary_key(connection, table):
+    """First column of the primary key of a table, None if there is none
+    """
+    cursor = connection.cursor()
+    cursor.execute(PRIMARY_KEY_QUERY, (table.split('.')[-1],))
+    rows = cursor.fetchall()
+    return rows[0][0] if rows else None
+
+
+def rds_partitions(credentials, table, primary_key, splits):
+    """Queries extracting the table in primary key ranges
+
+    Returns:
+        result(list of tuple): Sql and parameters of every partition
+    """
+    connection = rds_connection(sql_creds=credentials)
+    try:
+        if primary_key is None:
+            primary_key = rds_primary_key(connection, table)
+
+        if primary_key is None:
+            sys.stderr.write('No primary key for %s, extracting it with a '
+                             'single query\n' % table)
+            return [('SELECT * FROM %s' % table, None)]
+
+        cursor = connection.cursor()
+        cursor.execute('SELECT MIN({key}), MAX({key}) FROM {table}'.format(
+            key=primary_key, table=table))
+        min_value, max_value = cursor.fetchall()[0]
+    finally:
+        connection.close()
+
+    partitions = list()
+    for bounds in key_ranges(min_value, max_value, splits):
+        if bounds is None:
+            partitions.append(('SELECT * FROM %s' % table, None))
+        else:
+            partitions.append((
+                'SELECT * FROM {table} WHERE {key} BETWEEN %s AND %s'.format(
+                    table=table, key=primary_key), bounds))
+    return partitions
+
+
+def extract_rds_partition(credentials, sql, params, output_path,
+                          compression=None):
+    """Extract a partition with a server side cursor into an S3 file
+    """
+    # rds_connection uses an unbuffered SSCursor by default, rows are
+    # streamed from the server instead of being loaded into memory
+    connection = rds_connection(sql_creds=credentials)
+    try:
+        cursor = connection.cursor()
+        cursor.execute('SET SESSION net_write_timeout = %d' %
+                       NET_WRITE_TIMEOUT)
+        cursor.execute(sql, params)
+        return stream_rows(cursor, output_path, compression)
+    finally:
+        connection.close()
+
+
+def extract_rds(host_name, database, table, output_dir, splits,
+                workers=None, primary_key=None, compression=None):
+    """Extract a table in concurrent primary key ranges into S3 files
+
+    Note:
+        Partitions are read round robin from the read replicas of the host
+        when they are configured. Every partition reads its own snapshot.
+
+    Args:
+        host_name(str): Host name of the mysql config
+        database(str): Database of the table
+        table(str): Table to extract
+        output_dir(S3Path): S3 directory for the part files
+        splits(int): Number of primary key ranges
+        workers(int): Number of partitions extracted concurrently
+        primary_key(str): Integer column to partition on, looked up from
+            the primary key of the table if None
+        compression(str): Compression format of the part files
+
+    Returns:
+        row_count(int): Number of rows extracted
+    """
+    credentials = rds_credentials(host_name, database)
+    partitions = rds_partitions(credentials[0], table, primary_key, splits)
+
+    def extract(index):
+        """Extract the partition with the given index
+        """
+        sql, params = partitions[index]
+        return extract_rds_partition(
+            credentials[index % len(credentials)], sql, params,
+            part_path(output_dir, index, compression), compression)
+
+    return run_partitions(extract, len(partitions), workers)
+
+
+def extract_rds_runner():
+    """Extract a table from RDS straight to S3
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host_name', dest='host_name', required=True)
+    parser.add_argument('--database', dest='database', required=True)
+    parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--output_path', dest='output_path', required=True)
+    parser.add_argument('--splits', dest='splits', type=int,
+                        default=default_splits())
+    parser.add_argument('--workers', dest='workers', type=int, default=None)
+    parser.add_argument('--primary_key', dest='primary_key', default=None)
+    parser.add_argument('--compression', dest='compression', default=None,
+                        choices=const.STREAM_COMPRESSION_FORMATS)
+    args = parser.parse_args()
+
+    output_dir = S3Path(uri=args.output_path, is_directory=True)
+    row_count = extract_rds(args.host_name, args.database, args.table,
+                            output_dir, args.splits, args.workers,
+                            args.primary_key, args.compression)
+    print 'Extracted %d rows from %s into %s' % (
+        row_count, args.table, output_dir.uri)
+
+
+def postgres_primary_key(cursor, table):
+    """First column of the primary key of a table, None if there is none
+    """
+    cursor.execute(POSTGRES_PRIMARY_KEY_QUERY, (table,))
+    rows = cursor.fetchall()
+    return rows[0][0] if rows else None
+
+
+def postgres_partitions(connection, table, primary_key, splits):
+    """Queries extracting the table in key ranges or ctid blocks
+
+    Note:
+        Tables without an integer key are split into ranges of pages with
+        ctid conditions. Before Postgres 14 these are not index scans, so
+        every chunk reads the whole table but only outputs its blocks.
+
+    Returns:
+        result(list of str): Sql of every partition
+    """
+    cursor = connection.cursor()
+    if primary_key is None:
+        primary_key = postgres_primary_key(cursor, table)
+
+    if primary_key is not None:
+        cursor.execute('SELECT MIN({key}), MAX({key}) FROM {table}'.format(
+            key=primary_key, table=table))
+        min_value, max_value = cursor.fetchall()[0]
+        bounds = key_ranges(min_value, max_value, splits)
+        if bounds != [None]:
+            return [cursor.mogrify(
+                'SELECT * FROM {table} WHERE {key} BETWEEN %s AND %s'.format(
+                    table=table, key=primary_key), b) for b in bounds]
+
+    cursor.execute(POSTGRES_PAGE_COUNT_QUERY, (table,))
+    page_count = cursor.fetchall()[0][0]
+    bounds = key_ranges(0, max(page_count, 1) - 1, splits)
+
+    # relpages is only an estimate, the last chunk has no upper bound
+    partitions = list()
+    for index, (first_page, last_page) in enumerate(bounds):
+        conditions = ["ctid >= '(%d,0)'::tid" % first_page]
+        if index < len(bounds) - 1:
+            conditions.append("ctid < '(%d,0)'::tid" % (last_page + 1))
+        partitions.append('SELECT * FROM %s WHERE %s' % (
+            table, ' AND '.join(conditions)))
+    return partitions
+
+
+def extract_postgres_partition(sql, output_path, compression=None):
+    """Extract a partition with COPY TO STDOUT into an S3 file
+    """
+    connection = postgres_connection()
+    try:
+        with S3StreamWriter(output_path) as writer:
+            stream = CopyStream(writer, compression)
+            connection.cursor().copy_expert(
+                POSTGRES_COPY_COMMAND.format(sql=sql), stream)
+            stream.close()
+        return stream.row_count
+    finally:
+        connection.close()
+
+
+def extract_postgres(table, output_dir, splits, workers=None,
+                     primary_key=None, compression=None):
+    """Extract a table in concurrent chunks into S3 files
+
+    Args:
+        table(str): Table to extract
+        output_dir(S3Path): S3 directory for the part files
+        splits(int): Number of chunks
+        workers(int): Number of chunks extracted concurrently
+        primary_key(str): Integer column to partition on, looked up from
+            the primary key of the table if None
+        compression(str): Compression format of the part files
+
+    Returns:
+        row_count(int): Number of rows extracted
+    """
+    connection = postgres_connection()
+    try:
+        partitions = postgres_partitions(
+            connection, table, primary_key, splits)
+    finally:
+        connection.close()
+
+    def extract(index):
+        """Extract the partition with the given index
+        """
+        return extract_postgres_partition(
+            partitions[index], part_path(output_dir, index, compression),
+            compression)
+
+    return run_partitions(extract, len(partitions), workers)
+
+
+def extract_postgres_runner():
+    """Extract a table from Postgres straight to S3
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--output_path', dest='output_path', required=True)
+    parser.add_argument('--splits', dest='splits', type=int,
+                        default=default_splits())
+    parser.add_argument('--workers', dest='workers', type=int, default=None)
+    parser.add_argument('--primary_key', dest='primary_key', default=None)
+    parser.add_argument('--compression', dest='compression', default=None,
+                        choices=const.STREAM_COMPRESSION_FORMATS)
+    args = parser.parse_args()
+
+    output_dir = S3Path(uri=args.output_path, is_directory=True)
+    row_count = extract_postgres(args.table, output_dir, args.splits,
+                                 args.workers, args.primary_key,
+                                 args.compression)
+    print 'Extracted %d rows from %s into %s' % (
+        row_count, args.table, output_dir.uri)
@@ -0,0 +1,85 @@
+"""Tests for the clean files executor
+"""
+import os
+
+from unittest import TestCase
+from mock import patch
+from nose.tools import eq_
+from testfixtures import TempDirectory
+
+from ..clean_files import clean_block
+from ..clean_files import clean_files
+from ..clean_files import DEFAULT_NULL_MARKER
+from ..clean_files import field_count
+from ..clean_files import replace_nulls
+from ..clean_files import split_rows
+
+
+class TestCleanFiles(TestCase):
+    """Tests for cleaning blocks of TSV rows
+    """
+
+    def test_field_count(self):
+        """Test that escaped tabs are not separators
+        """
+        eq_(field_count('a\tb\n'), 2)
+        eq_(field_count('x\\\ty\n'), 1)
+        eq_(field_count('x\\\\\ty\n'), 2)
+        eq_(field_count('a\tb\rc\td\n'), 3)
+
+    def test_split_rows(self):
+        """Test that only newlines end a row
+        """
+        eq_(split_rows('a\rb\x0bc\nd\n'), ['a\rb\x0bc\n', 'd\n'])
+        eq_(split_rows('a\nb'), ['a\n', 'b'])
+        eq_(split_rows(''), [])
+        eq_(split_rows('a\\\nb\nc\\\\\nd\\\n'),
+            ['a\\\nb\n', 'c\\\\\n', 'd\\\n'])
+        eq_(split_rows('a\\\nb'), ['a\\\nb'])
+
+    def test_replace_nulls(self):
+        """Test that only whole null fields are replaced
+        """
+        eq_(replace_nulls('\\\\n\t\\\\n\tx\\\\n\n', DEFAULT_NULL_MARKER),
+            'NULL\tNULL\tx\\\\n\n')
+
+    def test_clean_block_carriage_return(self):
+        """Test that a carriage return inside a field keeps the row whole
+        """
+        eq_(clean_block(['a\tb\rc\td\n'], DEFAULT_NULL_MARKER, 3),
+            (['a\tb\rc\td\n'], []))
+
+    def test_clean_block_escaped_tab(self):
+        """Test that rows are judged by their fields in every block
+        """
+        eq_(clean_block(['x\\\ty\n'], DEFAULT_NULL_MARKER, 2),
+            ([], ['x\\\ty\n']))
+        eq_(clean_block(['x\\\ty\tz\n', 'a\tb\n'], DEFAULT_NULL_MARKER, 2),
+            (['x\\\ty\tz\n', 'a\tb\n'], []))
+        eq_(clean_block(['x\\\\\ty\n'], DEFAULT_NULL_MARKER, 2),
+            (['x\\\\\ty\n'], []))
+
+    def test_clean_block_escaped_newline(self):
+        """Test that an escaped newline inside a field keeps the row whole
+        """
+        eq_(clean_block(['1\tline one\\\n', 'line two\n', '2\tok\n'],
+                        DEFAULT_NULL_MARKER, 2),
+            (['1\tline one\\\nline two\n', '2\tok\n'], []))
+
+    def test_clean_files_escaped_newline_across_blocks(self):
+        """Test that a row with an escaped newline is not split by blocks
+        """
+        with TempDirectory() as d:
+            input_path = d.write('input.tsv', '1\tline one\\\nline two\n')
+            with patch('dataduct.steps.executors.clean_files.BLOCK_SIZE', 1):
+                eq_(clean_files([input_path], os.path.join(d.path, 'out'),
+                                [0], column_count=2), (1, 0, []))
+
+    def test_clean_block_control_characters(self):
+        """Test that control characters are stripped before the rows split
+        """
+        eq_(clean_block(['a\x00\tb\x1c\n', 'c\td\tf\n'],
+                        DEFAULT_NULL_MARKER, 2),
+            (['a\tb\n'], ['c\td\tf\n']))
+        eq_(clean_block(['a\tb\n', 'c\n'], DEFAULT_NULL_MARKER),
+            (['a\tb\n', 'c\n'], []))
@@ -0,0 +1,149 @@
+"""Tests for the create load redshift executor
+"""
+import json
+
+from unittest import TestCase
+from mock import MagicMock
+from mock import patch
+from nose.tools import eq_
+from nose.tools import raises
+
+from ....database import SqlStatement
+from ....database import Table
+from ..create_load_redshift import create_manifest
+from ..create_load_redshift import load_redshift
+
+EXECUTOR = 'dataduct.steps.executors.create_load_redshift'
+
+
+def s3_key(bucket_name, name):
+    """Mock boto key of a file in a bucket
+    """
+    key = MagicMock()
+    key.bucket.name = bucket_name
+    key.name = name
+    return key
+
+
+class TestCreateManifest(TestCase):
+    """Tests for writing the COPY manifest
+    """
+
+    def setUp(self):
+        """Setup a mock listing with two files for every input path
+        """
+        self.uploads = list()
+
+        def upload(text, s3_path):
+            """Record the uploaded manifest
+            """
+            self.uploads.append((s3_path.uri, json.loads(text)))
+            return MagicMock()
+
+        def list_files(s3_path):
+            """Two files under the listed path
+            """
+            return [s3_key(s3_path.bucket, '%s/part-%04d' % (
+                s3_path.key.rstrip('/'), index)) for index in range(2)]
+
+        for name, side_effect in [('S3File', upload),
+                                  ('list_s3_files', list_files)]:
+            patcher = patch('%s.%s' % (EXECUTOR, name),
+                            side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        stderr = patch('%s.stderr' % EXECUTOR)
+        self.stderr = stderr.start()
+        self.addCleanup(stderr.stop)
+
+    def test_manifest_entries(self):
+        """Test that every listed file is a mandatory entry
+        """
+        create_manifest(['s3://bucket/a/', 's3://bucket/b/'],
+                        's3://bucket/manifest.json')
+        eq_(self.uploads, [('s3://bucket/manifest.json', {'entries': [
+            {'url': 's3://bucket/a/part-0000', 'mandatory': True},
+            {'url': 's3://bucket/a/part-0001', 'mandatory': True},
+            {'url': 's3://bucket/b/part-0000', 'mandatory': True},
+            {'url': 's3://bucket/b/part-0001', 'mandatory': True},
+        ]})])
+
+    def test_slice_count_warning(self):
+        """Test that a file count leaving slices idle is warned about
+        """
+        create_manifest(['s3://bucket/a/'], 's3://bucket/manifest.json',
+                        slice_count=4)
+        eq_(self.stderr.write.call_count, 1)
+        eq_('Loading 2 files on 4 slices' in
+            self.stderr.write.call_args[0][0], True)
+
+    def test_slice_count_multiple(self):
+        """Test that a multiple of the slice count is not warned about
+        """
+        create_manifest(['s3://bucket/a/', 's3://bucket/b/'],
+                        's3://bucket/manifest.json', slice_count=2)
+        eq_(self.stderr.write.call_count, 0)
+
+    @raises(Exception)
+    def test_no_files(self):
+        """Test that a manifest without files is an error
+        """
+        with patch('%s.list_s3_files' % EXECUTOR, return_value=[]):
+            create_manifest(['s3://bucket/a/'], 's3://bucket/manifest.json')
+
+
+class TestLoadRedshift(TestCase):
+    """Tests for the generated COPY commands
+    """
+
+    def setUp(self):
+        """Setup a table and fixed credentials
+        """
+        self.table = Table(SqlStatement(
+            'CREATE TABLE dev.test_table (id INTEGER);'))
+        credentials = patch('%s.get_aws_credentials' % EXECUTOR,
+                            return_value=('a', 'b', None))
+        credentials.start()
+        self.addCleanup(credentials.stop)
+
+    @staticmethod
+    def copy_statements(query):
+        """COPY statements of the load query
+        """
+        # The credentials contain semicolons, the statements are spaced
+        return [s for s in query.split('; ') if s.startswith('COPY')]
+
+    def test_copy_per_input_path(self):
+        """Test that every input path is copied without a manifest
+        """
+        statements = self.copy_statements(load_redshift(
+            self.table, ['s3://bucket/a/', 's3://bucket/b/']))
+        eq_(len(statements), 2)
+        eq_(statements[0].startswith(
+            "COPY dev.test_table FROM 's3://bucket/a/'"), True)
+        eq_(any('MANIFEST' in s for s in statements), False)
+
+    def test_copy_manifest(self):
+        """Test that a manifest is loaded with a single COPY
+        """
+        statements = self.copy_statements(load_redshift(
+            self.table, ['s3://bucket/a/', 's3://bucket/b/'],
+            manifest_path='s3://bucket/manifest.json', compression='gzip'))
+        eq_(len(statements), 1)
+        eq_(statements[0].startswith(
+            "COPY dev.test_table FROM 's3://bucket/manifest.json'"), True)
+        eq_(' MANIFEST DELIMITER ' in statements[0], True)
+        eq_(' GZIP ' in statements[0], True)
+
+    def test_copy_update_options(self):
+        """Test that COMPUPDATE and STATUPDATE are set on every COPY
+        """
+        statement = self.copy_statements(load_redshift(
+            self.table, ['s3://bucket/a/']))[0]
+        eq_('COMPUPDATE OFF STATUPDATE OFF' in statement, True)
+
+        statement = self.copy_statements(load_redshift(
+            self.table, ['s3://bucket/a/'], compupdate='ON',
+            statupdate='ON'))[0]
+        eq_('COMPUPDATE ON STATUPDATE ON' in statement, True)
@@ -0,0 +1,125 @@
+"""Tests for the split files executor
+"""
+import bz2
+import gzip
+import os
+
+from unittest import TestCase
+from mock import patch
+from nose.tools import eq_
+from nose.tools import raises
+from testfixtures import TempDirectory
+
+from ....utils import constants as const
+from ..split_files import CompressCommandFile
+from ..split_files import PartWriter
+
+OPEN_FUNCTIONS = {
+    None: open,
+    const.GZIP: gzip.open,
+    const.BZIP2: bz2.BZ2File,
+}
+
+
+class TestPartWriter(TestCase):
+    """Tests for writing blocks of rows into part files
+    """
+
+    def setUp(self):
+        """Setup blocks of rows spanning several parts
+        """
+        rows = ['%d\trow\n' % i for i in range(5)]
+        self.blocks = [rows[0:2], rows[2:4], rows[4:5]]
+
+    @staticmethod
+    def write_parts(output_dir, blocks, part_indexes, compression=None):
+        """Write the blocks and return the number of rows written
+        """
+        writer = PartWriter(output_dir, part_indexes, compression)
+        for block in blocks:
+            writer.write(block)
+        writer.close()
+        return writer.row_count
+
+    @staticmethod
+    def read_parts(output_dir, compression=None):
+        """Rows of every part file by file name
+        """
+        # The command compressed parts are gzip in these tests
+        open_function = OPEN_FUNCTIONS.get(compression, gzip.open)
+        result = dict()
+        for name in sorted(os.listdir(output_dir)):
+            part = open_function(os.path.join(output_dir, name), 'rb')
+            result[name] = part.readlines()
+            part.close()
+        return result
+
+    def test_round_robin(self):
+        """Test that the blocks are written to the parts in turn
+        """
+        with TempDirectory() as d:
+            eq_(self.write_parts(d.path, self.blocks, [0, 1]), 5)
+            eq_(self.read_parts(d.path), {
+                'part-0000': self.blocks[0] + self.blocks[2],
+                'part-0001': self.blocks[1],
+            })
+
+    def test_part_indexes(self):
+        """Test that the parts are named by the given indexes
+        """
+        with TempDirectory() as d:
+            self.write_parts(d.path, self.blocks, [3, 7])
+            eq_(sorted(os.listdir(d.path)), ['part-0003', 'part-0007'])
+
+    def test_more_parts_than_blocks(self):
+        """Test that parts without data are not created
+        """
+        with TempDirectory() as d:
+            self.write_parts(d.path, self.blocks[:2], range(4))
+            eq_(sorted(os.listdir(d.path)), ['part-0000', 'part-0001'])
+
+    def test_no_blocks(self):
+        """Test that the first part is created without any data
+        """
+        with TempDirectory() as d:
+            eq_(self.write_parts(d.path, [], range(4)), 0)
+            eq_(self.read_parts(d.path), {'part-0000': []})
+
+    @raises(ValueError)
+    def test_no_parts(self):
+        """Test that at least one part is needed
+        """
+        PartWriter('/tmp', [])
+
+    def test_compressed_parts(self):
+        """Test that the parts are compressed with the python modules
+        """
+        for compression in [const.GZIP, const.BZIP2]:
+            with TempDirectory() as d:
+                self.write_parts(d.path, self.blocks, [0, 1], compression)
+                extension = '.gz' if compression == const.GZIP else '.bz2'
+                eq_(self.read_parts(d.path, compression), {
+                    'part-0000' + extension: self.blocks[0] + self.blocks[2],
+                    'part-0001' + extension: self.blocks[1],
+                })
+
+    def test_command_compressed_parts(self):
+        """Test that the other formats are piped through their command
+        """
+        # gzip stands in for lzop, which is not installed everywhere
+        with TempDirectory() as d, patch.dict(
+                'dataduct.steps.executors.split_files.COMPRESS_COMMANDS',
+                {const.LZOP: ['gzip', '-c']}):
+            self.write_parts(d.path, self.blocks, [0, 1], const.LZOP)
+            eq_(self.read_parts(d.path, const.LZOP), {
+                'part-0000.lzo': self.blocks[0] + self.blocks[2],
+                'part-0001.lzo': self.blocks[1],
+            })
+
+    @raises(RuntimeError)
+    def test_command_failure(self):
+        """Test that a failed compression command is an error
+        """
+        with TempDirectory() as d:
+            CompressCommandFile(
+                ['false'], os.path.join(d.path, 'part-0000')).close()
@@ -0,0 +1,136 @@
+"""Tests for the stream extract executor
+"""
+import zlib
+
+from unittest import TestCase
+from mock import MagicMock
+from mock import patch
+from nose.tools import eq_
+
+from ....s3 import S3Path
+from ....utils import constants as const
+from ..stream_extract import CopyStream
+from ..stream_extract import extract_postgres_partition
+from ..stream_extract import format_rows
+from ..stream_extract import format_value
+from ..stream_extract import key_ranges
+from ..stream_extract import postgres_partitions
+
+
+def postgres_connection(*results):
+    """Mock connection whose cursor returns the results of every query
+    """
+    cursor = MagicMock()
+    cursor.fetchall.side_effect = list(results)
+    cursor.mogrify.side_effect = lambda sql, params: sql % params
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    return connection
+
+
+class TestStreamExtract(TestCase):
+    """Tests for converting the extracted rows
+    """
+
+    def test_format_value(self):
+        """Test that values are converted to escaped TSV fields
+        """
+        eq_(format_value(None), const.NULL_STR)
+        eq_(format_value(u'caf\xe9'), 'caf\xc3\xa9')
+        eq_(format_value(0.1), '0.1')
+        eq_(format_value(12L), '12')
+        eq_(format_value('a\tb\\c\nd\re\x00'),
+            'a\\\tb\\\\c\\\nd\\\re')
+
+    def test_format_rows(self):
+        """Test that every row ends with a newline
+        """
+        eq_(format_rows([(1, None), (2, 'a\tb')]),
+            '1\tNULL\n2\ta\\\tb\n')
+
+    def test_key_ranges(self):
+        """Test that the bounds cover the key range without overlap
+        """
+        eq_(key_ranges(1, 10, 3), [(1, 4), (5, 8), (9, 10)])
+        eq_(key_ranges(5, 5, 4), [(5, 5)])
+        eq_(key_ranges(1, 2, 4), [(1, 1), (2, 2)])
+        eq_(key_ranges(0, 10L ** 12, 2),
+            [(0, 5 * 10L ** 11), (5 * 10L ** 11 + 1, 10L ** 12)])
+
+    def test_key_ranges_not_integer(self):
+        """Test that a key that is not an integer is a single partition
+        """
+        eq_(key_ranges('a', 'z', 2), [None])
+        eq_(key_ranges(None, None, 2), [None])
+
+    def test_copy_stream_escapes(self):
+        """Test that Postgres escapes split across writes are converted
+        """
+        writer = MagicMock()
+        stream = CopyStream(writer)
+        for chunk in ['a\\\\b\\tc\\', 'bd\tNULL\n', 'x\\ny']:
+            stream.write(chunk)
+        stream.close()
+
+        eq_(''.join(c[0][0] for c in writer.write.call_args_list),
+            'a\\\\b\\\tcd\tNULL\nx\\\ny')
+        eq_(stream.row_count, 1)
+
+
+class TestPostgresExtract(TestCase):
+    """Tests for the direct Postgres extract
+    """
+
+    def test_key_range_partitions(self):
+        """Test that a table with an integer key is split into key ranges
+        """
+        connection = postgres_connection([('id',)], [(1, 100)])
+        eq_(postgres_partitions(connection, 'test', None, 3), [
+            'SELECT * FROM test WHERE id BETWEEN 1 AND 34',
+            'SELECT * FROM test WHERE id BETWEEN 35 AND 68',
+            'SELECT * FROM test WHERE id BETWEEN 69 AND 100',
+        ])
+
+    def test_page_partitions(self):
+        """Test that a table without a key is split into ctid page ranges
+        """
+        connection = postgres_connection([], [(10,)])
+        eq_(postgres_partitions(connection, 'test', None, 2), [
+            "SELECT * FROM test WHERE ctid >= '(0,0)'::tid "
+            "AND ctid < '(5,0)'::tid",
+            "SELECT * FROM test WHERE ctid >= '(5,0)'::tid",
+        ])
+
+    def test_text_key_partitions(self):
+        """Test that a key that is not an integer falls back to pages
+        """
+        connection = postgres_connection([('a', 'z')], [(1,)])
+        eq_(postgres_partitions(connection, 'test', 'name', 4),
+            ["SELECT * FROM test WHERE ctid >= '(0,0)'::tid"])
+
+    @patch('dataduct.steps.executors.stream_extract.S3StreamWriter')
+    @patch('dataduct.steps.executors.stream_extract.postgres_connection')
+    def test_copy_to_part(self, connection, writer):
+        """Test that the COPY output is converted and compressed into the
+        part file
+        """
+        def copy_expert(sql, stream):
+            """Write the COPY output in chunks splitting rows and escapes
+            """
+            for chunk in ['1\ta\\', 'tb\n2\tNULL\n3\tc\\nd', '\n']:
+                stream.write(chunk)
+
+        connection.return_value.cursor.return_value.copy_expert.\
+            side_effect = copy_expert
+        written = list()
+        writer.return_value.__enter__.return_value.write.side_effect = \
+            written.append
+
+        output_path = S3Path(uri='s3://bucket/data/part-0000.gz')
+        eq_(extract_postgres_partition('SELECT * FROM test', output_path,
+                                       const.GZIP), 3)
+
+        writer.assert_called_once_with(output_path)
+        eq_(zlib.decompress(''.join(written), 16 + zlib.MAX_WBITS),
+            '1\ta\\\tb\n2\tNULL\n3\tc\\\nd\n')
+        eq_(connection.return_value.close.call_count, 1)
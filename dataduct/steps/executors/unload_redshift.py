@@ -0,0 +1,60 @@
+"""Script that unloads a redshift table to S3 in parallel with a manifest
+"""
+import argparse
+
+from dataduct.config import get_aws_credentials
+from dataduct.data_access import redshift_connection
+from dataduct.s3 import S3Path
+from dataduct.utils import constants as const
+from dataduct.utils.helpers import stringify_credentials
+from dataduct.utils.helpers import unload_options
+
+
+def unload_query(table_name, output_dir, compression=None,
+                 max_file_size=None):
+    """UNLOAD writing a file per slice and a manifest of the files
+
+    Args:
+        table_name(str): Fully qualified name of the table
+        output_dir(S3Path): S3 directory for the files and the manifest
+        compression(str): Compression format of the files
+        max_file_size(str): Maximum size of a file, e.g. '256 MB'
+    """
+    aws_key, aws_secret, token = get_aws_credentials()
+    options = unload_options(parallel=True, manifest=True,
+                             compression=compression,
+                             max_file_size=max_file_size,
+                             allow_overwrite=True)
+    return (
+        "UNLOAD ('SELECT * FROM {table}') TO '{path}' CREDENTIALS '{creds}' "
+        "DELIMITER '\t' ESCAPE NULL AS 'NULL' {options};"
+    ).format(table=table_name,
+             path=S3Path(key=const.UNLOAD_PREFIX,
+                         parent_dir=output_dir).uri,
+             creds=stringify_credentials(aws_key, aws_secret, token),
+             options=options)
+
+
+def unload_redshift_runner():
+    """Unload a redshift table with every slice writing its own files
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--table', dest='table', required=True)
+    parser.add_argument('--output_path', dest='output_path', required=True)
+    parser.add_argument('--compression', dest='compression', default=None,
+                        choices=const.UNLOAD_COMPRESSION_FORMATS)
+    parser.add_argument('--max_file_size', dest='max_file_size',
+                        default=None)
+    args = parser.parse_args()
+
+    output_dir = S3Path(uri=args.output_path, is_directory=True)
+    connection = redshift_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(unload_query(args.table, output_dir, args.compression,
+                                    args.max_file_size))
+    finally:
+        connection.close()
+
+    manifest_path = S3Path(key=const.UNLOAD_MANIFEST, parent_dir=output_dir)
+    print 'Unloaded %s with manifest %s' % (args.table, manifest_path.uri)
@@ -10,6 +10,10 @@ from ..pipeline import ShellCommandActivity
 from ..utils.helpers import exactly_one
 from ..utils.exceptions import ETLInputError
 from ..database import SelectStatement
+from ..database import SqlStatement
+from ..database import Table
+from ..utils.helpers import parse_path
+from ..utils import constants as const
 
 config = Config()
 if not hasattr(config, 'mysql'):
@@ -28,7 +32,12 @@ class ExtractRdsStep(ETLStep):
                  host_name=None,
                  database=None,
                  output_path=None,
-                 splits=1,
+                 splits=None,
+                 compression=None,
+                 table_definition=None,
+                 direct=False,
+                 primary_key=None,
+                 workers=None,
                  **kwargs):
         """Constructor for the ExtractRdsStep class
 
@@ -37,7 +46,16 @@ class ExtractRdsStep(ETLStep):
             table(path): table name for extract
             insert_mode(str): insert mode for redshift copy activity
             database(MysqlNode): database to excute the query
-            splits(int): Number of files to split the output to.
+            splits(int): Number of files to split the output to, defaults
+                to the slice count of the redshift cluster
+            compression(str): Compression format of the output files
+            table_definition(filepath): Table schema used to validate the
+                number of columns in the extracted rows
+            direct(bool): Stream the table straight to S3 with concurrent
+                primary key range queries instead of a CopyActivity
+            primary_key(str): Integer column used to partition a direct
+                extract, defaults to the primary key of the table
+            workers(int): Number of partitions extracted concurrently
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         if not exactly_one(table, sql):
@@ -45,6 +63,17 @@ class ExtractRdsStep(ETLStep):
 
         super(ExtractRdsStep, self).__init__(**kwargs)
 
+        if direct:
+            if not table:
+                raise ETLInputError('Direct extracts need a table')
+            if compression is not None and \
+                    compression not in const.STREAM_COMPRESSION_FORMATS:
+                raise ETLInputError(
+                    'Direct extracts do not support %s' % compression)
+            self.direct_extract(table, host_name, database, output_path,
+                                splits, compression, primary_key, workers)
+            return
+
         if table:
             sql = 'SELECT * FROM %s;' % table
         elif sql:
@@ -86,22 +115,17 @@ class ExtractRdsStep(ETLStep):
         )
 
         self._output = self.create_s3_data_node(
-            self.get_output_s3_path(output_path))
-
-        # This shouldn't be necessary but -
-        # AWS uses \\n as null, so we need to remove it
-        command = ' '.join(["[[ -z $(find ${INPUT1_STAGING_DIR} -maxdepth 1 ! \
-                           -path ${INPUT1_STAGING_DIR} -name '*' -size +0) ]] \
-                           && touch ${OUTPUT1_STAGING_DIR}/part-0 ",
-                           "|| cat",
-                            "${INPUT1_STAGING_DIR}/*",
-                            "| sed 's/\\\\\\\\n/NULL/g'",  # replace \\n
-                            # get rid of control characters
-                            "| tr -d '\\\\000'",
-                            # split into `splits` number of equal sized files
-                            ("| split -a 4 -d -l $((($(cat ${{INPUT1_STAGING_DIR}}/* | wc -l) + \
-                            {splits} - 1) / {splits})) - ${{OUTPUT1_STAGING_DIR}}/part-"
-                                .format(splits=splits))])
+            self.get_output_s3_path(output_path), compression=compression)
+
+        column_count = None
+        if table_definition is not None:
+            with open(parse_path(table_definition)) as f:
+                table_def = Table(SqlStatement(f.read()))
+            column_count = len(table_def.columns())
+
+        # AWS uses \\n as null, the cleanup replaces it with NULL, strips
+        # control characters and splits the output into equal sized files
+        command = self.clean_output_command(splits, compression, column_count)
 
         self.create_pipeline_object(
             object_class=ShellCommandActivity,
@@ -114,6 +138,44 @@ class ExtractRdsStep(ETLStep):
             schedule=self.schedule,
         )
 
+    def direct_extract(self, table, host_name, database, output_path,
+                       splits=None, compression=None, primary_key=None,
+                       workers=None):
+        """Create the activity streaming the table straight to S3
+
+        Note:
+            The executor uploads the files itself, so the activity does not
+            stage the output node.
+        """
+        self._output = self.create_s3_data_node(
+            self.get_output_s3_path(output_path), compression=compression)
+
+        command = [const.EXTRACT_RDS_COMMAND,
+                   '--host_name=%s' % host_name,
+                   '--database=%s' % database,
+                   '--table=%s' % table,
+                   '--output_path=%s' % self.output.path().uri]
+        if splits is not None:
+            command.append('--splits=%d' % splits)
+        if workers is not None:
+            command.append('--workers=%d' % workers)
+        if primary_key is not None:
+            command.append('--primary_key=%s' % primary_key)
+        if compression is not None:
+            command.append('--compression=%s' % compression)
+
+        self.create_pipeline_object(
+            object_class=ShellCommandActivity,
+            input_node=None,
+            output_node=None,
+            command=' '.join(command),
+            max_retries=self.max_retries,
+            resource=self.resource,
+            worker_group=self.worker_group,
+            schedule=self.schedule,
+            depends_on=self.depends_on,
+        )
+
     @classmethod
     def arguments_processor(cls, etl, input_args):
         """Parse the step arguments according to the ETL pipeline
@@ -124,5 +186,10 @@ class ExtractRdsStep(ETLStep):
         """
         input_args = cls.pop_inputs(input_args)
         step_args = cls.base_arguments_processor(etl, input_args)
+        # Fall back to uncompressed data if the pipeline compression is not
+        # supported by direct extracts
+        if not step_args.get('direct', False) or \
+                etl.compression in const.STREAM_COMPRESSION_FORMATS:
+            step_args.setdefault('compression', etl.compression)
 
         return step_args
@@ -1,9 +1,17 @@
 """
 ETL step wrapper for RedshiftCopyActivity to extract data to S3
 """
+import re
+
 from .etl_step import ETLStep
 from ..pipeline import RedshiftNode
 from ..pipeline import RedshiftCopyActivity
+from ..pipeline import ShellCommandActivity
+from ..s3 import S3Path
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
+
+MAX_FILE_SIZE_PATTERN = re.compile(r'^\d+(\.\d+)?\s*(MB|GB)$', re.IGNORECASE)
 
 
 class ExtractRedshiftStep(ETLStep):
@@ -16,6 +24,9 @@ class ExtractRedshiftStep(ETLStep):
                  redshift_database,
                  insert_mode="TRUNCATE",
                  output_path=None,
+                 compression=None,
+                 unload=False,
+                 max_file_size=None,
                  **kwargs):
         """Constructor for the ExtractRedshiftStep class
 
@@ -24,10 +35,29 @@ class ExtractRedshiftStep(ETLStep):
             table(path): table name for extract
             insert_mode(str): insert mode for redshift copy activity
             redshift_database(RedshiftDatabase): database to excute the query
+            compression(str): Compression format of the unloaded files
+            unload(bool): Run a parallel UNLOAD with a manifest instead of
+                a RedshiftCopyActivity, the output node is the manifest
+            max_file_size(str): Maximum size of the unloaded files, e.g.
+                '256 MB', only used with unload
             **kwargs(optional): Keyword arguments directly passed to base class
         """
+        if compression is not None and \
+                compression not in const.UNLOAD_COMPRESSION_FORMATS:
+            raise ETLInputError('Unload does not support %s' % compression)
+
+        if max_file_size is not None and \
+                not MAX_FILE_SIZE_PATTERN.match(str(max_file_size)):
+            raise ETLInputError(
+                'max_file_size should be a size in MB or GB, e.g. 256 MB')
+
         super(ExtractRedshiftStep, self).__init__(**kwargs)
 
+        if unload:
+            self.unload('%s.%s' % (schema, table), output_path, compression,
+                        max_file_size)
+            return
+
         # Create input node
         self._input_node = self.create_pipeline_object(
             object_class=RedshiftNode,
@@ -38,7 +68,11 @@ class ExtractRedshiftStep(ETLStep):
         )
 
         self._output = self.create_s3_data_node(
-            self.get_output_s3_path(output_path))
+            self.get_output_s3_path(output_path), compression=compression)
+
+        command_options = ["DELIMITER '\t' ESCAPE"]
+        if compression is not None:
+            command_options.append(compression.upper())
 
         self.create_pipeline_object(
             object_class=RedshiftCopyActivity,
@@ -50,7 +84,44 @@ class ExtractRedshiftStep(ETLStep):
             worker_group=self.worker_group,
             schedule=self.schedule,
             depends_on=self.depends_on,
-            command_options=["DELIMITER '\t' ESCAPE"],
+            command_options=command_options,
+        )
+
+    def unload(self, table_name, output_path=None, compression=None,
+               max_file_size=None):
+        """Create the activity unloading the table from every slice
+
+        Note:
+            The output node is the manifest written by the UNLOAD, which
+            redshift loads can use directly.
+        """
+        output_dir = self.get_output_s3_path(output_path)
+        if output_dir is None:
+            output_dir = S3Path(key='unload', parent_dir=self.s3_data_dir,
+                                is_directory=True)
+
+        self._output = self.create_s3_data_node(
+            S3Path(key=const.UNLOAD_MANIFEST, parent_dir=output_dir),
+            compression=compression, manifest=True)
+
+        command = [const.UNLOAD_COMMAND,
+                   '--table=%s' % table_name,
+                   '--output_path=%s' % output_dir.uri]
+        if compression is not None:
+            command.append('--compression=%s' % compression)
+        if max_file_size is not None:
+            command.append("--max_file_size='%s'" % max_file_size)
+
+        self.create_pipeline_object(
+            object_class=ShellCommandActivity,
+            input_node=None,
+            output_node=None,
+            command=' '.join(command),
+            max_retries=self.max_retries,
+            resource=self.resource,
+            worker_group=self.worker_group,
+            schedule=self.schedule,
+            depends_on=self.depends_on,
         )
 
     @classmethod
@@ -65,4 +136,9 @@ class ExtractRedshiftStep(ETLStep):
         step_args = cls.base_arguments_processor(etl, input_args)
         step_args['redshift_database'] = etl.redshift_database
 
+        # Fall back to unloading uncompressed data if the pipeline
+        # compression is not supported by unload
+        if etl.compression in const.UNLOAD_COMPRESSION_FORMATS:
+            step_args.setdefault('compression', etl.compression)
+
         return step_args
@@ -4,6 +4,8 @@ ETL step wrapper for RedshiftCopyActivity to load data into Redshift
 from .etl_step import ETLStep
 from ..pipeline import RedshiftNode
 from ..pipeline import RedshiftCopyActivity
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
 
 
 class LoadRedshiftStep(ETLStep):
@@ -28,6 +30,8 @@ class LoadRedshiftStep(ETLStep):
             redshift_database(RedshiftDatabase): database to excute the query
             max_errors(int): Maximum number of errors to be ignored during load
             replace_invalid_char(char): char to replace not utf-8 with
+            compression(str): compression format of the input files,
+                defaults to the compression of the input node
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         super(LoadRedshiftStep, self).__init__(**kwargs)
@@ -44,12 +48,15 @@ class LoadRedshiftStep(ETLStep):
         command_options = ["DELIMITER '\t' ESCAPE TRUNCATECOLUMNS"]
         command_options.append("NULL AS 'NULL' ")
 
-        if compression == "gzip":
-          command_options.append("GZIP")
-        elif compression == "bzip2":
-          command_options.append("BZIP2")
+        if compression is None:
+            compression = self.input_compression(self.input)
         elif compression == "lzo":
-          command_options.append("lzop")
+            compression = const.LZOP
+
+        if compression is not None:
+            if compression not in const.COMPRESSION_FORMATS:
+                raise ETLInputError('Unknown compression %s' % compression)
+            command_options.append(compression.upper())
         if max_errors:
             command_options.append('MAXERROR %d' % int(max_errors))
         if replace_invalid_char:
@@ -8,6 +8,7 @@ from ..pipeline import ShellCommandActivity
 from ..utils import constants as const
 from ..utils.helpers import parse_path
 from .etl_step import ETLStep
+from .upsert import reload_script
 
 config = Config()
 
@@ -21,7 +22,8 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
                  production_table_definition, pipeline_name,
                  script_arguments=None, analyze_table=True,
                  enforce_primary_key=True, non_transactional=False,
-                 log_to_s3=False, **kwargs):
+                 log_to_s3=False, compression=None, reload_strategy=None,
+                 maintenance=False, **kwargs):
         """Constructor for the LoadReloadAndPrimaryKeyStep class
 
         Args:
@@ -30,6 +32,10 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
                 staging table schema to store the data
             production_table_definition(filepath):
                 schema file for the table to be reloaded into
+            reload_strategy(str): How the data of the production table is
+                replaced, one of delete, swap or append
+            maintenance(bool): VACUUM and ANALYZE the production table only
+                if enough of it changed, instead of always running ANALYZE
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         super(LoadReloadAndPrimaryKeyStep, self).__init__(id=id, **kwargs)
@@ -39,7 +45,8 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
         create_and_load_pipeline_object = self.create_and_load_redshift(
             table_definition=staging_table_definition,
             input_node=input_node,
-            script_arguments=script_arguments
+            script_arguments=script_arguments,
+            compression=compression
         )
 
         reload_pipeline_object = self.reload(
@@ -48,7 +55,9 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
             depends_on=[create_and_load_pipeline_object],
             analyze_table=analyze_table,
             non_transactional=non_transactional,
-            enforce_primary_key=enforce_primary_key
+            enforce_primary_key=enforce_primary_key,
+            reload_strategy=reload_strategy,
+            maintenance=maintenance
         )
 
         self.primary_key_check(
@@ -92,7 +101,8 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
         return primary_key_check_pipeline_object
 
     def reload(self, source, destination, depends_on,
-               analyze_table, non_transactional, enforce_primary_key):
+               analyze_table, non_transactional, enforce_primary_key,
+               reload_strategy=None, maintenance=False):
         source_table = parse_path(source)
         destination_table = parse_path(destination)
 
@@ -100,17 +110,21 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
         destination_relation = Table(SqlScript(filename=destination_table))
 
         # Reload specific config
-        delete_existing = True
-        sql_script = destination_relation.upsert_script(
-            source_relation, enforce_primary_key, delete_existing)
+        sql_script, runner_arguments, append = reload_script(
+            destination_relation, source_relation,
+            reload_strategy or const.RELOAD_DELETE, enforce_primary_key)
+        non_transactional = non_transactional or append
 
         update_script = SqlScript(sql_script.sql())
         script_arguments = [
             '--table_definition=%s' % destination_relation.sql(),
             '--sql=%s' % update_script.sql()
         ]
+        script_arguments.extend(runner_arguments)
 
-        if analyze_table:
+        if maintenance:
+            script_arguments.append('--maintenance')
+        elif analyze_table:
             script_arguments.append('--analyze')
 
         if non_transactional:
@@ -132,11 +146,20 @@ class LoadReloadAndPrimaryKeyStep(ETLStep):
         return reload_pipeline_object
 
     def create_and_load_redshift(self, table_definition,
-                                 input_node, script_arguments):
+                                 input_node, script_arguments,
+                                 compression=None):
         if not script_arguments:
             script_arguments = list()
         table = self.get_table_from_def(table_definition)
 
+        if compression is None:
+            compression = self.input_compression(input_node)
+        if compression is not None:
+            script_arguments.append('--compression=%s' % compression)
+
+        if self.input_manifest(input_node):
+            script_arguments.append('--input_manifest')
+
         if isinstance(input_node, dict):
             input_paths = [i.path().uri for i in input_node.values()]
         else:
@@ -5,6 +5,7 @@ from ..config import Config
 from ..database import SqlStatement
 from ..database import Table
 from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
 from ..utils.helpers import parse_path
 from .qa_transform import QATransformStep
 
@@ -16,13 +17,25 @@ class PrimaryKeyCheckStep(QATransformStep):
     """
 
     def __init__(self, id, table_definition, script_arguments=None,
-                 log_to_s3=False, command=None, script=None, **kwargs):
+                 log_to_s3=False, command=None, script=None, mode=None,
+                 sample_size=0, cache=False, **kwargs):
         """Constructor for the PrimaryKeyCheckStep class
 
         Args:
             table_definition(file): table definition for the table to check
+            mode(str): count to count the duplicate keys, or approximate to
+                compare the row count with the approximate distinct keys
+            sample_size(int): Number of duplicate keys logged with the result
+            cache(bool): Reuse the verdict of the same check if the table did
+                not change since
             **kwargs(optional): Keyword arguments directly passed to base class
         """
+        if mode is None:
+            mode = const.PK_CHECK_COUNT
+        if mode not in const.PK_CHECK_MODES:
+            raise ETLInputError('Primary key check mode should be one of %s' %
+                                const.PK_CHECK_MODES)
+
         with open(parse_path(table_definition)) as f:
             table_def_string = f.read()
 
@@ -32,10 +45,17 @@ class PrimaryKeyCheckStep(QATransformStep):
         # We initialize the table object to check valid strings
         script_arguments.append(
             '--table=%s' % Table(SqlStatement(table_def_string)).sql())
+        script_arguments.extend([
+            '--mode=%s' % mode,
+            '--sample_size=%d' % sample_size,
+        ])
 
         if log_to_s3:
             script_arguments.append('--log_to_s3')
 
+        if cache:
+            script_arguments.append('--cache')
+
         if script is None and command is None:
             command = const.PK_CHECK_COMMAND
 
@@ -0,0 +1,56 @@
+"""ETL step wrapper for profile check step can be executed on Ec2 resource
+"""
+from ..database import SqlStatement
+from ..database import Table
+from ..utils import constants as const
+from ..utils.helpers import parse_path
+from .qa_transform import QATransformStep
+
+
+class ProfileCheckStep(QATransformStep):
+    """ProfileCheckStep class that compares the column statistics of a table
+    with the profile of the previous run
+    """
+
+    def __init__(self, id, table_definition, null_rate_tolerance=1.0,
+                 distinct_tolerance=10.0, length_tolerance=10.0,
+                 script_arguments=None, log_to_s3=False, cache=False,
+                 command=None, script=None, **kwargs):
+        """Constructor for the ProfileCheckStep class
+
+        Args:
+            table_definition(file): table definition for the table to check
+            null_rate_tolerance(float): Change of null rates in percentage
+                points
+            distinct_tolerance(float): Change of distinct estimates in
+                percent
+            length_tolerance(float): Change of average lengths in percent
+            cache(bool): Reuse the verdict of the same check if the table did
+                not change since
+            **kwargs(optional): Keyword arguments directly passed to base class
+        """
+        with open(parse_path(table_definition)) as f:
+            table_def_string = f.read()
+
+        if script_arguments is None:
+            script_arguments = list()
+
+        script_arguments.extend([
+            '--table=%s' % Table(SqlStatement(table_def_string)).sql(),
+            '--null_rate_tolerance=%s' % null_rate_tolerance,
+            '--distinct_tolerance=%s' % distinct_tolerance,
+            '--length_tolerance=%s' % length_tolerance,
+        ])
+
+        if log_to_s3:
+            script_arguments.append('--log_to_s3')
+
+        if cache:
+            script_arguments.append('--cache')
+
+        if script is None and command is None:
+            command = const.PROFILE_CHECK_COMMAND
+
+        super(ProfileCheckStep, self).__init__(
+            id=id, command=command, script=script,
+            script_arguments=script_arguments, **kwargs)
@@ -0,0 +1,98 @@
+"""ETL step wrapper for running many QA checks in a single activity
+"""
+import json
+
+from ..database import SqlStatement
+from ..database import Table
+from ..qa.batch import COUNT_CHECK
+from ..qa.batch import PRIMARY_KEY_CHECK
+from ..qa.fetch import DEFAULT_WORKERS
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
+from ..utils.helpers import parse_path
+from .count_check import CountCheckStep
+from .qa_transform import QATransformStep
+
+COUNT_CHECK_STEP = 'count-check'
+PRIMARY_KEY_CHECK_STEP = 'primary-key-check'
+
+
+class QABatchStep(QATransformStep):
+    """QABatchStep class that runs count and primary key checks of many
+    tables from a single executor
+    """
+
+    def __init__(self, id, checks, log_to_s3=False, workers=DEFAULT_WORKERS,
+                 script_arguments=None, command=None, script=None,
+                 **kwargs):
+        """Constructor for the QABatchStep class
+
+        Args:
+            checks(list of dict): Checks with the type of the check step and
+                the arguments of that step
+            log_to_s3(bool): Log the results of the checks to S3
+            workers(int): Number of queries running at the same time
+            **kwargs(optional): Keyword arguments directly passed to base class
+        """
+        if not isinstance(checks, list) or len(checks) == 0:
+            raise ETLInputError('Checks for the batch should be a list')
+
+        batch = list()
+        for index, check in enumerate(checks):
+            check = dict(check)
+            check_type = check.pop('type', None)
+            name = check.pop('name', '%s_%d' % (check_type, index))
+            if check_type == COUNT_CHECK_STEP:
+                batch_check = self.count_check(**check)
+            elif check_type == PRIMARY_KEY_CHECK_STEP:
+                batch_check = self.primary_key_check(**check)
+            else:
+                raise ETLInputError('Batch check type should be one of %s' %
+                                    [COUNT_CHECK_STEP, PRIMARY_KEY_CHECK_STEP])
+            batch_check['name'] = name
+            batch.append(batch_check)
+
+        if script_arguments is None:
+            script_arguments = list()
+
+        script_arguments.extend([
+            '--checks=%s' % json.dumps(batch),
+            '--workers=%d' % workers,
+        ])
+
+        if log_to_s3:
+            script_arguments.append('--log_to_s3')
+
+        if script is None and command is None:
+            command = const.QA_BATCH_COMMAND
+
+        super(QABatchStep, self).__init__(
+            id=id, command=command, script=script,
+            script_arguments=script_arguments, **kwargs)
+
+    @staticmethod
+    def count_check(source_host, tolerance=1.0, **kwargs):
+        """Count check of the batch, with the arguments of a count check step
+        """
+        source_sql, destination_sql = CountCheckStep.count_queries(**kwargs)
+        return {
+            'type': COUNT_CHECK,
+            'source_host': source_host,
+            'source_sql': source_sql,
+            'destination_sql': destination_sql,
+            'tolerance': float(tolerance),
+        }
+
+    @staticmethod
+    def primary_key_check(table_definition):
+        """Primary key check of the batch, with the arguments of a primary
+        key check step
+        """
+        with open(parse_path(table_definition)) as f:
+            table = Table(SqlStatement(f.read()))
+
+        return {
+            'type': PRIMARY_KEY_CHECK,
+            'table': table.full_name,
+            'sql': table.duplicate_count_script().sql(),
+        }
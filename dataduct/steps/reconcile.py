@@ -0,0 +1,97 @@
+"""ETL step wrapper for reconcile check step can be executed on Ec2 resource
+"""
+from ..database import SqlScript
+from ..qa.hash_check import MYSQL
+from ..qa.hash_check import REDSHIFT
+from ..qa.reconcile import DEFAULT_SAMPLE_SIZE
+from ..qa.reconcile import key_bounds_sql
+from ..qa.reconcile import reconcile_sql
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
+from ..utils.helpers import exactly_one
+from .column_check import key_columns
+from .qa_transform import QATransformStep
+
+
+class ReconcileStep(QATransformStep):
+    """ReconcileStep class that compares every row of the source and the
+    destination by the primary key
+    """
+
+    def __init__(self, id, source_sql, source_host,
+                 destination_table_definition=None, destination_sql=None,
+                 chunks=1, workers=None, sample_size=DEFAULT_SAMPLE_SIZE,
+                 tolerance=0.0, script_arguments=None, log_to_s3=False,
+                 command=None, script=None, **kwargs):
+        """Constructor for the ReconcileStep class
+
+        Args:
+            source_sql(str): Query selecting the source rows
+            source_host(str): Host of the source database
+            destination_table_definition(file):
+                table definition for the destination table
+            destination_sql(str): Query selecting the destination rows, the
+                last column is the only non-key column
+            chunks(int): Number of ranges of the first key column diffed
+                separately, the key has to be an integer to be split
+            workers(int): Number of chunks diffed in parallel
+            sample_size(int): Number of differences listed in the results
+            tolerance(float): Percentage of differing rows tolerated
+            **kwargs(optional): Keyword arguments directly passed to base class
+        """
+        if not exactly_one(destination_table_definition, destination_sql):
+            raise ETLInputError('One of dest table or dest sql needed')
+
+        if chunks < 1:
+            raise ETLInputError('Reconcile check needs at least one chunk')
+
+        if script_arguments is None:
+            script_arguments = list()
+
+        script_arguments.extend(self.reconcile_arguments(
+            source_sql, destination_table_definition, destination_sql))
+        script_arguments.extend([
+            '--source_host=%s' % source_host,
+            '--chunks=%d' % chunks,
+            '--sample_size=%d' % sample_size,
+            '--tolerance=%s' % tolerance,
+        ])
+
+        if workers is not None:
+            script_arguments.append('--workers=%d' % workers)
+
+        if log_to_s3:
+            script_arguments.append('--log_to_s3')
+
+        if script is None and command is None:
+            command = const.RECONCILE_COMMAND
+
+        super(ReconcileStep, self).__init__(
+            id=id, command=command, script=script,
+            script_arguments=script_arguments, **kwargs)
+
+    @staticmethod
+    def reconcile_arguments(source_sql, destination_table_definition,
+                            destination_sql):
+        """Arguments with the ordered rows and key bounds of both sides
+        """
+        table_name, source, destination = key_columns(
+            source_sql, destination_table_definition, destination_sql)
+        source_sql, source_keys, source_columns = source
+        destination_sql, destination_keys, destination_columns = destination
+
+        return [
+            '--table=%s' % table_name,
+            '--key_length=%d' % len(source_keys),
+            '--source_key=%s' % source_keys[0],
+            '--destination_key=%s' % destination_keys[0],
+            '--source_sql=%s' % SqlScript(reconcile_sql(
+                source_sql, source_keys, source_columns, MYSQL)).sql(),
+            '--destination_sql=%s' % SqlScript(reconcile_sql(
+                destination_sql, destination_keys, destination_columns,
+                REDSHIFT)).sql(),
+            '--source_bounds_sql=%s' % SqlScript(
+                key_bounds_sql(source_sql, source_keys[0])).sql(),
+            '--destination_bounds_sql=%s' % SqlScript(
+                key_bounds_sql(destination_sql, destination_keys[0])).sql(),
+        ]
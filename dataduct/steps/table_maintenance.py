@@ -0,0 +1,41 @@
+"""ETL step wrapper for running the queued VACUUM and ANALYZE commands
+"""
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
+from .transform import TransformStep
+
+
+class TableMaintenanceStep(TransformStep):
+    """TableMaintenanceStep class that runs the maintenance queued by loads
+    """
+
+    def __init__(self, tables=None, **kwargs):
+        """Constructor for the TableMaintenanceStep class
+
+        Args:
+            tables(list of str): Only run the maintenance of these tables
+            **kwargs(optional): Keyword arguments directly passed to base class
+        """
+        script_arguments = list()
+        if tables is not None:
+            if not isinstance(tables, list):
+                raise ETLInputError('Tables for maintenance should be a list')
+            script_arguments.append('--tables')
+            script_arguments.extend(tables)
+
+        super(TableMaintenanceStep, self).__init__(
+            command=const.MAINTENANCE_COMMAND,
+            script_arguments=script_arguments, no_output=True, **kwargs)
+
+    @classmethod
+    def arguments_processor(cls, etl, input_args):
+        """Parse the step arguments according to the ETL pipeline
+
+        Args:
+            etl(ETLPipeline): Pipeline object containing resources and steps
+            step_args(dict): Dictionary of the step arguments for the class
+        """
+        step_args = cls.base_arguments_processor(etl, input_args)
+        cls.pop_inputs(step_args)
+
+        return step_args
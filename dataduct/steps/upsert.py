@@ -4,26 +4,81 @@ from ..database import HistoryTable
 from ..database import SelectStatement
 from ..database import SqlScript
 from ..database import Table
+from ..utils import constants as const
+from ..utils.exceptions import ETLInputError
 from ..utils.helpers import exactly_one
 from ..utils.helpers import parse_path
 from .create_update_sql import CreateUpdateSqlStep
 
 
+def reload_script(destination, source_relation, reload_strategy,
+                  enforce_primary_key=True, filter_clause=None):
+    """Script replacing all the data of a table with the given strategy
+
+    Args:
+        destination(Table): Table to reload
+        source_relation(Relation): Table or select statement with the data
+        reload_strategy(str): One of delete, swap or append
+        enforce_primary_key(bool): De-duplicate the source data
+        filter_clause(str): Filter applied to the source data
+
+    Returns:
+        result(tuple): SqlScript, extra sql_runner arguments and whether the
+            script has to run outside of a transaction
+    """
+    if reload_strategy not in const.RELOAD_STRATEGIES:
+        raise ETLInputError('Reload strategy should be one of %s' %
+                            const.RELOAD_STRATEGIES)
+
+    if reload_strategy == const.RELOAD_SWAP:
+        # The old table is dropped with its views, which the runner recreates
+        script = destination.swap_script(
+            source_relation, enforce_primary_key, filter_clause)
+        return script, ['--recreate_dependencies'], False
+
+    if reload_strategy == const.RELOAD_APPEND:
+        # The views are recreated inside the transaction of the swap
+        script = destination.append_script(
+            source_relation, enforce_primary_key, filter_clause)
+        return script, ['--recreate_dependencies'], True
+
+    script = destination.upsert_script(
+        source_relation, enforce_primary_key, True, filter_clause)
+    return script, [], False
+
+
 class UpsertStep(CreateUpdateSqlStep):
     """Upsert Step class that helps run a step on the emr cluster
     """
 
     def __init__(self, destination, sql=None, script=None, source=None,
                  enforce_primary_key=True, delete_existing=False, history=None,
-                 analyze_table=True, filter_clause=None, **kwargs):
+                 analyze_table=True, filter_clause=None, reload_strategy=None,
+                 upsert_method=None, **kwargs):
         """Constructor for the UpsertStep class
 
         Args:
+            reload_strategy(str): How the data of the table is replaced when
+                delete_existing is set, one of delete, swap or append
+            upsert_method(str): How the matching rows are replaced, one of
+                subquery, join or merge
             **kwargs(optional): Keyword arguments directly passed to base class
         """
         self.s3_source_dir = kwargs['s3_source_dir']
         assert exactly_one(sql, source, script), 'One of sql/source/script'
 
+        if reload_strategy is not None and not delete_existing:
+            raise ETLInputError(
+                'Reload strategy is only supported with delete_existing')
+
+        if upsert_method is not None:
+            if delete_existing:
+                raise ETLInputError(
+                    'Upsert method is not supported with delete_existing')
+            if upsert_method not in const.UPSERT_METHODS:
+                raise ETLInputError('Upsert method should be one of %s' %
+                                    const.UPSERT_METHODS)
+
         # Input formatting
         dest = Table(SqlScript(filename=parse_path(destination)))
 
@@ -33,9 +88,24 @@ class UpsertStep(CreateUpdateSqlStep):
             source_relation = SelectStatement(
                 SqlScript(sql=sql, filename=parse_path(script)).sql())
 
-        # Create the destination table if doesn't exist
-        sql_script = dest.upsert_script(source_relation, enforce_primary_key,
-                                        delete_existing, filter_clause)
+        if reload_strategy is not None:
+            sql_script, runner_arguments, non_transactional = reload_script(
+                dest, source_relation, reload_strategy, enforce_primary_key,
+                filter_clause)
+            if runner_arguments:
+                kwargs['script_arguments'] = runner_arguments + (
+                    kwargs.get('script_arguments') or list())
+            if non_transactional:
+                kwargs['non_transactional'] = True
+        elif upsert_method in [const.UPSERT_JOIN, const.UPSERT_MERGE]:
+            sql_script = dest.merge_script(
+                source_relation, enforce_primary_key, filter_clause,
+                use_merge=upsert_method == const.UPSERT_MERGE)
+        else:
+            # Create the destination table if doesn't exist
+            sql_script = dest.upsert_script(
+                source_relation, enforce_primary_key, delete_existing,
+                filter_clause)
 
         if history:
             hist = HistoryTable(SqlScript(
@@ -196,6 +196,34 @@ execute_sql_parser.add_argument(
     help='Executes the query',
 )
 
+# Workers parser
+workers_parser_help = 'Number of concurrent workers'
+workers_parser = ArgumentParser(
+    description=workers_parser_help,
+    add_help=False,
+)
+workers_parser.add_argument(
+    '-w',
+    '--workers',
+    type=int,
+    default=1,
+    help='Number of relations processed concurrently',
+)
+
+
+# Level execution parser
+level_execution_parser_help = 'Execute the relations level by level'
+level_execution_parser = ArgumentParser(
+    description=level_execution_parser_help,
+    add_help=False,
+    parents=[workers_parser],
+)
+level_execution_parser.add_argument(
+    '--checkpoint',
+    default=None,
+    help='File recording executed relations, used to resume a run',
+)
+
 
 # Single Table definition parser
 single_table_definition_help = 'Path of a table definition'
@@ -20,6 +20,42 @@ DATA_STR = 'data'
 SRC_STR = 'src'
 QA_STR = 'qa'
 
+# Compression formats for intermediate data, supported by redshift COPY
+GZIP = 'gzip'
+BZIP2 = 'bzip2'
+LZOP = 'lzop'
+ZSTD = 'zstd'
+COMPRESSION_FORMATS = [GZIP, BZIP2, LZOP, ZSTD]
+UNLOAD_COMPRESSION_FORMATS = [GZIP, BZIP2, ZSTD]
+STREAM_COMPRESSION_FORMATS = [GZIP, BZIP2]
+
+# Redshift names unloaded files <prefix><slice>_part_<n> and the manifest
+# <prefix>manifest
+UNLOAD_PREFIX = 'part_'
+UNLOAD_MANIFEST = UNLOAD_PREFIX + 'manifest'
+
+# Strategies to replace the data of a table on reload
+RELOAD_DELETE = 'delete'
+RELOAD_SWAP = 'swap'
+RELOAD_APPEND = 'append'
+RELOAD_STRATEGIES = [RELOAD_DELETE, RELOAD_SWAP, RELOAD_APPEND]
+
+# Ways to replace the rows matching the primary keys on upsert
+UPSERT_SUBQUERY = 'subquery'
+UPSERT_JOIN = 'join'
+UPSERT_MERGE = 'merge'
+UPSERT_METHODS = [UPSERT_SUBQUERY, UPSERT_JOIN, UPSERT_MERGE]
+
+# Column check modes
+COLUMN_CHECK_SAMPLE = 'sample'
+COLUMN_CHECK_HASH = 'hash'
+COLUMN_CHECK_MODES = [COLUMN_CHECK_SAMPLE, COLUMN_CHECK_HASH]
+
+# Primary key check modes
+PK_CHECK_COUNT = 'count'
+PK_CHECK_APPROXIMATE = 'approximate'
+PK_CHECK_MODES = [PK_CHECK_COUNT, PK_CHECK_APPROXIMATE]
+
 # Commands
 COMMAND_TEMPLATE = 'python -c "from {file} import {func}; {func}()" "$@"'
 
@@ -39,6 +75,18 @@ PK_CHECK_COMMAND = COMMAND_TEMPLATE.format(
     file='dataduct.steps.executors.primary_key_check',
     func='primary_key_check')
 
+QA_BATCH_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.qa_batch',
+    func='qa_batch')
+
+PROFILE_CHECK_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.profile_check',
+    func='profile_check')
+
+RECONCILE_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.reconcile',
+    func='reconcile_check')
+
 DEPENDENCY_COMMAND = COMMAND_TEMPLATE.format(
     file='dataduct.steps.executors.dependency_check',
     func='dependency_check')
@@ -48,3 +96,20 @@ SCRIPT_RUNNER_COMMAND = COMMAND_TEMPLATE.format(
 
 SQL_RUNNER_COMMAND = COMMAND_TEMPLATE.format(
     file='dataduct.steps.executors.runner', func='sql_runner')
+
+CLEAN_FILES_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.clean_files', func='clean_files_runner')
+
+EXTRACT_RDS_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.stream_extract', func='extract_rds_runner')
+
+EXTRACT_POSTGRES_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.stream_extract',
+    func='extract_postgres_runner')
+
+UNLOAD_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.unload_redshift',
+    func='unload_redshift_runner')
+
+MAINTENANCE_COMMAND = COMMAND_TEMPLATE.format(
+    file='dataduct.steps.executors.maintenance', func='maintenance_runner')
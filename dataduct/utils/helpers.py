@@ -175,6 +175,34 @@ def stringify_credentials(access_key, secret_key, token=None):
     return creds
 
 
+def unload_options(parallel=None, manifest=False, compression=None,
+                   max_file_size=None, allow_overwrite=False):
+    """Serialize the optional parameters of a redshift UNLOAD
+
+    Args:
+        parallel(bool): Write a file per slice, redshift default if None
+        manifest(bool): Write a manifest listing the unloaded files
+        compression(str): Compression format of the unloaded files
+        max_file_size(str): Maximum size of a file, e.g. '256 MB'
+        allow_overwrite(bool): Overwrite existing files
+
+    Returns:
+        A string of the options separated by spaces.
+    """
+    options = list()
+    if parallel is not None:
+        options.append('PARALLEL %s' % ('ON' if parallel else 'OFF'))
+    if manifest:
+        options.append('MANIFEST')
+    if compression is not None:
+        options.append(compression.upper())
+    if max_file_size is not None:
+        options.append('MAXFILESIZE %s' % max_file_size)
+    if allow_overwrite:
+        options.append('ALLOWOVERWRITE')
+    return ' '.join(options)
+
+
 def make_pipeline_url(pipeline_id):
     """Creates the DataPipeline url for a particular pipeline
 